@@ -0,0 +1,26 @@
+"""Fixed overhead of a `bridge.call` round trip"""
+
+from typing import List
+
+from common import Result, measure
+
+from pyrep_ext.core import bridge
+
+
+def run(backend: str) -> List[Result]:
+    if backend == "stub":
+        from pyrep_ext.core.lib import get_backend
+
+        get_backend().sim.register("sim.noop", lambda *args: None)
+        func = "sim.noop"
+    else:
+        # Cheapest API function available, with no side effects
+        func = "sim.getSimulationTime"
+    bridge.call(func, ())  # fill the type hints cache
+    return [
+        measure("bridge.call[cached_hints]", lambda: bridge.call(func, ())),
+        measure(
+            "bridge.call[explicit_hints]",
+            lambda: bridge.call(func, (), ((), ())),
+        ),
+    ]
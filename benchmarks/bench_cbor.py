@@ -0,0 +1,60 @@
+"""Item-by-item marshalling vs CBOR buffers, by payload size
+
+Each payload is sent to the Lua `assert`, which returns it, so both paths
+cost a round trip of the whole payload. `bridge.CBOR_THRESHOLD` should be
+around the number of values (see `cbor_codec.count_items`) from which the
+CBOR path is faster.
+"""
+
+from typing import List
+
+from common import Result, measure
+
+from pyrep_ext.core import bridge, cbor_codec
+from pyrep_ext.pyrep import PyRep
+
+SIZES = (1, 4, 16, 64, 256, 1024)
+
+
+def payload(n: int) -> list:
+    """A scene description of n objects, 11 values each"""
+    return [
+        {
+            "handle": i,
+            "pose": [0.0, 0.0, 0.1 * i, 0.0, 0.0, 0.0, 1.0],
+            "name": f"object{i}",
+        }
+        for i in range(n)
+    ]
+
+
+def run(backend: str) -> List[Result]:
+    if backend == "stub":
+        from pyrep_ext.core.lib import get_backend
+
+        get_backend().sim.register("assert", lambda *args: args)
+    pr = PyRep()
+    pr.launch(headless=True)
+    threshold = bridge.CBOR_THRESHOLD
+    bridge.CBOR_THRESHOLD = None
+    results = []
+    try:
+        for n in SIZES:
+            args = (payload(n),)
+            size = cbor_codec.count_items(args, 1 << 30)
+            results.append(
+                measure(
+                    f"bridge.call[items{size}]",
+                    lambda args=args: bridge.call("assert", args, ((), ())),
+                )
+            )
+            results.append(
+                measure(
+                    f"bridge.call_cbor[items{size}]",
+                    lambda args=args: bridge.call_cbor("assert", args),
+                )
+            )
+    finally:
+        bridge.CBOR_THRESHOLD = threshold
+        pr.shutdown()
+    return results
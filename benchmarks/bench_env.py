@@ -0,0 +1,26 @@
+"""End-to-end `PendulumEnv` steps per second"""
+
+from typing import List
+
+import numpy as np
+from common import Result, measure
+
+from pyrep_ext.const import ObjectType
+from pyrep_ext.suite.pendulum import PendulumEnv
+
+
+def run(backend: str) -> List[Result]:
+    if backend == "stub":
+        from pyrep_ext.core.lib import get_backend
+
+        sim = get_backend().sim
+        sim.add_object("/hinge", ObjectType.JOINT.value)
+        sim.add_object("/mass", ObjectType.SHAPE.value)
+
+    env = PendulumEnv(render_mode="rgb_array", headless=True)
+    env.reset()
+    action = np.zeros(env.action_space.shape, dtype=np.float32)
+    try:
+        return [measure("pendulum_env.step", lambda: env.step(action))]
+    finally:
+        env.close()
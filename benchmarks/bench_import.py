@@ -0,0 +1,20 @@
+"""Time to import pyrep_ext modules in a fresh interpreter"""
+
+import subprocess
+import sys
+from typing import List
+
+from common import Result, measure
+
+MODULES = ("pyrep_ext.pyrep", "pyrep_ext.suite.pendulum")
+
+
+def run(backend: str) -> List[Result]:
+    def interpreter(code: str):
+        return lambda: subprocess.run([sys.executable, "-c", code], check=True)
+
+    results = [measure("import[python]", interpreter("pass"), number=1)]
+    for module in MODULES:
+        func = interpreter(f"import {module}")
+        results.append(measure(f"import[{module}]", func, number=1))
+    return results
@@ -0,0 +1,75 @@
+"""Micro-benchmarks for `stack.write`/`stack.read` by payload shape"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from common import Result, measure
+
+from pyrep_ext.core import stack
+from pyrep_ext.core.lib import cpllib
+
+PAYLOADS: Dict[str, Tuple[Tuple, Optional[Tuple]]] = {
+    "scalars": ((1, 2.5, True, None, "name"), None),
+    "matrix12": (([float(i) for i in range(12)],), None),
+    "image1mb": ((bytes(1024 * 1024),), ("buffer",)),
+    "nested_dict": (
+        (
+            {
+                f"object{i}": {
+                    "handle": i,
+                    "pose": [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0],
+                    "tags": {"dynamic": True, "name": f"obj{i}"},
+                }
+                for i in range(16)
+            },
+        ),
+        None,
+    ),
+}
+
+
+def run(backend: str) -> List[Result]:
+    results = []
+    for name, (values, typeHints) in PAYLOADS.items():
+        handle = cpllib.simCreateStack()
+
+        def write(values: Any = values, typeHints: Any = typeHints) -> None:
+            stack.write(handle, values, typeHints)
+            cpllib.simPopStackItem(handle, 0)
+
+        stack.write(handle, values, typeHints)
+        template = cpllib.simCopyStack(handle)
+        cpllib.simPopStackItem(handle, 0)
+
+        def read(typeHints: Any = typeHints) -> None:
+            # NOTE: includes the cost of copying the prefilled stack
+            copy = cpllib.simCopyStack(template)
+            stack.read(copy, typeHints)
+            cpllib.simReleaseStack(copy)
+
+        results.append(measure(f"stack.write[{name}]", write))
+        results.append(measure(f"stack.read[{name}]", read))
+        cpllib.simReleaseStack(template)
+        cpllib.simReleaseStack(handle)
+    results.append(bench_callback())
+    return results
+
+
+def bench_callback() -> Result:
+    """A controller-like callback: joint state in, torques out"""
+
+    def controller(q: np.ndarray, dq: np.ndarray) -> np.ndarray:
+        return -10.0 * q - 0.5 * dq
+
+    wrapper = stack.callback(controller)
+    handle = cpllib.simCreateStack()
+    state = ([0.1] * 7, [0.0] * 7)
+
+    def invoke() -> None:
+        stack.write(handle, state)
+        wrapper(handle)
+        cpllib.simPopStackItem(handle, 0)
+
+    result = measure("stack.callback[controller7]", invoke)
+    cpllib.simReleaseStack(handle)
+    return result
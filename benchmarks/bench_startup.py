@@ -0,0 +1,49 @@
+"""Time to get a ready `PendulumEnv` in a new worker process
+
+Compares a cold start (fresh interpreter) with forking a warmed up zygote,
+see `pyrep_ext.suite.forkserver`.
+"""
+
+import functools
+import subprocess
+import sys
+from typing import List
+
+from common import Result, measure, setup_backend
+
+from pyrep_ext.const import ObjectType
+
+
+def setup(backend: str) -> None:
+    stub = setup_backend(backend)
+    if stub is not None:
+        stub.sim.add_object("/hinge", ObjectType.JOINT.value)
+        stub.sim.add_object("/mass", ObjectType.SHAPE.value)
+
+
+def run(backend: str) -> List[Result]:
+    from pyrep_ext.suite.forkserver import ForkServer
+
+    def cold() -> None:
+        cmd = [sys.executable, __file__, backend]
+        subprocess.run(cmd, check=True)
+
+    def forked() -> None:
+        worker = server.spawn(render_mode="rgb_array", headless=True)
+        worker.reset()
+        worker.close()
+
+    results = [measure("env_startup[cold]", cold, number=1)]
+    with ForkServer(initializer=functools.partial(setup, backend)) as server:
+        results.append(measure("env_startup[forkserver]", forked, number=1))
+    return results
+
+
+if __name__ == "__main__":
+    setup(sys.argv[1])
+
+    from pyrep_ext.suite.pendulum import PendulumEnv
+
+    env = PendulumEnv(render_mode="rgb_array", headless=True)
+    env.reset()
+    env.close()
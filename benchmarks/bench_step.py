@@ -0,0 +1,19 @@
+"""Latency of `PyRep.step` on an empty scene"""
+
+from typing import List
+
+from common import Result, measure
+
+from pyrep_ext.pyrep import PyRep
+
+
+def run(backend: str) -> List[Result]:
+    pr = PyRep()
+    pr.launch(headless=True)
+    pr.set_simulation_timestep(0.005)
+    pr.start()
+    try:
+        return [measure("pyrep.step", pr.step)]
+    finally:
+        pr.stop()
+        pr.shutdown()
@@ -0,0 +1,62 @@
+"""Timing helpers shared by the benchmark modules"""
+
+import os
+import tempfile
+import timeit
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional
+
+BACKENDS = ("stub", "coppeliasim")
+
+
+@dataclass
+class Result:
+    name: str
+    mean: float
+    stdev: float
+    best: float
+    number: int
+    repeat: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    repeat: int = 5,
+    number: Optional[int] = None,
+    min_time: float = 0.05,
+) -> Result:
+    """Times `func`, returning seconds per call over `repeat` rounds
+
+    If `number` is not given, it is chosen so that each round takes at least
+    `min_time` seconds.
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number = 1
+        while timer.timeit(number) < min_time:
+            number *= 2
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    mean = sum(times) / len(times)
+    stdev = (sum((t - mean) ** 2 for t in times) / len(times)) ** 0.5
+    return Result(name, mean, stdev, min(times), number, repeat)
+
+
+def setup_backend(backend: str) -> Any:
+    """Selects the simulator library for the benchmarks
+
+    For the stub backend, `COPPELIASIM_ROOT` is pointed to a temporary folder
+    if not defined, as `PyRep` checks for it on construction.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend: {backend}")
+    if backend == "coppeliasim":
+        return None
+
+    from pyrep_ext.core.stub import install
+
+    os.environ.setdefault("COPPELIASIM_ROOT", tempfile.gettempdir())
+    return install()
@@ -0,0 +1,60 @@
+"""Compares two benchmark result files
+
+$ python benchmarks/compare.py baseline.json results.json --threshold 0.1
+"""
+
+import argparse
+import json
+from typing import Any, Dict, List, Tuple
+
+
+def load(filepath: str) -> Dict[str, Any]:
+    with open(filepath, "r") as fhandle:
+        return json.load(fhandle)
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[Tuple[str, float, float, float, bool]]:
+    """Returns (name, baseline, current, ratio, regressed) per benchmark
+
+    Benchmarks are compared by their best time per call, which is the least
+    sensitive to noise. A benchmark regressed if it got slower by more than
+    `threshold` (as a fraction of the baseline time).
+    """
+    rows = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        old = baseline["results"][name]["best"]
+        new = result["best"]
+        ratio = new / old if old > 0 else float("inf")
+        rows.append((name, old, new, ratio, ratio > 1.0 + threshold))
+    return rows
+
+
+def report(rows: List[Tuple[str, float, float, float, bool]]) -> str:
+    lines = [f"{'benchmark':<40}{'baseline':>12}{'current':>12}{'ratio':>8}"]
+    for name, old, new, ratio, regressed in rows:
+        mark = "  REGRESSED" if regressed else ""
+        lines.append(
+            f"{name:<40}{old * 1e6:>10.2f}us{new * 1e6:>10.2f}us"
+            f"{ratio:>8.2f}{mark}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline", type=str)
+    parser.add_argument("current", type=str)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    rows = compare(load(args.baseline), load(args.current), args.threshold)
+    print(report(rows))
+    return int(any(row[-1] for row in rows))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Runs the benchmark suite and saves the results as JSON
+
+By default everything runs on the stub backend (see `pyrep_ext.core.stub`),
+which measures the Python side only: marshalling, bridge and stepping logic.
+Use `--backend coppeliasim` to measure against the actual simulator.
+
+    $ python benchmarks/run.py -o results.json
+    $ python benchmarks/run.py -o new.json --baseline results.json
+"""
+
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from common import BACKENDS, setup_backend
+from compare import compare, load, report
+
+SUITES = ("import", "stack", "bridge", "cbor", "step", "env", "startup")
+
+
+def run_suite(suite: str, backend: str) -> list:
+    """Runs a suite in a fresh process, as the simulator can be initialized
+    only once per process"""
+    cmd = [sys.executable, __file__, "--backend", backend, "--worker", suite]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"suite {suite} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def worker(suite: str, backend: str) -> int:
+    setup_backend(backend)
+    module = importlib.import_module(f"bench_{suite}")
+    results = [result.to_dict() for result in module.run(backend)]
+    print(json.dumps(results))
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=BACKENDS, default="stub")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=SUITES)
+    parser.add_argument("-o", "--output", type=str, default="")
+    parser.add_argument("--baseline", type=str, default="")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--worker", choices=SUITES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return worker(args.worker, args.backend)
+
+    results = {}
+    for suite in args.suites:
+        for result in run_suite(suite, args.backend):
+            name, best = result["name"], result["best"]
+            print(f"{name:<40}{best * 1e6:>12.2f} us/call")
+            results[name] = result
+
+    data = {
+        "meta": {
+            "backend": args.backend,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fhandle:
+            json.dump(data, fhandle, indent=4)
+
+    if args.baseline:
+        rows = compare(load(args.baseline), data, args.threshold)
+        print(report(rows))
+        return int(any(row[-1] for row in rows))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,3 +3,4 @@ from pathlib import Path
 ASSETS_DIR = Path(__file__).parent / "assets"
 SCENES_DIR = ASSETS_DIR / "scenes"
 MODELS_DIR = ASSETS_DIR / "models"
+LUA_DIR = ASSETS_DIR / "lua"
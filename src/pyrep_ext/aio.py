@@ -0,0 +1,320 @@
+"""asyncio front-end to PyRep
+
+The simulator runs on a `SimExecutor` thread, and every API call made through
+`AsyncPyRep` returns an awaitable. Calls made within the same event loop
+iteration are merged into a single batched bridge call, so many coroutines
+polling sensors cost one round trip::
+
+    async def main():
+        aio = await AsyncPyRep.launch(scene, headless=True)
+        await aio.start()
+        hinge = await aio.get_object(Joint, "/hinge")
+        mass = await aio.get_object(Shape, "/mass")
+        for _ in range(100):
+            await aio.step()
+            # both reads are sent together
+            q, position = await asyncio.gather(
+                hinge.get_joint_position(), mass.get_position()
+            )
+        await aio.shutdown()
+
+    asyncio.run(main())
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Type, Union
+
+import numpy as np
+
+from pyrep_ext.const import Verbosity
+from pyrep_ext.core.bridge import call_batch
+from pyrep_ext.core.errors import CoppeliaSimError
+from pyrep_ext.core.executor import SimExecutor
+from pyrep_ext.objects.joint import Joint
+from pyrep_ext.objects.object import Object
+from pyrep_ext.pyrep import PyRep
+
+_Pending = Tuple[str, Tuple, asyncio.Future]
+
+
+def _handle_of(obj: Union[Object, AsyncObject, None]) -> int:
+    return -1 if obj is None else obj.get_handle()
+
+
+class AsyncPyRep:
+    """Awaitable version of `PyRep`, backed by a `SimExecutor`
+
+    :param pr: A launched `PyRep` instance, owned by the executor thread.
+    :param executor: The executor whose thread launched `pr`.
+    """
+
+    def __init__(self, pr: Optional[PyRep], executor: SimExecutor):
+        self.pr = pr
+        self.executor = executor
+        self.num_batches = 0
+        self._pending: List[_Pending] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    @classmethod
+    async def launch(
+        cls,
+        scene_file: Union[str, Path] = "",
+        headless: bool = True,
+        responsive_ui: bool = False,
+        verbosity: Verbosity = Verbosity.NONE,
+    ) -> AsyncPyRep:
+        """Launches CoppeliaSim on a new simulation thread
+
+        See `PyRep.launch` for the arguments.
+        """
+        pr = PyRep()
+        executor = SimExecutor()
+        init = functools.partial(
+            pr.launch,
+            scene_file,
+            headless=headless,
+            responsive_ui=responsive_ui,
+            verbosity=verbosity,
+        )
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, functools.partial(executor.start, init)
+        )
+        return cls(pr, executor)
+
+    def call(self, func: str, *args) -> asyncio.Future:
+        """Calls an API function, e.g. `sim.getObjectPosition`
+
+        The call is sent at the end of the current event loop iteration,
+        together with all other calls made in the meantime.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((func, args, future))
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush)
+        return future
+
+    def run(self, func: Callable, *args, **kwargs) -> asyncio.Future:
+        """Runs `func(*args, **kwargs)` on the simulation thread
+
+        Calls made before are sent first, so the order is preserved.
+        """
+        self._flush()
+        return asyncio.wrap_future(self.executor.submit(func, *args, **kwargs))
+
+    async def step(self) -> None:
+        """Execute the next simulation step, see `PyRep.step`"""
+        await self.run(self.pr.step)
+
+    async def start(self) -> None:
+        """Starts the physics simulation, see `PyRep.start`"""
+        await self.run(self.pr.start)
+
+    async def stop(self) -> None:
+        """Stops the physics simulation, see `PyRep.stop`"""
+        await self.run(self.pr.stop)
+
+    async def shutdown(self) -> None:
+        """Shuts down CoppeliaSim and the simulation thread"""
+        if self.pr is not None:
+            await self.run(self.pr.shutdown)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.executor.shutdown)
+
+    async def get_object(
+        self, cls: Type[Object], name_or_handle: Union[str, int]
+    ) -> AsyncObject:
+        """Creates an object of the given class, e.g. `Shape`, and wraps it"""
+        return self.wrap(await self.run(cls, name_or_handle))
+
+    def wrap(self, obj: Object) -> AsyncObject:
+        """Returns the awaitable version of an existing object"""
+        if isinstance(obj, Joint):
+            return AsyncJoint(self, obj)
+        return AsyncObject(self, obj)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending = [p for p in self._pending if not p[2].cancelled()]
+        self._pending = []
+        if not pending:
+            return
+        self.num_batches += 1
+        calls = [(func, args) for func, args, _ in pending]
+        future = asyncio.wrap_future(self.executor.submit(call_batch, calls))
+        future.add_done_callback(functools.partial(self._resolve, pending))
+
+    @staticmethod
+    def _resolve(pending: List[_Pending], batch: asyncio.Future) -> None:
+        if batch.cancelled():
+            for _, _, future in pending:
+                future.cancel()
+            return
+        error = batch.exception()
+        results = [(False, None)] * len(pending) if error else batch.result()
+        for (func, _, future), (ok, value) in zip(pending, results):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            elif ok:
+                future.set_result(value)
+            else:
+                future.set_exception(
+                    CoppeliaSimError(f"{func} failed: {value}")
+                )
+
+
+class AsyncObject:
+    """Awaitable getters and setters of an `Object`"""
+
+    def __init__(self, aio: AsyncPyRep, obj: Object):
+        self._aio = aio
+        self.obj = obj
+        self._handle = obj.get_handle()
+
+    def get_handle(self) -> int:
+        return self._handle
+
+    async def get_position(
+        self, relative_to: Union[Object, AsyncObject, None] = None
+    ) -> np.ndarray:
+        position = await self._aio.call(
+            "sim.getObjectPosition", self._handle, _handle_of(relative_to)
+        )
+        return np.array(position, dtype=np.float64)
+
+    async def set_position(
+        self,
+        position: Union[list, np.ndarray],
+        relative_to: Union[Object, AsyncObject, None] = None,
+    ) -> None:
+        await self._aio.call(
+            "sim.setObjectPosition",
+            self._handle,
+            list(position),
+            _handle_of(relative_to),
+        )
+
+    async def get_quaternion(
+        self, relative_to: Union[Object, AsyncObject, None] = None
+    ) -> np.ndarray:
+        quaternion = await self._aio.call(
+            "sim.getObjectQuaternion", self._handle, _handle_of(relative_to)
+        )
+        return np.array(quaternion, dtype=np.float64)
+
+    async def set_quaternion(
+        self,
+        quaternion: Union[list, np.ndarray],
+        relative_to: Union[Object, AsyncObject, None] = None,
+    ) -> None:
+        await self._aio.call(
+            "sim.setObjectQuaternion",
+            self._handle,
+            list(quaternion),
+            _handle_of(relative_to),
+        )
+
+    async def get_pose(
+        self, relative_to: Union[Object, AsyncObject, None] = None
+    ) -> np.ndarray:
+        # Both calls are made before awaiting, so they go in the same batch
+        rel_to_handle = _handle_of(relative_to)
+        position = self._aio.call(
+            "sim.getObjectPosition", self._handle, rel_to_handle
+        )
+        quaternion = self._aio.call(
+            "sim.getObjectQuaternion", self._handle, rel_to_handle
+        )
+        return np.r_[await position, await quaternion].astype(np.float64)
+
+    async def set_pose(
+        self,
+        pose: Union[list, np.ndarray],
+        relative_to: Union[Object, AsyncObject, None] = None,
+    ) -> None:
+        assert len(pose) == 7
+        rel_to_handle = _handle_of(relative_to)
+        position = self._aio.call(
+            "sim.setObjectPosition", self._handle, list(pose[:3]), rel_to_handle
+        )
+        quaternion = self._aio.call(
+            "sim.setObjectQuaternion",
+            self._handle,
+            list(pose[3:]),
+            rel_to_handle,
+        )
+        await position
+        await quaternion
+
+    async def get_matrix(
+        self, relative_to: Union[Object, AsyncObject, None] = None
+    ) -> np.ndarray:
+        matrix = await self._aio.call(
+            "sim.getObjectMatrix", self._handle, _handle_of(relative_to)
+        )
+        matrix_np = np.array(matrix).reshape((3, 4))
+        return np.concatenate([matrix_np, [np.array([0, 0, 0, 1])]])
+
+    async def set_matrix(
+        self,
+        matrix: np.ndarray,
+        relative_to: Union[Object, AsyncObject, None] = None,
+    ) -> None:
+        await self._aio.call(
+            "sim.setObjectMatrix",
+            self._handle,
+            matrix[:3, :4].reshape((12,)).tolist(),
+            _handle_of(relative_to),
+        )
+
+    async def get_velocity(self) -> Tuple[np.ndarray, np.ndarray]:
+        linear_vel, angular_vel = await self._aio.call(
+            "sim.getObjectVelocity", self._handle
+        )
+        return (
+            np.array(linear_vel, dtype=np.float64),
+            np.array(angular_vel, dtype=np.float64),
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.obj!r})"
+
+
+class AsyncJoint(AsyncObject):
+    """Awaitable getters and setters of a `Joint`"""
+
+    async def get_joint_position(self) -> float:
+        return await self._aio.call("sim.getJointPosition", self._handle)
+
+    async def set_joint_position(self, position: float) -> None:
+        await self._aio.call("sim.setJointPosition", self._handle, position)
+
+    async def get_joint_velocity(self) -> float:
+        return await self._aio.call("sim.getJointVelocity", self._handle)
+
+    async def set_joint_target_position(self, position: float) -> None:
+        await self._aio.call(
+            "sim.setJointTargetPosition", self._handle, position
+        )
+
+    async def set_joint_target_velocity(self, velocity: float) -> None:
+        await self._aio.call(
+            "sim.setJointTargetVelocity", self._handle, velocity
+        )
+
+    async def get_joint_target_force(self) -> float:
+        return await self._aio.call("sim.getJointTargetForce", self._handle)
+
+    async def set_joint_target_force(self, force_or_torque: float) -> None:
+        await self._aio.call(
+            "sim.setJointTargetForce", self._handle, force_or_torque
+        )
@@ -0,0 +1,831 @@
+-- Helpers loaded by pyrep_ext into the sandbox script (see SimBackend). Every
+-- function here has a Python counterpart in pyrep_ext.core.stub.StubSim, keep
+-- both in sync.
+
+pyrepExt = pyrepExt or {}
+
+-- Resolves a dotted function name, e.g. 'sim.getObjectPosition'
+function pyrepExt.resolve(name)
+    local f = _G
+    for part in string.gmatch(name, '[^%.]+') do
+        f = f[part]
+        if f == nil then
+            error('pyrepExt: unknown function ' .. name)
+        end
+    end
+    return f
+end
+
+-- Python callbacks registered with simRegCallback(index, ...) are invoked
+-- with the given arguments, returning whatever the callback returns
+function pyrepExt.invoke(index, ...)
+    return sim.testCB(index, ...)
+end
+
+-- Runs a list of calls {funcName, args, nargs} in order, returning for each
+-- one {true, result} or {false, errorMessage}. Functions with several return
+-- values give a table as result
+function pyrepExt.batch(calls)
+    local results = {}
+    for i, c in ipairs(calls) do
+        local r = table.pack(pcall(pyrepExt.resolve, c[1]))
+        if r[1] then
+            r = table.pack(pcall(r[2], table.unpack(c[2], 1, c[3])))
+        end
+        if not r[1] or r.n <= 2 then
+            results[i] = {r[1], r[2]}
+        else
+            results[i] = {true, {table.unpack(r, 2, r.n)}}
+        end
+    end
+    return results
+end
+
+-- Calls the function `func` of another script once per list of arguments
+-- (each of `nargs` values), returning the result of each call, a table if it
+-- has several values
+function pyrepExt.callScriptMany(script, func, calls, nargs)
+    local results = {}
+    for i, args in ipairs(calls) do
+        local r = table.pack(sim.callScriptFunction(func, script, table.unpack(args, 1, nargs)))
+        if r.n == 1 then
+            results[i] = r[1]
+        else
+            results[i] = {table.unpack(r, 1, r.n)}
+        end
+    end
+    return results
+end
+
+-- Unpacks n numbers of the string.pack format `fmt` (e.g. '<d') from `data`,
+-- by chunks, as string.unpack returns them as values. Returns a table
+local function unpackNumbers(fmt, data, pos, n)
+    local values, size = {}, string.packsize(fmt)
+    local order, item = fmt:sub(1, 1), fmt:sub(2)
+    for i = 1, n, 256 do
+        local m = math.min(256, n - i + 1)
+        local chunk = table.pack(string.unpack(order .. string.rep(item, m), data, pos))
+        table.move(chunk, 1, m, i, values)
+        pos = pos + m * size
+    end
+    return values
+end
+
+-------------------------------------------------------------------------------
+-- CBOR: large payloads passed as a single buffer rather than item by item
+-- (see pyrep_ext.core.cbor_codec). Decodes what the Python side encodes:
+-- integers, floats, strings, arrays, maps, booleans, null and RFC 8746
+-- typed arrays, as flat tables of numbers (also in a tag 40
+-- multi-dimensional array). Encodes strings as byte strings when they are
+-- not valid UTF-8, and tables as arrays when their keys are 1..n.
+
+local cborTypedFormats = {
+    [64] = '<I1', [69] = '<I2', [70] = '<I4', [71] = '<I8',
+    [72] = '<i1', [77] = '<i2', [78] = '<i4', [79] = '<i8',
+    [85] = '<f', [86] = '<d',
+}
+
+local function cborDecodeAt(data, pos)
+    local head = string.byte(data, pos)
+    local major, info = head >> 5, head & 31
+    pos = pos + 1
+    if major == 7 then
+        if info == 20 then
+            return false, pos
+        elseif info == 21 then
+            return true, pos
+        elseif info == 22 or info == 23 then
+            return nil, pos
+        elseif info == 25 then
+            local h = string.unpack('>I2', data, pos)
+            local e, m, v = (h >> 10) & 31, h & 1023, nil
+            if e == 0 then
+                v = m * 2.0 ^ -24
+            elseif e == 31 then
+                v = m == 0 and math.huge or 0 / 0
+            else
+                v = (m + 1024) * 2.0 ^ (e - 25)
+            end
+            return h & 0x8000 ~= 0 and -v or v, pos + 2
+        elseif info == 26 then
+            return string.unpack('>f', data, pos)
+        elseif info == 27 then
+            return string.unpack('>d', data, pos)
+        end
+        error('pyrepExt: unsupported CBOR simple value ' .. info)
+    end
+    local arg = info
+    if info == 24 then
+        arg, pos = string.unpack('>I1', data, pos)
+    elseif info == 25 then
+        arg, pos = string.unpack('>I2', data, pos)
+    elseif info == 26 then
+        arg, pos = string.unpack('>I4', data, pos)
+    elseif info == 27 then
+        arg, pos = string.unpack('>I8', data, pos)
+    elseif info > 27 then
+        error('pyrepExt: unsupported CBOR item (indefinite length)')
+    end
+    if major == 0 then
+        return arg, pos
+    elseif major == 1 then
+        return -1 - arg, pos
+    elseif major == 2 or major == 3 then
+        return data:sub(pos, pos + arg - 1), pos + arg
+    elseif major == 4 then
+        local t = {}
+        for i = 1, arg do
+            t[i], pos = cborDecodeAt(data, pos)
+        end
+        return t, pos
+    elseif major == 5 then
+        local t, k = {}, nil
+        for _ = 1, arg do
+            k, pos = cborDecodeAt(data, pos)
+            t[k], pos = cborDecodeAt(data, pos)
+        end
+        return t, pos
+    end
+    -- tags
+    local value
+    value, pos = cborDecodeAt(data, pos)
+    local fmt = cborTypedFormats[arg]
+    if fmt then
+        return unpackNumbers(fmt, value, 1, #value // string.packsize(fmt)), pos
+    elseif arg == 40 then
+        return value[2], pos -- flat, as arrays pushed item by item
+    end
+    return value, pos
+end
+
+local function cborHead(major, n)
+    if n < 24 then
+        return string.char(major << 5 | n)
+    elseif n < 0x100 then
+        return string.pack('>BI1', major << 5 | 24, n)
+    elseif n < 0x10000 then
+        return string.pack('>BI2', major << 5 | 25, n)
+    elseif n < 0x100000000 then
+        return string.pack('>BI4', major << 5 | 26, n)
+    end
+    return string.pack('>BI8', major << 5 | 27, n)
+end
+
+local function cborEncodeTo(value, out)
+    local t = type(value)
+    if value == nil then
+        out[#out + 1] = '\xf6'
+    elseif t == 'boolean' then
+        out[#out + 1] = value and '\xf5' or '\xf4'
+    elseif math.type(value) == 'integer' then
+        out[#out + 1] = value >= 0 and cborHead(0, value) or cborHead(1, -1 - value)
+    elseif t == 'number' then
+        out[#out + 1] = string.pack('>Bd', 0xfb, value)
+    elseif t == 'string' then
+        out[#out + 1] = cborHead(utf8.len(value) and 3 or 2, #value)
+        out[#out + 1] = value
+    elseif t == 'table' then
+        local n, count = #value, 0
+        for _ in pairs(value) do
+            count = count + 1
+        end
+        if n > 0 and n == count then
+            out[#out + 1] = cborHead(4, n)
+            for i = 1, n do
+                cborEncodeTo(value[i], out)
+            end
+        else
+            out[#out + 1] = cborHead(5, count)
+            for k, v in pairs(value) do
+                cborEncodeTo(k, out)
+                cborEncodeTo(v, out)
+            end
+        end
+    else
+        error('pyrepExt: cannot encode a ' .. t .. ' as CBOR')
+    end
+end
+
+function pyrepExt.cborDecode(data)
+    return (cborDecodeAt(data, 1))
+end
+
+function pyrepExt.cborEncode(value)
+    local out = {}
+    cborEncodeTo(value, out)
+    return table.concat(out)
+end
+
+-- Calls `func` with the `nargs` arguments encoded in `data`, a CBOR array,
+-- returning its results encoded as a CBOR array
+function pyrepExt.cborCall(func, nargs, data)
+    local args = pyrepExt.cborDecode(data)
+    local r = table.pack(pyrepExt.resolve(func)(table.unpack(args, 1, nargs)))
+    local out = {cborHead(4, r.n)}
+    for i = 1, r.n do
+        cborEncodeTo(r[i], out)
+    end
+    return table.concat(out)
+end
+
+-- Copies a model template `count` times, setting the model property of each
+-- copy. Returns the handles of the copies, or nil if the template was removed.
+-- `uid` tells the template apart from an object that reuses its handle
+function pyrepExt.instantiate(template, uid, count, modelProperty)
+    if not sim.isHandle(template) or sim.getObjectUid(template) ~= uid then
+        return nil
+    end
+    local handles = {}
+    for i = 1, count do
+        -- 1: copy the whole model, 2: with its scripts
+        local h = sim.copyPasteObjects({template}, 3)[1]
+        sim.setModelProperty(h, modelProperty)
+        handles[i] = h
+    end
+    return handles
+end
+
+-- Creates n primitive shapes from flat arrays: types (n, PrimitiveShape enum
+-- values), sizes (n*3), poses (n*7, position and quaternion), colors (n*3 or
+-- empty), masses (n or empty) and flags (n, bit0: dynamic, bit1: respondable).
+-- Returns the handles of the shapes
+function pyrepExt.createShapes(types, sizes, poses, colors, masses, flags)
+    local primitives = {
+        [0] = sim.primitiveshape_cuboid,
+        [1] = sim.primitiveshape_spheroid,
+        [2] = sim.primitiveshape_cylinder,
+        [3] = sim.primitiveshape_cone,
+    }
+    local handles = {}
+    for i = 1, #types do
+        local j3, j7 = 3 * (i - 1), 7 * (i - 1)
+        local h = sim.createPrimitiveShape(
+            primitives[types[i]], {sizes[j3 + 1], sizes[j3 + 2], sizes[j3 + 3]}, 0
+        )
+        sim.setObjectPose(h, {table.unpack(poses, j7 + 1, j7 + 7)}, sim.handle_world)
+        if #colors > 0 then
+            sim.setShapeColor(h, nil, sim.colorcomponent_ambient_diffuse,
+                {colors[j3 + 1], colors[j3 + 2], colors[j3 + 3]})
+        end
+        if #masses > 0 then
+            sim.setShapeMass(h, masses[i])
+        end
+        sim.setObjectInt32Param(h, sim.shapeintparam_static, (flags[i] & 1) == 0 and 1 or 0)
+        sim.setObjectInt32Param(h, sim.shapeintparam_respondable, (flags[i] & 2) ~= 0 and 1 or 0)
+        handles[i] = h
+    end
+    return handles
+end
+
+-------------------------------------------------------------------------------
+-- Collision and distance queries between two lists of entities (objects or
+-- collections), for every pair (a[i], b[j]), in row-major order. Pairs of an
+-- entity with itself are skipped.
+
+-- Returns a flat #a * #b table with 1 for colliding pairs, 0 otherwise. With
+-- `earlyExit`, stops at the first collision, leaving the other pairs at 0
+function pyrepExt.checkCollisions(a, b, earlyExit)
+    local out = {}
+    for k = 1, #a * #b do
+        out[k] = 0
+    end
+    for i, ha in ipairs(a) do
+        for j, hb in ipairs(b) do
+            if ha ~= hb and sim.checkCollision(ha, hb) == 1 then
+                out[(i - 1) * #b + j] = 1
+                if earlyExit then
+                    return out
+                end
+            end
+        end
+    end
+    return out
+end
+
+-- Returns a flat #a * #b * 7 table with, for each pair, the witness points
+-- on a[i] and b[j] and their distance. Pairs farther than `threshold` (if
+-- > 0) have an infinite distance, pairs not checked (of an entity with itself,
+-- or after an early exit) a NaN one, and NaN witness points. With
+-- `earlyExit`, stops at the first pair within `threshold`
+function pyrepExt.checkDistances(a, b, threshold, earlyExit)
+    local out, nan = {}, 0 / 0
+    for k = 1, #a * #b * 7 do
+        out[k] = nan
+    end
+    for i, ha in ipairs(a) do
+        for j, hb in ipairs(b) do
+            if ha ~= hb then
+                local o = ((i - 1) * #b + j - 1) * 7
+                local result, data = sim.checkDistance(ha, hb, threshold)
+                if result == 1 then
+                    table.move(data, 1, 7, o + 1, out)
+                    if earlyExit and threshold > 0 then
+                        return out
+                    end
+                else
+                    out[o + 7] = math.huge
+                end
+            end
+        end
+    end
+    return out
+end
+
+-- Returns the meshes of shapes, in their own frame: the flat vertices (3 per
+-- vertex), indices (3 per triangle, 0-based) and normals (3 per index) of
+-- the shapes, concatenated, and the numbers of vertices and triangles of
+-- each shape. Only the shapes whose geometry stamp (their unique ID and the
+-- size of their bounding box, 4 values per shape) differs from `stamps` are
+-- read, the others have 0 vertices and triangles. The stamps of all the
+-- shapes are returned last
+function pyrepExt.getMeshes(handles, stamps)
+    local vertices, indices, normals, counts, out = {}, {}, {}, {}, {}
+    for i, h in ipairs(handles) do
+        local o = (i - 1) * 4
+        local size = sim.getShapeBB(h)
+        out[o + 1] = sim.getObjectUid(h)
+        table.move(size, 1, 3, o + 2, out)
+        local same = true
+        for k = o + 1, o + 4 do
+            same = same and out[k] == stamps[k]
+        end
+        counts[2 * i - 1], counts[2 * i] = 0, 0
+        if not same then
+            local v, ind, n = sim.getShapeMesh(h)
+            table.move(v, 1, #v, #vertices + 1, vertices)
+            table.move(ind, 1, #ind, #indices + 1, indices)
+            table.move(n, 1, #n, #normals + 1, normals)
+            counts[2 * i - 1], counts[2 * i] = #v // 3, #ind // 3
+        end
+    end
+    return vertices, indices, normals, counts, out
+end
+
+-------------------------------------------------------------------------------
+-- Sensors: reads of a list of sensors in one call, one row per sensor.
+
+-- Returns a flat #handles * 5 table with, for each proximity sensor, 1 if it
+-- detects something (0 otherwise), the distance and the point detected, in
+-- the sensor's frame. Sensors detecting nothing have an infinite distance and
+-- a NaN point
+function pyrepExt.readProximitySensors(handles)
+    local out, nan = {}, 0 / 0
+    for i, h in ipairs(handles) do
+        local o = (i - 1) * 5
+        local result, distance, point = sim.readProximitySensor(h)
+        if result == 1 then
+            out[o + 1], out[o + 2] = 1, distance
+            table.move(point, 1, 3, o + 3, out)
+        else
+            out[o + 1], out[o + 2] = 0, math.huge
+            out[o + 3], out[o + 4], out[o + 5] = nan, nan, nan
+        end
+    end
+    return out
+end
+
+-- Returns a flat #handles * 6 table with the force and torque measured by
+-- each force sensor, NaN for sensors without data yet
+function pyrepExt.readForceSensors(handles)
+    local out, nan = {}, 0 / 0
+    for i, h in ipairs(handles) do
+        local o = (i - 1) * 6
+        local result, force, torque = sim.readForceSensor(h)
+        if result & 1 == 1 then
+            table.move(force, 1, 3, o + 1, out)
+            table.move(torque, 1, 3, o + 4, out)
+        else
+            for k = o + 1, o + 6 do
+                out[k] = nan
+            end
+        end
+    end
+    return out
+end
+
+-------------------------------------------------------------------------------
+-- Data channels: arrays exchanged as raw bytes in custom data properties of
+-- an object or of the scene (see pyrep_ext.channels). A channel has two
+-- slots, customData.<name>.0 and .1, written alternately, and
+-- customData.<name>.version, the version of the latest write, which is in
+-- slot version % 2. An array is stored as a header,
+-- string.pack('<c4c4I4xxxx', 'PXA1', dtype, ndim) followed by ndim '<I8'
+-- dimensions, then its little-endian data. dtype is a NumPy type string,
+-- e.g. '<f4', padded with zeros.
+
+local channelFormats = {
+    ['<f4'] = 'f', ['<f8'] = 'd',
+    ['|i1'] = 'i1', ['<i2'] = 'i2', ['<i4'] = 'i4', ['<i8'] = 'i8',
+    ['|u1'] = 'I1', ['<u2'] = 'I2', ['<u4'] = 'I4', ['<u8'] = 'I8',
+    ['|b1'] = 'I1',
+}
+
+local function channelKey(name, suffix)
+    return 'customData.' .. name .. '.' .. suffix
+end
+
+local function channelVersion(handle, name)
+    return sim.getIntProperty(handle, channelKey(name, 'version'), {noError = true}) or 0
+end
+
+-- Publishes an encoded array to the back slot of a channel, returning its
+-- version
+function pyrepExt.channelPublish(handle, name, data)
+    local version = channelVersion(handle, name) + 1
+    sim.setBufferProperty(handle, channelKey(name, version % 2), data)
+    sim.setIntProperty(handle, channelKey(name, 'version'), version)
+    return version
+end
+
+-- Returns the version of a channel (0 if never written) and, if it differs
+-- from `since`, the encoded array (an empty buffer otherwise, or if cleared)
+function pyrepExt.channelFetch(handle, name, since)
+    local version = channelVersion(handle, name)
+    if version == since or version == 0 then
+        return version, ''
+    end
+    local data = sim.getBufferProperty(handle, channelKey(name, version % 2), {noError = true})
+    return version, data or ''
+end
+
+-- Removes the data of a channel. Its version is kept, so that readers see
+-- the next write as new
+function pyrepExt.channelClear(handle, name)
+    sim.removeProperty(handle, channelKey(name, 0), {noError = true})
+    sim.removeProperty(handle, channelKey(name, 1), {noError = true})
+end
+
+-- Encodes and publishes a flat table of values (booleans for '|b1'), for
+-- scripts in the scene. Returns the version
+function pyrepExt.channelWrite(handle, name, values, shape, dtype)
+    local fmt = channelFormats[dtype] or error('pyrepExt: unsupported dtype ' .. dtype)
+    if dtype == '|b1' then
+        local bytes = {}
+        for i, v in ipairs(values) do
+            bytes[i] = (v == true or (v ~= false and v ~= 0)) and 1 or 0
+        end
+        values = bytes
+    end
+    local parts = {string.pack('<c4c4I4xxxx', 'PXA1', dtype .. string.rep('\0', 4 - #dtype), #shape)}
+    for _, d in ipairs(shape) do
+        parts[#parts + 1] = string.pack('<I8', d)
+    end
+    -- by chunks, as string.pack takes the values as arguments
+    for i = 1, #values, 256 do
+        local j = math.min(i + 255, #values)
+        parts[#parts + 1] = string.pack('<' .. string.rep(fmt, j - i + 1), table.unpack(values, i, j))
+    end
+    return pyrepExt.channelPublish(handle, name, table.concat(parts))
+end
+
+-- Reads and decodes the latest array of a channel, for scripts in the scene.
+-- Returns its flat values (booleans for '|b1'), shape and version, or nil if
+-- there is none
+function pyrepExt.channelRead(handle, name)
+    local version, data = pyrepExt.channelFetch(handle, name, -1)
+    if #data == 0 then
+        return nil
+    end
+    local magic, dtype, ndim, pos = string.unpack('<c4c4I4xxxx', data)
+    dtype = dtype:gsub('\0', '')
+    local fmt = channelFormats[dtype]
+    if magic ~= 'PXA1' or not fmt then
+        error('pyrepExt: invalid data in channel ' .. name)
+    end
+    local shape, n = {}, 1
+    for k = 1, ndim do
+        shape[k], pos = string.unpack('<I8', data, pos)
+        n = n * shape[k]
+    end
+    local values = unpackNumbers('<' .. fmt, data, pos, n)
+    if dtype == '|b1' then
+        for i, v in ipairs(values) do
+            values[i] = v ~= 0
+        end
+    end
+    return values, shape, version
+end
+
+-------------------------------------------------------------------------------
+-- IK: one simIK environment per kinematic chain, created on first use and
+-- kept for the lifetime of the sandbox script. Chains are identified by a
+-- key built from their base, tip, joints and settings.
+
+pyrepExt.ik = {}
+
+-- Creates the IK environment of a chain, unless cached. Without a target
+-- dummy in the scene (target == -1), a temporary one is created at the tip.
+-- Returns the key of the chain
+function pyrepExt.ikCreate(key, base, tip, target, joints, constraints, method, damping, maxIterations)
+    if pyrepExt.ik[key] then
+        return key
+    end
+    local env = simIK.createEnvironment()
+    local group = simIK.createGroup(env)
+    simIK.setGroupCalculation(env, group, method, damping, maxIterations)
+    local tempTarget = target == -1
+    if tempTarget then
+        target = sim.createDummy(0.01)
+        sim.setObjectPose(target, sim.getObjectPose(tip, sim.handle_world), sim.handle_world)
+    end
+    local _, simToIk = simIK.addElementFromScene(env, group, base, tip, target, constraints)
+    local ikJoints = {}
+    for i, j in ipairs(joints) do
+        ikJoints[i] = simToIk[j]
+    end
+    pyrepExt.ik[key] = {
+        env = env, group = group, base = base, ikBase = simToIk[base],
+        joints = joints, ikJoints = ikJoints, target = simToIk[target],
+    }
+    if tempTarget then
+        sim.removeObjects({target})
+    end
+    return key
+end
+
+-- Updates the IK environment from the scene: the pose of the base and the
+-- positions of the joints. Returns the joint positions
+function pyrepExt.ikSync(key)
+    local chain = pyrepExt.ik[key]
+    if chain.base ~= -1 then
+        local pose = sim.getObjectPose(chain.base, sim.handle_world)
+        simIK.setObjectPose(chain.env, chain.ikBase, pose, simIK.handle_world)
+    end
+    local positions = {}
+    for i, j in ipairs(chain.joints) do
+        positions[i] = sim.getJointPosition(j)
+        simIK.setJointPosition(chain.env, chain.ikJoints[i], positions[i])
+    end
+    return positions
+end
+
+-- Solves the chain for n target poses (flat n*7), relative to `relTo` (a
+-- scene object, or -1 for the world). Each solve starts from `seeds`: a flat
+-- n*dof array, a single dof configuration, or empty for the current scene
+-- configuration. Returns the flat n*dof solutions and n success flags
+function pyrepExt.ikSolve(key, poses, seeds, relTo)
+    local chain = pyrepExt.ik[key]
+    local env, ikJoints = chain.env, chain.ikJoints
+    local dof = #ikJoints
+    if #seeds == 0 then
+        seeds = pyrepExt.ikSync(key)
+    end
+    local seedStride = #seeds == dof and 0 or dof
+    local relPose = relTo ~= -1 and sim.getObjectPose(relTo, sim.handle_world) or nil
+    local solutions, success = {}, {}
+    for i = 1, #poses // 7 do
+        local s0 = seedStride * (i - 1)
+        for k, j in ipairs(ikJoints) do
+            simIK.setJointPosition(env, j, seeds[s0 + k])
+        end
+        local pose = {table.unpack(poses, 7 * i - 6, 7 * i)}
+        if relPose then
+            pose = sim.multiplyPoses(relPose, pose)
+        end
+        simIK.setObjectPose(env, chain.target, pose, simIK.handle_world)
+        local result = simIK.handleGroup(env, chain.group)
+        success[i] = result == simIK.result_success
+        local o = dof * (i - 1)
+        for k, j in ipairs(ikJoints) do
+            solutions[o + k] = simIK.getJointPosition(env, j)
+        end
+    end
+    return solutions, success
+end
+
+-- Erases the IK environment of a chain
+function pyrepExt.ikErase(key)
+    local chain = pyrepExt.ik[key]
+    if chain then
+        simIK.eraseEnvironment(chain.env)
+        pyrepExt.ik[key] = nil
+    end
+end
+
+-------------------------------------------------------------------------------
+-- Motion planning: one simOMPL task per robot, created on first use and kept
+-- for the lifetime of the sandbox script. A task plans one request at a time,
+-- either to completion, or by slices run in the sensing phase of each
+-- simulation step. The state of a request is 'planning', 'solved', 'failed'
+-- or 'cancelled'.
+
+pyrepExt.ompl = {}
+
+-- Creates the task and state space of a robot, unless cached. The state
+-- space has a dimension per joint, bounded by the joint limits.
+-- `collisionPairs` is a flat list of entity handles checked pairwise, e.g.
+-- {robotCollection, sim.handle_all}. Returns the key of the task
+function pyrepExt.omplCreate(key, joints, collisionPairs)
+    if pyrepExt.ompl[key] then
+        return key
+    end
+    local task = simOMPL.createTask('pyrepExt:' .. key)
+    local spaces = {}
+    for i, j in ipairs(joints) do
+        local cyclic, interval = sim.getJointInterval(j)
+        local low, high = interval[1], interval[1] + interval[2]
+        if cyclic then
+            low, high = -math.pi, math.pi
+        end
+        spaces[i] = simOMPL.createStateSpace(
+            'joint' .. i, simOMPL.StateSpaceType.joint_position, j, {low}, {high}, i <= 3 and 1 or 0
+        )
+    end
+    simOMPL.setStateSpace(task, spaces)
+    if #collisionPairs > 0 then
+        simOMPL.setCollisionPairs(task, collisionPairs)
+    end
+    pyrepExt.ompl[key] = {task = task, joints = joints, state = 'cancelled', budget = 0, slice = 0}
+    return key
+end
+
+-- Starts planning from `start` (the current configuration if empty) to
+-- `goal` with an algorithm (a name in simOMPL.Algorithm), for at most
+-- `budget` seconds. With `slice` > 0, planning proceeds by slices of that
+-- many seconds, see omplAdvance; otherwise it completes now. Any previous
+-- request of the task is cancelled. Returns the state of the request
+function pyrepExt.omplStart(key, algorithm, start, goal, budget, slice)
+    local p = pyrepExt.ompl[key]
+    if #start == 0 then
+        for i, j in ipairs(p.joints) do
+            start[i] = sim.getJointPosition(j)
+        end
+    end
+    simOMPL.setAlgorithm(p.task, simOMPL.Algorithm[algorithm])
+    simOMPL.setStartState(p.task, start)
+    simOMPL.setGoalState(p.task, goal)
+    simOMPL.setup(p.task)
+    p.state, p.budget, p.slice = 'planning', budget, slice
+    if slice <= 0 then
+        return pyrepExt.omplAdvance(key, budget)
+    end
+    return p.state
+end
+
+-- Plans for one slice of `dt` seconds (the slice of the request if <= 0),
+-- within the remaining budget. Returns the state of the request
+function pyrepExt.omplAdvance(key, dt)
+    local p = pyrepExt.ompl[key]
+    if p.state ~= 'planning' then
+        return p.state
+    end
+    dt = math.min(dt > 0 and dt or p.slice, p.budget)
+    simOMPL.solve(p.task, dt)
+    p.budget = p.budget - dt
+    if simOMPL.hasExactSolution(p.task) then
+        p.state = 'solved'
+    elseif p.budget <= 0 then
+        p.state = 'failed'
+    end
+    return p.state
+end
+
+-- Advances the sliced requests of all the tasks, once per simulation step
+function pyrepExt.omplAdvanceAll()
+    for key, p in pairs(pyrepExt.ompl) do
+        if p.state == 'planning' and p.slice > 0 then
+            pyrepExt.omplAdvance(key, 0)
+        end
+    end
+end
+
+-- Returns the flat path of a solved request, after simplifying it for at
+-- most `simplifyTime` seconds (if > 0) and interpolating it to `states`
+-- states (if > 0)
+function pyrepExt.omplPath(key, simplifyTime, states)
+    local p = pyrepExt.ompl[key]
+    if simplifyTime > 0 then
+        simOMPL.simplifyPath(p.task, simplifyTime)
+    end
+    if states > 0 then
+        simOMPL.interpolatePath(p.task, states)
+    end
+    return simOMPL.getPath(p.task)
+end
+
+function pyrepExt.omplState(key)
+    return pyrepExt.ompl[key].state
+end
+
+function pyrepExt.omplCancel(key)
+    local p = pyrepExt.ompl[key]
+    if p.state == 'planning' then
+        p.state = 'cancelled'
+    end
+end
+
+-------------------------------------------------------------------------------
+-- Trajectories: joint waypoints uploaded once, and applied in the actuation
+-- phase of each simulation step.
+
+pyrepExt.trajectories = {}
+
+-- Starts following n waypoints (flat n*dof) with joints, from the next step.
+-- Without `times`, a waypoint is applied per step. Otherwise, `times` gives
+-- the (increasing, from 0) time of each waypoint, and the joints follow the
+-- linear interpolation of the waypoints at the time of each step.
+-- `setTarget`: whether to set target positions (for joints in position
+-- control) or positions. Replaces any trajectory with the same key. Returns
+-- the number of steps the trajectory takes
+function pyrepExt.trajStart(key, joints, points, times, setTarget)
+    local dt = sim.getSimulationTimeStep()
+    local n = #points // #joints
+    local steps = #times == 0 and n or math.floor(times[n] / dt + 1e-9) + 1
+    pyrepExt.trajectories[key] = {
+        joints = joints, points = points, times = times, n = n, dt = dt,
+        set = setTarget and sim.setJointTargetPosition or sim.setJointPosition,
+        steps = steps, step = 0, segment = 1,
+    }
+    return steps
+end
+
+local function followTrajectory(traj)
+    local dof = #traj.joints
+    local i, a = traj.step + 1, 0
+    if #traj.times > 0 then
+        -- the waypoint before t, and the interpolation towards the next one
+        local t, times = traj.step * traj.dt, traj.times
+        while traj.segment < traj.n and times[traj.segment + 1] <= t do
+            traj.segment = traj.segment + 1
+        end
+        i = traj.segment
+        if i < traj.n then
+            a = (t - times[i]) / (times[i + 1] - times[i])
+        end
+    end
+    for k, j in ipairs(traj.joints) do
+        local p = traj.points[(i - 1) * dof + k]
+        if a > 0 then
+            p = p + a * (traj.points[i * dof + k] - p)
+        end
+        traj.set(j, p)
+    end
+    traj.step = traj.step + 1
+end
+
+function pyrepExt.trajAdvanceAll()
+    for _, traj in pairs(pyrepExt.trajectories) do
+        if traj.step < traj.steps then
+            followTrajectory(traj)
+        end
+    end
+end
+
+-- Returns the number of steps of a trajectory done so far, and its total
+function pyrepExt.trajProgress(key)
+    local traj = pyrepExt.trajectories[key]
+    if not traj then
+        return 0, 0
+    end
+    return traj.step, traj.steps
+end
+
+function pyrepExt.trajStop(key)
+    pyrepExt.trajectories[key] = nil
+end
+
+-------------------------------------------------------------------------------
+-- Step hooks: Python callbacks run in the actuation and sensing phases of each
+-- simulation step. Each hook is a table {index, reads, writes}, where `reads`
+-- is a list of {funcName, args} evaluated to build the callback arguments,
+-- and `writes` is a list of {funcName, args} called with the i-th callback
+-- return value appended to args.
+
+pyrepExt.hooks = {actuation = {}, sensing = {}}
+
+function pyrepExt.setHooks(phase, hooks)
+    pyrepExt.hooks[phase] = hooks
+end
+
+local function appendArg(args, value)
+    local out = table.pack(table.unpack(args))
+    out[out.n + 1] = value
+    return table.unpack(out, 1, out.n + 1)
+end
+
+function pyrepExt.runHooks(phase)
+    for _, hook in ipairs(pyrepExt.hooks[phase]) do
+        local inArgs = {}
+        for i, r in ipairs(hook[2]) do
+            inArgs[i] = pyrepExt.resolve(r[1])(table.unpack(r[2]))
+        end
+        local outArgs = table.pack(pyrepExt.invoke(hook[1], table.unpack(inArgs, 1, #hook[2])))
+        for i, w in ipairs(hook[3]) do
+            pyrepExt.resolve(w[1])(appendArg(w[2], outArgs[i]))
+        end
+    end
+end
+
+local _actuation = sysCall_actuation
+function sysCall_actuation(...)
+    if _actuation then _actuation(...) end
+    pyrepExt.runHooks('actuation')
+    pyrepExt.trajAdvanceAll()
+end
+
+local _sensing = sysCall_sensing
+function sysCall_sensing(...)
+    if _sensing then _sensing(...) end
+    pyrepExt.runHooks('sensing')
+    pyrepExt.omplAdvanceAll()
+end
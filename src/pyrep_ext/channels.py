@@ -0,0 +1,123 @@
+"""Typed data channels between Python and the scripts of a scene
+
+Large arrays (lidar scans, heightmaps, ...) are exchanged as raw bytes in
+custom data properties, a single stack item each way, rather than as tables
+marshalled value by value::
+
+    pr.channel("heightmap").write(heightmap)  # any shape, e.g. (H, W) float32
+    scans = pr.channel("scans", handle=lidar.get_handle())
+    scan = scans.poll()  # the scan written since the last poll, or None
+
+Arrays are read back as read-only `np.frombuffer` views of the bytes
+received. Each channel is double buffered and versioned: writes alternate
+between two slots, and only versions newer than the last one read are
+transferred. Scripts in the scene read and write the same format with
+`pyrepExt.channelRead` and `pyrepExt.channelWrite`.
+"""
+
+import struct
+from typing import Optional
+
+import numpy as np
+
+from pyrep_ext.core import bridge
+from pyrep_ext.core.errors import PyRepError
+from pyrep_ext.core.sim import SimBackend
+
+_MAGIC = b"PXA1"
+# magic, dtype string (e.g. "<f4") and number of dimensions, then each
+# dimension as a uint64, so the data is aligned on 8 bytes
+_HEADER = struct.Struct("<4s4sI4x")
+# The dtypes the Lua side can decode, without byte order
+DTYPES = ("f4", "f8", "i1", "i2", "i4", "i8", "u1", "u2", "u4", "u8", "b1")
+
+
+def encode_array(array: np.ndarray) -> bytes:
+    """Encodes an array as a channel header followed by its data"""
+    array = np.asarray(array)
+    if array.dtype.str[1:] not in DTYPES:
+        raise TypeError(f"unsupported dtype: {array.dtype}")
+    array = array.astype(array.dtype.newbyteorder("<"), order="C", copy=False)
+    shape = struct.pack(f"<{array.ndim}Q", *array.shape)
+    header = _HEADER.pack(_MAGIC, array.dtype.str.encode(), array.ndim)
+    return b"".join((header, shape, array.data))
+
+
+def decode_array(data: bytes) -> np.ndarray:
+    """Decodes an encoded array, as a read-only view of `data`"""
+    magic, dtype, ndim = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise PyRepError("Invalid data in channel")
+    shape = struct.unpack_from(f"<{ndim}Q", data, _HEADER.size)
+    return np.frombuffer(
+        data,
+        dtype=dtype.rstrip(b"\0").decode(),
+        count=int(np.prod(shape)),
+        offset=_HEADER.size + 8 * ndim,
+    ).reshape(shape)
+
+
+class DataChannel:
+    """A named channel of arrays, see the module documentation
+
+    :param name: The name of the channel.
+    :param handle: The object the data is attached to, the scene if None.
+    """
+
+    def __init__(self, name: str, handle: Optional[int] = None):
+        if handle is None:
+            handle = SimBackend().sim_api.handle_scene
+        self._name = name
+        self._handle = handle
+        self._version = 0
+        self._array: Optional[np.ndarray] = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def handle(self) -> int:
+        return self._handle
+
+    @property
+    def version(self) -> int:
+        """The version of the last array read, 0 if none"""
+        return self._version
+
+    def write(self, array: np.ndarray) -> int:
+        """Publishes an array, returning its version"""
+        return bridge.call(
+            "pyrepExt.channelPublish",
+            (self._handle, self._name, encode_array(array)),
+            (("int", "string", "buffer"), ("int",)),
+        )
+
+    def poll(self) -> Optional[np.ndarray]:
+        """Returns the array written since the last read, None if none
+
+        Only the version of the channel is transferred when it is unchanged.
+        """
+        version, data = bridge.call(
+            "pyrepExt.channelFetch",
+            (self._handle, self._name, self._version),
+            (("int", "string", "int"), ("int", "buffer")),
+        )
+        if version == self._version:
+            return None
+        self._version = version
+        self._array = decode_array(data) if data else None
+        return self._array
+
+    def read(self) -> Optional[np.ndarray]:
+        """Returns the latest array, None if the channel is empty"""
+        self.poll()
+        return self._array
+
+    def clear(self) -> None:
+        """Removes the data of the channel from the simulator"""
+        bridge.call(
+            "pyrepExt.channelClear",
+            (self._handle, self._name),
+            (("int", "string"), ()),
+        )
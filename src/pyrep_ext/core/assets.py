@@ -0,0 +1,181 @@
+"""In-memory copies of scene and model files
+
+Files given to `preload` are read once, and `PyRep.launch` and
+`PyRep.import_model` hand their content to the simulator (which accepts a
+serialized buffer in place of a filename) instead of the path. Processes
+forked after preloading share the buffers, see `pyrep_ext.suite.forkserver`.
+
+A `ModelCache` goes further for models instantiated many times: each model is
+loaded once, as a hidden template in the scene, and copies are made in the
+simulator with `sim.copyPasteObjects`.
+"""
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from . import bridge
+
+# Model properties making a template inert and invisible
+TEMPLATE_MODEL_PROPERTIES = (
+    "not_collidable",
+    "not_measurable",
+    "not_renderable",
+    "not_detectable",
+    "not_dynamic",
+    "not_respondable",
+    "not_visible",
+    "scripts_inactive",
+)
+
+_preloaded: Dict[str, bytes] = {}
+
+
+def _key(path: Union[str, Path]) -> str:
+    return os.path.abspath(path)
+
+
+def preload(path: Union[str, Path]) -> bytes:
+    """Reads a scene or model file into memory, if not done already"""
+    key = _key(path)
+    if key not in _preloaded:
+        with open(key, "rb") as fhandle:
+            _preloaded[key] = fhandle.read()
+    return _preloaded[key]
+
+
+def get_preloaded(path: Union[str, Path]) -> Optional[bytes]:
+    """Returns the content of a preloaded file, None if not preloaded"""
+    return _preloaded.get(_key(path))
+
+
+def clear_preloaded() -> None:
+    _preloaded.clear()
+
+
+def _load(func: str, path: Union[str, Path]) -> Any:
+    buffer = get_preloaded(path)
+    if buffer is None:
+        return bridge.call(func, (str(path),), (("string",), ("int",)))
+    # The calltip declares a string, which the API proxy would encode
+    return bridge.call(func, (buffer,), (("buffer",), ("int",)))
+
+
+def load_scene(path: Union[str, Path]) -> None:
+    """Loads a scene, from its content if preloaded"""
+    _load("sim.loadScene", path)
+
+
+def load_model(path: Union[str, Path]) -> int:
+    """Loads a model, from its content if preloaded, returning its handle"""
+    return _load("sim.loadModel", path)
+
+
+class _Template:
+    __slots__ = ("handle", "uid", "model_property", "nbytes")
+
+    def __init__(self, handle: int, uid: int, model_property: int, nbytes: int):
+        self.handle = handle
+        # Handles are reused once freed, e.g. after loadScene
+        self.uid = uid
+        self.model_property = model_property
+        self.nbytes = nbytes
+
+
+class ModelCache:
+    """Instantiates models from templates kept hidden in the scene
+
+    Templates are evicted, least recently used first, when their total size
+    exceeds `max_bytes`. The size of a template is estimated by the size of
+    its model file. Note that templates are saved along with the scene.
+
+    :param sim_api: The `sim` API namespace, e.g. `SimBackend().sim_api`.
+    :param max_bytes: Maximum total size of the templates.
+    """
+
+    def __init__(self, sim_api: Any, max_bytes: int = 256 * 2**20):
+        self._sim_api = sim_api
+        self.max_bytes = max_bytes
+        self._templates: "OrderedDict[str, _Template]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._hidden = 0
+        for name in TEMPLATE_MODEL_PROPERTIES:
+            self._hidden |= getattr(sim_api, f"modelproperty_{name}")
+
+    def instantiate(self, path: Union[str, Path], count: int = 1) -> List[int]:
+        """Creates `count` copies of a model, returning their root handles
+
+        All the copies are made in a single call to the simulator.
+        """
+        key = _key(path)
+        template = self._templates.get(key)
+        handles = None
+        if template is not None:
+            self._templates.move_to_end(key)
+            handles = self._copy(template, count)
+            if handles is None:  # removed from the scene, e.g. by loadScene
+                self._forget(key)
+        if handles is None:
+            self.misses += 1
+            template = self._load(key)
+            handles = self._copy(template, count)
+            self._evict()
+        else:
+            self.hits += 1
+        return handles
+
+    def evict(self, path: Union[str, Path]) -> None:
+        """Removes the template of a model from the scene"""
+        template = self._forget(_key(path))
+        if template is not None and self._exists(template):
+            self._sim_api.removeModel(template.handle)
+
+    def clear(self) -> None:
+        """Removes all the templates from the scene"""
+        for key in list(self._templates):
+            self.evict(key)
+
+    def __contains__(self, path: Union[str, Path]) -> bool:
+        return _key(path) in self._templates
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def _load(self, key: str) -> _Template:
+        buffer = get_preloaded(key)
+        nbytes = os.path.getsize(key) if buffer is None else len(buffer)
+        handle = load_model(key)
+        model_property = self._sim_api.getModelProperty(handle)
+        self._sim_api.setModelProperty(handle, model_property | self._hidden)
+        uid = self._sim_api.getObjectUid(handle)
+        template = _Template(handle, uid, model_property, nbytes)
+        self._templates[key] = template
+        self.nbytes += nbytes
+        return template
+
+    def _copy(self, template: _Template, count: int) -> Optional[List[int]]:
+        return bridge.call(
+            "pyrepExt.instantiate",
+            (template.handle, template.uid, count, template.model_property),
+            (("int", "int", "int", "int"), (None,)),
+        )
+
+    def _exists(self, template: _Template) -> bool:
+        sim = self._sim_api
+        return bool(sim.isHandle(template.handle)) and (
+            sim.getObjectUid(template.handle) == template.uid
+        )
+
+    def _forget(self, key: str) -> Optional[_Template]:
+        template = self._templates.pop(key, None)
+        if template is not None:
+            self.nbytes -= template.nbytes
+        return template
+
+    def _evict(self) -> None:
+        # The most recently used template is kept, even if too large
+        while self.nbytes > self.max_bytes and len(self._templates) > 1:
+            self.evict(next(iter(self._templates)))
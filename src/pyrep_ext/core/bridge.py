@@ -2,16 +2,24 @@ import ctypes
 import functools
 import sys
 
+import numpy as np
+
+from . import cbor_codec
 from .lib import const, cpllib
 from .stack import read, write
 
+# Calls with at least this many values in their list and dict arguments send
+# them, and get their results, as a single CBOR buffer (see `call_cbor` and
+# benchmarks/bench_cbor.py). None to always marshal item by item
+CBOR_THRESHOLD = 64
+
 
 def load():
     # add coppeliaSim's pythondir to sys.path:
     pythonDirPtr = cpllib.simGetStringParam(const.sim_stringparam_pythondir)
     pythonDir = ctypes.string_at(pythonDirPtr).decode("utf-8")
     cpllib.simReleaseBuffer(pythonDirPtr)
-    if pythonDir not in sys.path:
+    if pythonDir and pythonDir not in sys.path:
         sys.path.append(pythonDir)
 
     # load lua functions for call(), getObject(), etc...:
@@ -20,12 +28,13 @@ def load():
 
 @functools.cache
 def getTypeHints(func):
-    # calltip comes from the CoppeliaSim python folder, added to sys.path
-    from calltip import FuncDef, VarArgs  # type: ignore
-
     c = call("sim.getApiInfo", [-1, func], (("int", "string"), ("string")))
     if not c:
         return (None, None)
+
+    # calltip comes from the CoppeliaSim python folder, added to sys.path
+    from calltip import FuncDef, VarArgs  # type: ignore
+
     c = c.split("\n")[0]
     fd = FuncDef.from_calltip(c)
     inArgs = list(fd.in_args)
@@ -37,12 +46,17 @@ def getTypeHints(func):
     return tuple(tuple(item.type for item in x) for x in (inArgs, outArgs))
 
 
-def call(func, args, typeHints=None):
+def call(func, args, typeHints=None, script=None):
+    """Calls `func` in the sandbox script, or in the given script handle"""
     if typeHints is None:
         typeHints = getTypeHints(func)
+    if script is None and _is_bulk(args):
+        return call_cbor(func, args, typeHints)
     stackHandle = cpllib.simCreateStack()
     write(stackHandle, args, typeHints[0])
-    s = cpllib.simGetScriptHandleEx(const.sim_scripttype_sandbox, -1, None)
+    s = script
+    if s is None:
+        s = cpllib.simGetScriptHandleEx(const.sim_scripttype_sandbox, -1, None)
     f = ctypes.c_char_p(f"{func}@lua".encode("ascii"))
     r = cpllib.simCallScriptFunctionEx(s, f, stackHandle)
     if r == -1:
@@ -59,6 +73,101 @@ def call(func, args, typeHints=None):
         return ret
 
 
+def _is_bulk(args):
+    if CBOR_THRESHOLD is None:
+        return False
+    if not any(isinstance(a, (list, dict)) for a in args):
+        return False
+    return cbor_codec.count_items(args, CBOR_THRESHOLD) >= CBOR_THRESHOLD
+
+
+def _empty_list(value):
+    # Empty tables are read as dicts without a "list" hint
+    return [] if value == {} else value
+
+
+def _to_array(value):
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float64).reshape(-1)
+    return np.array(_empty_list(value), dtype=np.float64)
+
+
+def _to_buffer(value):
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
+# Conversions giving arguments and results the types they have when
+# marshalled item by item with the same type hints
+_CBOR_ARGS = {
+    "float": float,
+    "double": float,
+    "int": int,
+    "long": int,
+    "bool": bool,
+    "ndarray": np.asarray,
+    "null": lambda _: None,
+}
+_CBOR_RESULTS = {
+    "float": float,
+    "double": float,
+    "int": int,
+    "long": int,
+    "bool": bool,
+    "buffer": _to_buffer,
+    "ndarray": _to_array,
+    "list": _empty_list,
+    "null": lambda _: None,
+}
+
+
+def _convert(values, hints, conversions):
+    hints = hints or ()
+    return [
+        conversions.get(hints[i], _identity)(v) if i < len(hints) else v
+        for i, v in enumerate(values)
+    ]
+
+
+def _identity(value):
+    return value
+
+
+def call_cbor(func, args, typeHints=((), ())):
+    """Calls `func` in the sandbox script, with its arguments and results
+    encoded as CBOR (see `pyrepExt.cborCall`)
+
+    Gives the same results as `call`, to which large payloads are cheaper to
+    pass as a single buffer than item by item. Done by `call` above
+    `CBOR_THRESHOLD` values.
+    """
+    args = _convert(args, typeHints[0], _CBOR_ARGS)
+    data = call(
+        "pyrepExt.cborCall",
+        (func, len(args), cbor_codec.encode(args)),
+        (("string", "int", "buffer"), ("buffer",)),
+    )
+    ret = _convert(cbor_codec.decode(data), typeHints[1], _CBOR_RESULTS)
+    if len(ret) == 1:
+        return ret[0]
+    elif len(ret) > 1:
+        return tuple(ret)
+
+
+def call_batch(calls):
+    """Makes several calls `(func, args)` in a single round trip
+
+    The calls run in order on the Lua side (see `pyrepExt.batch`). Returns a
+    list with `(True, result)` or `(False, errorMessage)` for each call, where
+    functions with several return values give a list as result. Arguments are
+    marshalled without type hints.
+    """
+    if not calls:
+        return []
+    payload = [[func, list(args), len(args)] for func, args in calls]
+    ret = call("pyrepExt.batch", (payload,), ((None,), ("list",)))
+    return [(r[0], r[1] if len(r) > 1 else None) for r in ret]
+
+
 def getObject(name, _info=None):
     ret = type(name, (), {})
     if not _info:
@@ -0,0 +1,89 @@
+"""CBOR payloads, an alternative to marshalling values item by item
+
+`stack.write` pushes nested lists and dicts value by value, with a call to
+the simulator library per key and value. Large payloads (scene descriptions,
+randomization specs, batches of commands) are instead encoded once with
+cbor2 and pushed as a single buffer, decoded on the Lua side by
+`pyrepExt.cborDecode` (see `bridge.call_cbor`), and results come back the
+same way.
+
+NumPy arrays are encoded as RFC 8746 typed arrays (their raw little-endian
+data, in a tag 40 multi-dimensional array if not 1-D), which the Lua side
+decodes as flat tables of numbers, as `stack.write_array` pushes them.
+"""
+
+from typing import Any, Sequence
+
+import cbor2
+import numpy as np
+
+# RFC 8746 tags of the little-endian typed arrays, by dtype without the byte
+# order
+_TAGS = {
+    "u1": 64,
+    "u2": 69,
+    "u4": 70,
+    "u8": 71,
+    "i1": 72,
+    "i2": 77,
+    "i4": 78,
+    "i8": 79,
+    "f4": 85,
+    "f8": 86,
+}
+_DTYPES = {tag: np.dtype("<" + code) for code, tag in _TAGS.items()}
+_MULTI_DIMENSIONAL = 40
+
+
+def _encode_array(encoder: cbor2.CBOREncoder, value: Any) -> None:
+    if isinstance(value, np.generic):
+        encoder.encode(value.item())
+        return
+    if not isinstance(value, np.ndarray):
+        raise cbor2.CBOREncodeTypeError(f"cannot encode {type(value)}")
+    if value.dtype.kind == "b":  # as booleans, 0 being true in Lua
+        encoder.encode(value.reshape(-1).tolist())
+        return
+    code = value.dtype.str[1:]
+    if code not in _TAGS:  # e.g. float16, pushed as doubles item by item
+        code = "f8"
+    data = value.astype("<" + code, order="C", copy=False).tobytes()
+    typed = cbor2.CBORTag(_TAGS[code], data)
+    if value.ndim != 1:
+        typed = cbor2.CBORTag(_MULTI_DIMENSIONAL, [list(value.shape), typed])
+    encoder.encode(typed)
+
+
+def _decode_tag(*args: Any) -> Any:
+    # (decoder, tag) before cbor2 6, (tag, immutable) since
+    tag = args[0] if isinstance(args[0], cbor2.CBORTag) else args[1]
+    if tag.tag in _DTYPES:
+        return np.frombuffer(tag.value, dtype=_DTYPES[tag.tag])
+    if tag.tag == _MULTI_DIMENSIONAL:
+        shape, array = tag.value
+        return array.reshape(shape)
+    return tag
+
+
+def encode(value: Any) -> bytes:
+    return cbor2.dumps(value, default=_encode_array)
+
+
+def decode(data: bytes) -> Any:
+    """Decodes a payload, typed arrays as read-only views of `data`"""
+    return cbor2.loads(data, tag_hook=_decode_tag)
+
+
+def count_items(values: Sequence[Any], limit: int) -> int:
+    """Counts the values (keys included) of nested lists and dicts, up to
+    `limit`. Arrays count as one, as they are pushed in bulk anyway"""
+    count, pending = 0, list(values)
+    while pending and count < limit:
+        value = pending.pop()
+        count += 1
+        if isinstance(value, list):
+            pending.extend(value)
+        elif isinstance(value, dict):
+            count += len(value)
+            pending.extend(value.values())
+    return count
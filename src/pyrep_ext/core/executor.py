@@ -0,0 +1,230 @@
+"""Runs simulator work on the simulation thread, on behalf of any thread
+
+CoppeliaSim must only be called from the thread that called `simInitialize`.
+A `SimExecutor` owns that thread: other threads enqueue work items and get a
+`concurrent.futures.Future` back. Consecutive API calls in the queue are sent
+to the simulator in a single batched bridge call (see `bridge.call_batch`)::
+
+    pr = PyRep()
+    executor = SimExecutor()
+    executor.start(init=lambda: pr.launch(scene, headless=True), step=pr.step)
+    pr.start()  # any call from the owning thread is fine too
+
+    # from any other thread, e.g. telemetry
+    position = executor.call("sim.getObjectPosition", handle, -1).result()
+    executor.submit(pr.set_simulation_timestep, 0.01).result()
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+from .bridge import call_batch
+from .errors import CoppeliaSimError
+
+
+class _Task:
+    __slots__ = ("future", "func", "args", "kwargs")
+
+    def __init__(self, future: Future, func: Callable, args, kwargs):
+        self.future = future
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+
+class _ApiCall:
+    __slots__ = ("future", "func", "args")
+
+    def __init__(self, future: Future, func: str, args: Tuple):
+        self.future = future
+        self.func = func
+        self.args = args
+
+
+class SimExecutor:
+    """Executes work items on the simulation thread
+
+    Work items are kept in a `collections.deque`, whose `append` and
+    `popleft` are atomic, so producers never block on a lock.
+
+    :param max_batch: Maximum number of API calls sent in a single batch.
+    :param idle_timeout: Time (in seconds) the simulation thread sleeps
+        waiting for work, when not stepping continuously.
+    """
+
+    def __init__(self, max_batch: int = 256, idle_timeout: float = 0.1):
+        self._queue: Deque[Any] = deque()
+        self._wakeup = threading.Event()
+        self._max_batch = max_batch
+        self._idle_timeout = idle_timeout
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id: Optional[int] = None
+        self._ready = threading.Event()
+        self._init_error: Optional[BaseException] = None
+        self._stop = False
+        self._step: Optional[Callable[[], Any]] = None
+        self.num_batches = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_sim_thread(self) -> bool:
+        """Whether the calling thread is the simulation thread"""
+        return threading.get_ident() == self._thread_id
+
+    def start(
+        self,
+        init: Optional[Callable[[], Any]] = None,
+        step: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """Starts the simulation thread
+
+        :param init: Called first on the new thread, e.g. `PyRep.launch`,
+            making it the simulation thread. Errors are re-raised here.
+        :param step: If given, called continuously in between work items
+            (e.g. `PyRep.step`). Otherwise, the thread waits for work.
+        """
+        if self._thread is not None:
+            raise RuntimeError("SimExecutor already started")
+        self._step = step
+        self._stop = False
+        self._thread = threading.Thread(
+            target=self._run, args=(init,), name="SimExecutor", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._init_error is not None:
+            self._thread.join()
+            self._thread = None
+            raise self._init_error
+
+    def set_step(self, step: Optional[Callable[[], Any]]) -> None:
+        """Changes the function called continuously by the simulation thread"""
+        self._step = step
+        self._wakeup.set()
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Schedules `func(*args, **kwargs)` to run on the simulation thread
+
+        If called from the simulation thread itself, `func` runs right away
+        (after any pending work), so waiting on the result can't deadlock.
+        """
+        future: Future = Future()
+        self._queue.append(_Task(future, func, args, kwargs))
+        self._notify()
+        return future
+
+    def call(self, func: str, *args) -> Future:
+        """Schedules a call to an API function, e.g. `sim.getObjectPosition`
+
+        Calls queued back to back are coalesced into a single round trip.
+        """
+        future: Future = Future()
+        self._queue.append(_ApiCall(future, func, args))
+        self._notify()
+        return future
+
+    def map_calls(self, calls: List[Tuple[str, Tuple]]) -> List[Future]:
+        """Schedules several API calls `(func, args)`, batched together"""
+        futures = []
+        for func, args in calls:
+            future: Future = Future()
+            self._queue.append(_ApiCall(future, func, tuple(args)))
+            futures.append(future)
+        self._notify()
+        return futures
+
+    def run_pending(self) -> int:
+        """Runs the work queued so far. Must be called on the sim thread
+
+        Returns the number of work items processed.
+        """
+        count = 0
+        batch: List[_ApiCall] = []
+        while self._queue:
+            item = self._queue.popleft()
+            count += 1
+            if isinstance(item, _ApiCall):
+                batch.append(item)
+                if len(batch) >= self._max_batch:
+                    self._run_batch(batch)
+                    batch = []
+                continue
+            if batch:  # keep the order of calls and tasks
+                self._run_batch(batch)
+                batch = []
+            self._run_task(item)
+        if batch:
+            self._run_batch(batch)
+        return count
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the simulation thread, after running the pending work"""
+        self._stop = True
+        self._wakeup.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def _notify(self) -> None:
+        if self.is_sim_thread():
+            self.run_pending()
+        else:
+            self._wakeup.set()
+
+    def _run(self, init: Optional[Callable[[], Any]]) -> None:
+        self._thread_id = threading.get_ident()
+        try:
+            if init is not None:
+                init()
+        except BaseException as e:
+            self._init_error = e
+            self._thread_id = None
+            self._ready.set()
+            return
+        self._ready.set()
+        while not self._stop:
+            self._wakeup.clear()
+            self.run_pending()
+            step = self._step
+            if step is not None:
+                step()
+            else:
+                self._wakeup.wait(self._idle_timeout)
+        self.run_pending()
+        self._thread_id = None
+
+    @staticmethod
+    def _run_task(task: _Task) -> None:
+        if not task.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = task.func(*task.args, **task.kwargs)
+        except BaseException as e:
+            task.future.set_exception(e)
+        else:
+            task.future.set_result(result)
+
+    def _run_batch(self, batch: List[_ApiCall]) -> None:
+        batch = [c for c in batch if c.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.num_batches += 1
+        try:
+            results = call_batch([(c.func, c.args) for c in batch])
+        except BaseException as e:
+            for c in batch:
+                c.future.set_exception(e)
+            return
+        for c, (ok, value) in zip(batch, results):
+            if ok:
+                c.future.set_result(value)
+            else:
+                c.future.set_exception(
+                    CoppeliaSimError(f"{c.func} failed: {value}")
+                )
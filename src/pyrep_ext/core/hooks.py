@@ -0,0 +1,134 @@
+"""Python callbacks run by the simulator inside each simulation step
+
+Hooks are registered with `simRegCallback` and called from the sandbox script
+during the actuation or sensing phase of every step (see `pyrepExt.lua`), so
+they run in lockstep with physics without polling from Python. To avoid extra
+round trips, a hook declares the API calls that produce its arguments
+(`reads`) and the API calls that consume its return values (`writes`); both
+are evaluated on the Lua side::
+
+    hinge = Joint("/hinge").get_handle()
+
+    @pr.hooks.actuation(
+        reads=[("sim.getJointPosition", (hinge,))],
+        writes=[("sim.setJointTargetForce", (hinge,))],
+    )
+    def controller(q: float) -> float:
+        return -10.0 * q
+
+    observations = []
+
+    @pr.hooks.sensing(reads=[("sim.getJointPosition", (hinge,))])
+    def collect(q: float) -> None:
+        observations.append(q)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from . import bridge
+from .lib import c_callbackfn_p, cpllib
+from .stack import callback
+
+PHASES = ("actuation", "sensing")
+
+CallSpec = Tuple[str, Sequence[Any]]
+
+
+@dataclass
+class Hook:
+    index: int
+    phase: str
+    func: Callable
+    reads: Tuple[CallSpec, ...]
+    writes: Tuple[CallSpec, ...]
+    wrapper: Callable  # the stack-level wrapper of func
+    cfunc: Any  # the ctypes callback, must be kept alive while registered
+
+    @property
+    def errors(self) -> int:
+        """Number of times the callback raised an exception"""
+        return self.wrapper.errors  # type: ignore
+
+    def spec(self) -> List[Any]:
+        return [
+            self.index,
+            [[name, list(args)] for name, args in self.reads],
+            [[name, list(args)] for name, args in self.writes],
+        ]
+
+
+class HookRegistry:
+    """Keeps track of the Python callbacks run in each simulation step"""
+
+    def __init__(self):
+        self._hooks: Dict[str, List[Hook]] = {phase: [] for phase in PHASES}
+        self._free_indices: List[int] = []
+        self._next_index: int = 0
+
+    def add(
+        self,
+        func: Callable,
+        phase: str = "actuation",
+        reads: Sequence[CallSpec] = (),
+        writes: Sequence[CallSpec] = (),
+    ) -> Hook:
+        """Registers `func` to be called in the given phase of each step
+
+        :param func: The callback. Its annotations define how arguments and
+            return values are marshalled (see `stack.callback`).
+        :param phase: Either "actuation" or "sensing".
+        :param reads: API calls `(funcName, args)` evaluated in the simulator
+            whose results are passed to `func` as arguments, in order.
+        :param writes: API calls `(funcName, args)` made with each of the
+            values returned by `func` appended to their arguments, in order.
+        :return: The hook, which can be given to `remove`.
+        """
+        if phase not in PHASES:
+            raise ValueError(f"unknown phase: {phase}, expected {PHASES}")
+        if self._free_indices:
+            index = self._free_indices.pop()
+        else:
+            index = self._next_index
+            self._next_index += 1
+        # The stack-level wrapper (and its type plans) is built only once
+        wrapper = callback(func)
+        cfunc = c_callbackfn_p(wrapper)
+        cpllib.simRegCallback(index, cfunc)
+        hook = Hook(
+            index, phase, func, tuple(reads), tuple(writes), wrapper, cfunc
+        )
+        self._hooks[phase].append(hook)
+        self._sync(phase)
+        return hook
+
+    def remove(self, hook: Hook) -> None:
+        """Unregisters a hook returned by `add`"""
+        self._hooks[hook.phase].remove(hook)
+        self._sync(hook.phase)
+        self._free_indices.append(hook.index)
+
+    def actuation(
+        self, reads: Sequence[CallSpec] = (), writes: Sequence[CallSpec] = ()
+    ) -> Callable:
+        """Decorator version of `add` for the actuation phase"""
+        return lambda func: self.add(func, "actuation", reads, writes)
+
+    def sensing(
+        self, reads: Sequence[CallSpec] = (), writes: Sequence[CallSpec] = ()
+    ) -> Callable:
+        """Decorator version of `add` for the sensing phase"""
+        return lambda func: self.add(func, "sensing", reads, writes)
+
+    def invoke(self, hook: Hook, *args) -> Any:
+        """Calls a registered hook through the simulator, as in a step"""
+        return bridge.call("pyrepExt.invoke", (hook.index,) + args)
+
+    def __len__(self) -> int:
+        return sum(len(hooks) for hooks in self._hooks.values())
+
+    def _sync(self, phase: str) -> None:
+        specs = [hook.spec() for hook in self._hooks[phase]]
+        bridge.call("pyrepExt.setHooks", (phase, specs), (("string",), ()))
@@ -1,6 +1,7 @@
 import os
-import platform
+import sys
 from ctypes import (
+    CDLL,
     CFUNCTYPE,
     POINTER,
     c_bool,
@@ -13,6 +14,7 @@ from ctypes import (
     cdll,
 )
 from dataclasses import dataclass
+from typing import Any
 
 from .errors import PyRepError
 
@@ -25,111 +27,126 @@ c_ubyte_p = POINTER(c_ubyte)
 c_callbackfn_p = CFUNCTYPE(c_int, c_int)
 
 
-if "COPPELIASIM_ROOT" not in os.environ:
-    raise PyRepError(
-        "COPPELIASIM_ROOT not defined. See installation instructions."
-    )
-COPPELIASIM_ROOT = os.environ["COPPELIASIM_ROOT"]
-COPPELIASIM_LIBPATH = ""
-
-plat = platform.system()
-if plat == "Windows":
-    raise NotImplementedError("PyRepExt >> not implemented for Windows yet")
-elif plat == "Linux":
-    COPPELIASIM_LIBPATH = os.path.join(COPPELIASIM_ROOT, "libcoppeliaSim.so")
-elif plat == "Darwin":
-    raise NotImplementedError("PyRepExt >> not implemented for MacOS yet")
-
-
-os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = COPPELIASIM_ROOT
-
-cpllib = cdll.LoadLibrary(COPPELIASIM_LIBPATH)
-cpllib.simRunGui.argtypes = [c_int]
-cpllib.simRunGui.restype = c_void
-cpllib.simCreateStack.argtypes = []
-cpllib.simCreateStack.restype = c_int
-cpllib.simReleaseStack.argtypes = [c_int]
-cpllib.simReleaseStack.restype = c_int
-cpllib.simReleaseBuffer.argtypes = [c_void_p]
-cpllib.simReleaseBuffer.restype = c_int
-cpllib.simPushStringOntoStack.argtypes = [c_int, c_char_p, c_int]
-cpllib.simPushStringOntoStack.restype = c_int
-cpllib.simCallScriptFunctionEx.argtypes = [c_int, c_char_p, c_int]
-cpllib.simCallScriptFunctionEx.restype = c_int
-cpllib.simGetScriptHandleEx.argtypes = [c_int, c_int, c_char_p]
-cpllib.simGetScriptHandleEx.restype = c_int
-cpllib.simGetStackStringValue.argtypes = [c_int, c_int_p]
-cpllib.simGetStackStringValue.restype = c_void_p
-cpllib.simInitialize.argtypes = [c_char_p, c_int]
-cpllib.simInitialize.restype = c_int
-cpllib.simGetExitRequest.argtypes = []
-cpllib.simGetExitRequest.restype = c_int
-cpllib.simLoop.argtypes = [c_void_p, c_int]
-cpllib.simLoop.restype = c_int
-cpllib.simDeinitialize.argtypes = []
-cpllib.simDeinitialize.restype = c_int
-cpllib.simSetStringParam.argtypes = [c_int, c_char_p]
-cpllib.simSetStringParam.restype = c_int
-cpllib.simSetNamedStringParam.argtypes = [c_char_p, c_char_p, c_int]
-cpllib.simSetNamedStringParam.restype = c_int
-cpllib.simRegCallback.argtypes = [c_int, c_callbackfn_p]
-cpllib.simRegCallback.restype = c_void
-cpllib.simCopyStack.argtypes = [c_int]
-cpllib.simCopyStack.restype = c_int
-cpllib.simPushNullOntoStack.argtypes = [c_int]
-cpllib.simPushNullOntoStack.restype = c_int
-cpllib.simPushBoolOntoStack.argtypes = [c_int, c_bool]
-cpllib.simPushBoolOntoStack.restype = c_int
-cpllib.simPushInt32OntoStack.argtypes = [c_int, c_int]
-cpllib.simPushInt32OntoStack.restype = c_int
-cpllib.simPushInt64OntoStack.argtypes = [c_int, c_longlong]
-cpllib.simPushInt64OntoStack.restype = c_int
-cpllib.simPushUInt8TableOntoStack.argtypes = [c_int, c_ubyte_p, c_int]
-cpllib.simPushUInt8TableOntoStack.restype = c_int
-cpllib.simPushInt32TableOntoStack.argtypes = [c_int, c_int_p, c_int]
-cpllib.simPushInt32TableOntoStack.restype = c_int
-cpllib.simPushInt64TableOntoStack.argtypes = [c_int, c_longlong_p, c_int]
-cpllib.simPushInt64TableOntoStack.restype = c_int
-cpllib.simPushTableOntoStack.argtypes = [c_int]
-cpllib.simPushTableOntoStack.restype = c_int
-cpllib.simInsertDataIntoStackTable.argtypes = [c_int]
-cpllib.simInsertDataIntoStackTable.restype = c_int
-cpllib.simGetStackSize.argtypes = [c_int]
-cpllib.simGetStackSize.restype = c_int
-cpllib.simPopStackItem.argtypes = [c_int, c_int]
-cpllib.simPopStackItem.restype = c_int
-cpllib.simMoveStackItemToTop.argtypes = [c_int, c_int]
-cpllib.simMoveStackItemToTop.restype = c_int
-cpllib.simGetStackItemType.argtypes = [c_int, c_int]
-cpllib.simGetStackItemType.restype = c_int
-cpllib.simGetStackBoolValue.argtypes = [c_int, c_bool_p]
-cpllib.simGetStackBoolValue.restype = c_int
-cpllib.simGetStackInt32Value.argtypes = [c_int, c_int_p]
-cpllib.simGetStackInt32Value.restype = c_int
-cpllib.simGetStackInt64Value.argtypes = [c_int, c_longlong_p]
-cpllib.simGetStackInt64Value.restype = c_int
-cpllib.simGetStackTableInfo.argtypes = [c_int, c_int]
-cpllib.simGetStackTableInfo.restype = c_int
-cpllib.simGetStackUInt8Table.argtypes = [c_int, c_char_p, c_int]
-cpllib.simGetStackUInt8Table.restype = c_int
-cpllib.simGetStackInt32Table.argtypes = [c_int, c_int_p, c_int]
-cpllib.simGetStackInt32Table.restype = c_int
-cpllib.simGetStackInt64Table.argtypes = [c_int, c_longlong_p, c_int]
-cpllib.simGetStackInt64Table.restype = c_int
-cpllib.simUnfoldStackTable.argtypes = [c_int]
-cpllib.simUnfoldStackTable.restype = c_int
-cpllib.simGetStackDoubleValue.argtypes = [c_int, c_double_p]
-cpllib.simGetStackDoubleValue.restype = c_int
-cpllib.simGetStackDoubleTable.argtypes = [c_int, c_double_p, c_int]
-cpllib.simGetStackDoubleTable.restype = c_int
-cpllib.simPushDoubleOntoStack.argtypes = [c_int, c_double]
-cpllib.simPushDoubleOntoStack.restype = c_int
-cpllib.simPushDoubleTableOntoStack.argtypes = [c_int, c_double_p, c_int]
-cpllib.simPushDoubleTableOntoStack.restype = c_int
-cpllib.simDebugStack.argtypes = [c_int, c_int]
-cpllib.simDebugStack.restype = c_int
-cpllib.simGetStringParam.argtypes = [c_int]
-cpllib.simGetStringParam.restype = c_void_p
+# Signatures (argtypes, restype) of the libcoppeliaSim functions we use,
+# bound when the library is loaded
+_SIGNATURES = {
+    "simRunGui": ([c_int], c_void),
+    "simCreateStack": ([], c_int),
+    "simReleaseStack": ([c_int], c_int),
+    "simReleaseBuffer": ([c_void_p], c_int),
+    "simPushStringOntoStack": ([c_int, c_char_p, c_int], c_int),
+    "simCallScriptFunctionEx": ([c_int, c_char_p, c_int], c_int),
+    "simGetScriptHandleEx": ([c_int, c_int, c_char_p], c_int),
+    "simGetStackStringValue": ([c_int, c_int_p], c_void_p),
+    "simInitialize": ([c_char_p, c_int], c_int),
+    "simGetExitRequest": ([], c_int),
+    "simLoop": ([c_void_p, c_int], c_int),
+    "simDeinitialize": ([], c_int),
+    "simSetStringParam": ([c_int, c_char_p], c_int),
+    "simSetNamedStringParam": ([c_char_p, c_char_p, c_int], c_int),
+    "simRegCallback": ([c_int, c_callbackfn_p], c_void),
+    "simCopyStack": ([c_int], c_int),
+    "simPushNullOntoStack": ([c_int], c_int),
+    "simPushBoolOntoStack": ([c_int, c_bool], c_int),
+    "simPushInt32OntoStack": ([c_int, c_int], c_int),
+    "simPushInt64OntoStack": ([c_int, c_longlong], c_int),
+    "simPushUInt8TableOntoStack": ([c_int, c_ubyte_p, c_int], c_int),
+    "simPushInt32TableOntoStack": ([c_int, c_int_p, c_int], c_int),
+    "simPushInt64TableOntoStack": ([c_int, c_longlong_p, c_int], c_int),
+    "simPushTableOntoStack": ([c_int], c_int),
+    "simInsertDataIntoStackTable": ([c_int], c_int),
+    "simGetStackSize": ([c_int], c_int),
+    "simPopStackItem": ([c_int, c_int], c_int),
+    "simMoveStackItemToTop": ([c_int, c_int], c_int),
+    "simGetStackItemType": ([c_int, c_int], c_int),
+    "simGetStackBoolValue": ([c_int, c_bool_p], c_int),
+    "simGetStackInt32Value": ([c_int, c_int_p], c_int),
+    "simGetStackInt64Value": ([c_int, c_longlong_p], c_int),
+    "simGetStackTableInfo": ([c_int, c_int], c_int),
+    "simGetStackUInt8Table": ([c_int, c_char_p, c_int], c_int),
+    "simGetStackInt32Table": ([c_int, c_int_p, c_int], c_int),
+    "simGetStackInt64Table": ([c_int, c_longlong_p, c_int], c_int),
+    "simUnfoldStackTable": ([c_int], c_int),
+    "simGetStackDoubleValue": ([c_int, c_double_p], c_int),
+    "simGetStackDoubleTable": ([c_int, c_double_p, c_int], c_int),
+    "simPushDoubleOntoStack": ([c_int, c_double], c_int),
+    "simPushDoubleTableOntoStack": ([c_int, c_double_p, c_int], c_int),
+    "simDebugStack": ([c_int, c_int], c_int),
+    "simGetStringParam": ([c_int], c_void_p),
+}
+
+
+def load_coppeliasim() -> CDLL:
+    """Loads libcoppeliaSim and binds the signatures of the functions we use
+
+    This is deferred until the library is first used (usually when calling
+    `SimBackend.simInitialize`), so importing pyrep_ext does not require
+    CoppeliaSim nor pays for loading it.
+    """
+    if "COPPELIASIM_ROOT" not in os.environ:
+        raise PyRepError(
+            "COPPELIASIM_ROOT not defined. See installation instructions."
+        )
+    coppeliasim_root = os.environ["COPPELIASIM_ROOT"]
+
+    if sys.platform.startswith("win"):
+        raise NotImplementedError("PyRepExt >> not implemented for Windows yet")
+    elif sys.platform == "darwin":
+        raise NotImplementedError("PyRepExt >> not implemented for MacOS yet")
+    coppeliasim_libpath = os.path.join(coppeliasim_root, "libcoppeliaSim.so")
+
+    os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = coppeliasim_root
+
+    lib = cdll.LoadLibrary(coppeliasim_libpath)
+    for name, (argtypes, restype) in _SIGNATURES.items():
+        func = getattr(lib, name)
+        func.argtypes = argtypes
+        func.restype = restype
+    return lib
+
+
+class _LibProxy:
+    """Forwards attribute access to the active simulator library
+
+    The actual library is resolved on first use, either the one installed via
+    `set_backend` (e.g. a `StubLib`) or libcoppeliaSim itself. Resolved
+    attributes are cached in the instance dict, so only the first access of
+    each function goes through `__getattr__`.
+    """
+
+    def __init__(self):
+        object.__setattr__(self, "_impl", None)
+
+    def __getattr__(self, name: str) -> Any:
+        impl = self._impl
+        if impl is None:
+            impl = load_coppeliasim()
+            object.__setattr__(self, "_impl", impl)
+        value = getattr(impl, name)
+        object.__setattr__(self, name, value)
+        return value
+
+    def _set_impl(self, impl: Any) -> None:
+        self.__dict__.clear()
+        object.__setattr__(self, "_impl", impl)
+
+
+cpllib: Any = _LibProxy()
+
+
+def set_backend(impl: Any) -> None:
+    """Selects the library used by the stack and bridge modules
+
+    :param impl: An object exposing the `sim*` functions of libcoppeliaSim,
+        like `pyrep_ext.core.stub.StubLib`. Use None to go back to loading
+        the actual libcoppeliaSim on first use.
+    """
+    cpllib._set_impl(impl)
+
+
+def get_backend() -> Any:
+    """Returns the library currently in use, or None if not resolved yet"""
+    return cpllib._impl
 
 
 @dataclass(frozen=True)
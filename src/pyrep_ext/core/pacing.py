@@ -0,0 +1,95 @@
+"""Wall-clock pacing of simulation steps
+
+A `Pacer` makes each call to `wait` return at `start + k * period`, sleeping
+for most of the remaining time and spinning for the last bit, as `time.sleep`
+alone may wake up a millisecond or more late. When a step overruns its slot,
+the policy decides what happens next:
+
+- "catch_up": keep the original schedule, so the following steps run back to
+  back until they are on time again and the simulation never drifts.
+- "skip": drop the missed slots and keep the period from now on, so the steps
+  stay evenly spaced but the simulation falls behind the wall clock.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+POLICIES = ("catch_up", "skip")
+
+
+@dataclass
+class PacingStats:
+    steps: int = 0
+    overruns: int = 0  # steps that started later than their slot
+    skipped: int = 0  # slots dropped by the "skip" policy
+    max_lateness: float = 0.0  # worst delay of a step, in seconds
+    drift: float = 0.0  # wall-clock time minus simulated time, in seconds
+
+
+class Pacer:
+    """Paces a loop at a fixed wall-clock period
+
+    :param period: The period (in seconds), e.g. the simulation timestep.
+    :param policy: What to do after an overrun, "catch_up" or "skip".
+    :param spin: Time (in seconds) before each slot spent busy-waiting rather
+        than sleeping.
+    :param tolerance: Lateness (in seconds) not counted as an overrun.
+    :param clock: The wall clock, in seconds.
+    :param sleep: Sleeps for a number of seconds, following `clock`.
+    """
+
+    def __init__(
+        self,
+        period: float,
+        policy: str = "catch_up",
+        spin: float = 0.002,
+        tolerance: float = 0.0005,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy: {policy}, expected {POLICIES}")
+        if period <= 0:
+            raise ValueError("period must be positive")
+        self.period = period
+        self.policy = policy
+        self.spin = spin
+        self.tolerance = tolerance
+        self._clock = clock
+        self._sleep = sleep
+        self.stats = PacingStats()
+        self._start = 0.0
+        self._next: Optional[float] = None
+
+    def reset(self) -> None:
+        """Restarts the schedule from the next call to `wait`"""
+        self.stats = PacingStats()
+        self._next = None
+
+    def wait(self) -> None:
+        """Waits for the next slot"""
+        now = self._clock()
+        stats = self.stats
+        if self._next is None:
+            self._start = self._next = now
+        target = self._next
+        if now < target:
+            if target - now > self.spin:
+                self._sleep(target - now - self.spin)
+            while self._clock() < target:
+                pass
+            now = target
+        else:
+            lateness = now - target
+            if lateness > self.tolerance:
+                stats.overruns += 1
+                stats.max_lateness = max(stats.max_lateness, lateness)
+                if self.policy == "skip":
+                    missed = int(lateness // self.period)
+                    stats.skipped += missed
+                    target += missed * self.period
+        self._next = target + self.period
+        stats.steps += 1
+        # Grows with the skipped slots, stays bounded when catching up
+        stats.drift = now - self._start - (stats.steps - 1) * self.period
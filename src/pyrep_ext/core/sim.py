@@ -4,8 +4,11 @@ import threading
 from ctypes import c_char_p
 from typing import Any, Optional
 
+from .. import LUA_DIR
+from .bridge import call as bridge_call
 from .bridge import load as bridge_load
 from .bridge import require as bridge_require
+from .hooks import Hook, HookRegistry
 from .lib import const, cpllib
 
 
@@ -37,6 +40,10 @@ class SimBackend:
     def lib(self) -> Any:
         return cpllib
 
+    @property
+    def hooks(self) -> HookRegistry:
+        return self._hooks
+
     def simInitialize(self, appDir: str, verbosity: str) -> Any:
         cpllib.simSetStringParam(
             const.sim_stringparam_verbosity, c_char_p(verbosity.encode("utf-8"))
@@ -58,8 +65,33 @@ class SimBackend:
         self._coppelia_version = ".".join(
             str(v // 100 ** (3 - i) % 100) for i in range(4)
         )
+
+        # load our lua helpers (step hooks, etc.) into the sandbox script:
+        bridge_call(
+            "dofile", (str(LUA_DIR / "pyrepExt.lua"),), (("string",), ())
+        )
+        self._hooks = HookRegistry()
+        self._ticks = 0
+        self._tick_hook = self._create_tick_hook()
         return self._sim
 
+    def _count_tick(self) -> None:
+        self._ticks += 1
+
+    def _create_tick_hook(self) -> Optional[Hook]:
+        # Counts completed steps from the sensing phase, so simStep doesn't
+        # have to poll the simulation time. If callbacks can't be invoked
+        # from the sandbox, simStep falls back to polling
+        hook = self._hooks.add(self._count_tick, "sensing")
+        try:
+            self._hooks.invoke(hook)
+        except Exception:
+            pass
+        if self._ticks != 1:
+            self._hooks.remove(hook)
+            return None
+        return hook
+
     def create_ui_thread(
         self, headless: bool, responsive_ui: bool
     ) -> threading.Thread:
@@ -88,9 +120,14 @@ class SimBackend:
 
     def simStep(self):
         if self._sim.getSimulationState() != self._sim.simulation_stopped:
-            t = self._sim.getSimulationTime()
-            while t == self._sim.getSimulationTime():
-                cpllib.simLoop(None, 0)
+            if self._tick_hook is not None:
+                ticks = self._ticks
+                while ticks == self._ticks:
+                    cpllib.simLoop(None, 0)
+            else:
+                t = self._sim.getSimulationTime()
+                while t == self._sim.getSimulationTime():
+                    cpllib.simLoop(None, 0)
 
     def simStopSimulation(self):
         while self._sim.getSimulationState() != self._sim.simulation_stopped:
@@ -1,7 +1,9 @@
 import ctypes
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from .lib import const, cpllib
+import numpy as np
+
+from .lib import c_double_p, c_longlong_p, const, cpllib
 
 
 def read_null(stackHandle: int) -> None:
@@ -109,6 +111,22 @@ def read_table(stackHandle: int, typeHint: Optional[str] = None) -> Any:
         return read_dict(stackHandle)
 
 
+def read_array(stackHandle: int) -> np.ndarray:
+    # Reads a table of numbers with a single call, instead of item by item
+    n = cpllib.simGetStackTableInfo(stackHandle, 0)
+    if n == const.sim_stack_table_empty:
+        cpllib.simPopStackItem(stackHandle, 1)
+        return np.empty(0, dtype=np.float64)
+    if n < 0:
+        raise RuntimeError("expected an array")
+    value = np.empty(n, dtype=np.float64)
+    ptr = value.ctypes.data_as(c_double_p)
+    if cpllib.simGetStackDoubleTable(stackHandle, ptr, n) != 1:
+        raise RuntimeError("expected an array of numbers")
+    cpllib.simPopStackItem(stackHandle, 1)
+    return value
+
+
 def read_value(stackHandle: int, typeHint: Optional[str] = None) -> Any:
     if typeHint == "null":
         return read_null(stackHandle)
@@ -124,6 +142,8 @@ def read_value(stackHandle: int, typeHint: Optional[str] = None) -> Any:
         return read_table(stackHandle, typeHint)
     elif typeHint in ("int", "long"):
         return read_long(stackHandle)
+    elif typeHint == "ndarray":
+        return read_array(stackHandle)
 
     itemType = cpllib.simGetStackItemType(stackHandle, -1)
     if itemType == const.sim_stackitem_null:
@@ -199,6 +219,22 @@ def write_list(stackHandle: int, value: List) -> None:
         cpllib.simInsertDataIntoStackTable(stackHandle)
 
 
+def write_array(stackHandle: int, value: np.ndarray) -> None:
+    # Integer arrays are pushed as integers (e.g. handles), boolean ones as
+    # booleans (0 is true in Lua), anything else as doubles. Arrays are
+    # flattened in C order
+    if value.dtype.kind == "b":  # no bulk push for booleans
+        write_list(stackHandle, value.reshape(-1).tolist())
+    elif value.dtype.kind in "iu":
+        value = np.ascontiguousarray(value, dtype=np.int64).reshape(-1)
+        ptr = value.ctypes.data_as(c_longlong_p)
+        cpllib.simPushInt64TableOntoStack(stackHandle, ptr, value.size)
+    else:
+        value = np.ascontiguousarray(value, dtype=np.float64).reshape(-1)
+        ptr = value.ctypes.data_as(c_double_p)
+        cpllib.simPushDoubleTableOntoStack(stackHandle, ptr, value.size)
+
+
 def write_value(
     stackHandle: int, value: Any, typeHint: Optional[str] = None
 ) -> None:
@@ -218,6 +254,8 @@ def write_value(
         return write_dict(stackHandle, value)
     elif typeHint == "list":
         return write_list(stackHandle, value)
+    elif typeHint == "ndarray":
+        return write_array(stackHandle, np.asarray(value))
 
     if value is None:
         return write_null(stackHandle, value)
@@ -235,6 +273,10 @@ def write_value(
         return write_dict(stackHandle, value)
     elif isinstance(value, list):
         return write_list(stackHandle, value)
+    elif isinstance(value, np.ndarray):
+        return write_array(stackHandle, value)
+    elif isinstance(value, np.generic):
+        return write_value(stackHandle, value.item())
     raise RuntimeError(f"unexpected type: {type(value)} ({typeHint=})")
 
 
@@ -258,46 +300,107 @@ def debug(stackHandle: int, info: Optional[str] = None) -> None:
     print("#" * 70)
 
 
-def callback(f):
-    def wrapper(stackHandle: int):
-        from typing import get_args
-
-        inTypes = tuple(
-            [
-                arg_type.__name__
-                for arg, arg_type in f.__annotations__.items()
-                if arg != "return"
-            ]
-        )
-
-        if return_annotation := f.__annotations__.get("return"):
-            origin = getattr(return_annotation, "__origin__", None)
-            if origin in (tuple, list):  # Handling built-in tuple and list
-                outTypes = tuple(
-                    [t.__name__ for t in get_args(return_annotation)]
-                )
-            elif (
-                origin
-            ):  # Handling other generic types like Tuple, List from typing
-                outTypes = (origin.__name__,)
-            else:
-                outTypes = (return_annotation.__name__,)
+# Readers and writers for the annotations supported by `callback`. Other
+# annotations fall back to `read_value` and `write_value`
+_READERS: Dict[str, Callable[[int], Any]] = {
+    "NoneType": read_null,
+    "bool": read_bool,
+    "int": read_long,
+    "float": read_double,
+    "str": lambda stackHandle: read_string(stackHandle, encoding="utf-8"),
+    "bytes": lambda stackHandle: read_string(stackHandle, encoding=None),
+    "list": read_list,
+    "dict": read_dict,
+    "ndarray": read_array,
+}
+
+_WRITERS: Dict[str, Callable[[int, Any], None]] = {
+    "NoneType": write_null,
+    "bool": write_bool,
+    "int": write_long,
+    "float": write_double,
+    "str": write_string,
+    "bytes": lambda stackHandle, value: write_string(stackHandle, value, None),
+    "list": write_list,
+    "dict": write_dict,
+    "ndarray": write_array,
+}
+
+
+def callback(f, log_errors: bool = True):
+    """Wraps `f` as a stack-level callback, `int(stackHandle) -> int`
+
+    Arguments and return values are marshalled according to the annotations
+    of `f` (e.g. `np.ndarray` arguments are read in bulk). These are resolved
+    only once, here, as the wrapper may run on every simulation substep.
+
+    Errors raised by `f` are counted in `wrapper.errors` and the last one is
+    kept in `wrapper.last_error`. Only the traceback of the first error is
+    printed (if `log_errors`), so a failing callback doesn't flood the output
+    nor slow down the simulation.
+    """
+    from typing import get_args, get_type_hints
+
+    # get_type_hints also resolves postponed (string) annotations
+    annotations = get_type_hints(f)
+    inTypes = tuple(
+        [
+            arg_type.__name__
+            for arg, arg_type in annotations.items()
+            if arg != "return"
+        ]
+    )
+
+    return_annotation = annotations.get("return")
+    if return_annotation is not None and return_annotation is not type(None):
+        origin = getattr(return_annotation, "__origin__", None)
+        if origin in (tuple, list):  # Handling built-in tuple and list
+            outTypes = tuple([t.__name__ for t in get_args(return_annotation)])
+        elif (
+            origin
+        ):  # Handling other generic types like Tuple, List from typing
+            outTypes = (origin.__name__,)
         else:
-            outTypes = ()
+            outTypes = (return_annotation.__name__,)
+    else:
+        outTypes = ()
+
+    readers = tuple(_READERS.get(t, read_value) for t in inTypes)
+    writers = tuple(_WRITERS.get(t, write_value) for t in outTypes)
+    n_readers = len(readers)
+    n_writers = len(writers)
 
+    def wrapper(stackHandle: int):
         try:
-            inArgs = read(stackHandle, inTypes)
+            inArgs = []
+            for i in range(cpllib.simGetStackSize(stackHandle)):
+                cpllib.simMoveStackItemToTop(stackHandle, 0)
+                if i < n_readers:
+                    inArgs.append(readers[i](stackHandle))
+                else:
+                    inArgs.append(read_value(stackHandle))
+            cpllib.simPopStackItem(stackHandle, 0)
+
             outArgs = f(*inArgs)
             if outArgs is None:
                 outArgs = ()
             elif not isinstance(outArgs, tuple):
                 outArgs = (outArgs,)
-            write(stackHandle, outArgs, outTypes)
+            for i, value in enumerate(outArgs):
+                if i < n_writers:
+                    writers[i](stackHandle, value)
+                else:
+                    write_value(stackHandle, value)
             return 1
-        except Exception:
-            import traceback
+        except Exception as e:
+            wrapper.errors += 1  # type: ignore
+            wrapper.last_error = e  # type: ignore
+            if log_errors and wrapper.errors == 1:  # type: ignore
+                import traceback
 
-            traceback.print_exc()
+                traceback.print_exc()
             return 0
 
+    wrapper.errors = 0  # type: ignore
+    wrapper.last_error = None  # type: ignore
     return wrapper
@@ -0,0 +1,1643 @@
+"""Pure-Python stand-in for libcoppeliaSim
+
+`StubLib` implements the stack and script-call functions declared in `lib.py`
+on top of plain Python lists, and dispatches `simCallScriptFunctionEx` to a
+`StubSim`, a registry of Python functions that plays the role of the Lua side
+of the simulator. This allows using `stack`, `bridge` and the object API
+without CoppeliaSim, e.g. in tests and micro-benchmarks::
+
+    stub = install()
+    stub.sim.add_object("/hinge", ObjectType.JOINT.value)
+    SimBackend().simInitialize("", "none")
+    hinge = Joint("/hinge")
+"""
+
+from __future__ import annotations
+
+import copy
+import ctypes
+import math
+import struct
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cbor2
+
+from . import sim_const
+from .lib import const, set_backend
+
+Item = Tuple[int, Any]
+
+_TABLE_INFO_TYPES = {
+    1: (const.sim_stackitem_null,),
+    2: (const.sim_stackitem_double, const.sim_stackitem_integer),
+    3: (const.sim_stackitem_bool,),
+    4: (const.sim_stackitem_string,),
+    5: (const.sim_stackitem_table,),
+}
+
+_NUMBER_TYPES = (const.sim_stackitem_double, const.sim_stackitem_integer)
+
+
+def _deref(ref: Any) -> Any:
+    # Objects created with ctypes.byref keep the referenced instance in _obj
+    return getattr(ref, "_obj", ref)
+
+
+def _to_bytes(value: Any) -> bytes:
+    # Strings arrive either as bytes or wrapped in a ctypes.c_char_p
+    return value if isinstance(value, bytes) else value.value
+
+
+def _is_array(items: List[Tuple[Item, Item]]) -> bool:
+    return all(
+        k[0] == const.sim_stackitem_integer and k[1] == i + 1
+        for i, (k, _) in enumerate(items)
+    )
+
+
+def to_item(value: Any) -> Item:
+    """Converts a Python value into a tagged stack item"""
+    if value is None:
+        return (const.sim_stackitem_null, None)
+    if isinstance(value, bool):
+        return (const.sim_stackitem_bool, value)
+    if isinstance(value, int):
+        return (const.sim_stackitem_integer, value)
+    if isinstance(value, float):
+        return (const.sim_stackitem_double, value)
+    if isinstance(value, str):
+        return (const.sim_stackitem_string, value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return (const.sim_stackitem_string, bytes(value))
+    if isinstance(value, dict):
+        return (
+            const.sim_stackitem_table,
+            [(to_item(k), to_item(v)) for k, v in value.items()],
+        )
+    if isinstance(value, (list, tuple)):
+        return (
+            const.sim_stackitem_table,
+            [(to_item(i + 1), to_item(v)) for i, v in enumerate(value)],
+        )
+    if hasattr(value, "tolist"):  # numpy arrays and scalars
+        return to_item(value.tolist())
+    raise TypeError(f"unsupported type for stub stack: {type(value)}")
+
+
+def from_item(item: Item) -> Any:
+    """Converts a tagged stack item back into a Python value"""
+    item_type, value = item
+    if item_type == const.sim_stackitem_string:
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return value
+    if item_type == const.sim_stackitem_table:
+        if _is_array(value):
+            return [from_item(v) for _, v in value]
+        return {from_item(k): from_item(v) for k, v in value}
+    return value
+
+
+def _like_stack(value: Any) -> Any:
+    """Gives decoded CBOR values the types of values read from a stack"""
+    if isinstance(value, bytes):
+        return from_item((const.sim_stackitem_string, value))
+    if isinstance(value, (list, tuple)):
+        return [_like_stack(v) for v in value]
+    if isinstance(value, dict):
+        return {_like_stack(k): _like_stack(v) for k, v in value.items()}
+    return value
+
+
+class StubError(Exception):
+    pass
+
+
+class StubSim:
+    """Scriptable fake of the Lua side of the simulator
+
+    Functions are registered by their fully qualified Lua name, e.g.
+    `sim.getObject`, and receive and return plain Python values. Constants of
+    the `sim` namespace are taken from `sim_const`. A minimal scene model
+    (objects with a pose, joints with a position, and generic properties) is
+    provided, so the object classes work out of the box; any function can be
+    replaced with `register` to script a different behaviour.
+    """
+
+    def __init__(self, version: int = 40900):
+        self.functions: Dict[str, Callable] = {}
+        self.constants: Dict[str, Any] = {}
+        self.calls: Dict[str, int] = {}
+        self.version = version
+
+        self.objects: Dict[int, Dict[str, Any]] = {}
+        self.properties: Dict[Tuple[int, str], Any] = {}
+        self._next_handle = 10
+
+        self.state = sim_const.sim_simulation_stopped
+        self.time = 0.0
+        self.timestep = 0.05
+
+        self.lib: Optional[StubLib] = None  # set by StubLib
+        self.hooks: Dict[str, List[Any]] = {"actuation": [], "sensing": []}
+        self.ik: Dict[str, Dict[str, Any]] = {}  # see ik_create
+        self.ik_envs: Dict[int, Dict[str, Any]] = {}
+        self.ompl: Dict[str, Dict[str, Any]] = {}  # see ompl_create
+        self.ompl_tasks: Dict[int, Dict[str, Any]] = {}
+        self.ompl_work = 0.02  # planning time the toy simOMPL needs
+        self.trajectories: Dict[str, Dict[str, Any]] = {}  # see traj_start
+
+        for name in dir(sim_const):
+            if name.startswith("sim_"):
+                self.constants[f"sim.{name[4:]}"] = getattr(sim_const, name)
+        for namespace in ("simIK", "simOMPL", "simVision"):
+            self.constants[f"{namespace}._stub"] = True
+        self.constants.update(
+            {
+                "simIK.handle_world": -1,
+                "simIK.result_success": 1,
+                "simIK.result_fail": 2,
+                "simIK.method_pseudo_inverse": 0,
+                "simIK.method_damped_least_squares": 1,
+                "simIK.constraint_position": 7,
+                "simIK.constraint_pose": 31,
+            }
+        )
+        self._register_defaults()
+
+    def register(self, name: str, func: Optional[Callable] = None) -> Any:
+        """Registers a Python function under the given Lua function name
+
+        Can be used directly or as a decorator::
+
+            @stub.sim.register("sim.getSimulationTime")
+            def get_time():
+                return 42.0
+        """
+        if func is None:
+            return lambda f: self.register(name, f)
+        self.functions[name] = func
+        return func
+
+    def set_const(self, name: str, value: Any) -> None:
+        self.constants[name] = value
+
+    def resolve(self, name: str) -> Callable:
+        try:
+            return self.functions[name]
+        except KeyError:
+            raise StubError(f"function not registered in stub: {name}")
+
+    def invoke(self, name: str, *args) -> Any:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        return self.resolve(name)(*args)
+
+    def info(self, namespace: str) -> Dict[str, Any]:
+        """Builds the namespace description used by `bridge.getObject`"""
+        root: Dict[str, Any] = {}
+        prefix = namespace + "."
+        entries = [(k, {"func": {}}) for k in self.functions]
+        entries += [(k, {"const": v}) for k, v in self.constants.items()]
+        for name, entry in entries:
+            if not name.startswith(prefix):
+                continue
+            node = root
+            parts = name[len(prefix) :].split(".")
+            for part in parts[:-1]:
+                node = node.setdefault(part, {})
+            node[parts[-1]] = entry
+        return root
+
+    # -------------------------------------------------------------------------
+    # Scene model
+
+    def add_object(
+        self,
+        path: str,
+        object_type: int,
+        position=(0.0, 0.0, 0.0),
+        quaternion=(0.0, 0.0, 0.0, 1.0),
+        **props,
+    ) -> int:
+        """Adds an object to the fake scene and returns its handle"""
+        handle = self._next_handle
+        self._next_handle += 1
+        self.objects[handle] = {
+            "alias": path.strip("/").split("/")[-1],
+            "path": "/" + path.strip("/"),
+            "type": object_type,
+            "position": list(map(float, position)),
+            "quaternion": list(map(float, quaternion)),
+            **props,
+        }
+        return handle
+
+    def remove_object(self, handle: int) -> None:
+        self.objects.pop(handle, None)
+
+    def find_object(self, path: str) -> int:
+        for handle, obj in self.objects.items():
+            if path in (obj["path"], obj["alias"], "/" + obj["alias"]):
+                return handle
+        raise StubError(f"object does not exist: {path}")
+
+    def obj(self, handle: int) -> Dict[str, Any]:
+        try:
+            return self.objects[handle]
+        except KeyError:
+            raise StubError(f"invalid object handle: {handle}")
+
+    def world_matrix(self, handle: int) -> List[float]:
+        if handle == sim_const.sim_handle_world:
+            return [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0]
+        obj = self.obj(handle)
+        return _pose_to_matrix(obj["position"], obj["quaternion"])
+
+    def relative_matrix(self, handle: int, rel_to: int) -> List[float]:
+        m = self.world_matrix(handle)
+        if rel_to == sim_const.sim_handle_world:
+            return m
+        return _matrix_mul(_matrix_inv(self.world_matrix(rel_to)), m)
+
+    def set_relative_matrix(
+        self, handle: int, m: List[float], rel_to: int
+    ) -> None:
+        if rel_to != sim_const.sim_handle_world:
+            m = _matrix_mul(self.world_matrix(rel_to), m)
+        obj = self.obj(handle)
+        obj["position"] = [m[3], m[7], m[11]]
+        obj["quaternion"] = _matrix_to_quat(m)
+
+    def loop(self) -> None:
+        """Runs one simulation step if running, like the main script would"""
+        if self.state == sim_const.sim_simulation_advancing_running:
+            self.run_hooks("actuation")
+            self.traj_advance_all()
+            self.time += self.timestep
+            self.run_hooks("sensing")
+            self.ompl_advance_all()
+
+    def batch(self, calls: List[Any]) -> List[List[Any]]:
+        """Python version of pyrepExt.batch"""
+        results = []
+        for name, args, nargs in calls:
+            args = (list(args) + [None] * nargs)[:nargs]
+            try:
+                ret = self.invoke(name, *args)
+            except Exception as e:
+                results.append([False, str(e)])
+                continue
+            if isinstance(ret, tuple):
+                ret = (
+                    None if not ret else ret[0] if len(ret) == 1 else list(ret)
+                )
+            results.append([True] if ret is None else [True, ret])
+        return results
+
+    def instantiate(
+        self, template: int, uid: int, count: int, model_property: int
+    ) -> Optional[List[int]]:
+        """Python version of pyrepExt.instantiate"""
+        if template not in self.objects:
+            return None
+        if self.invoke("sim.getObjectUid", template) != uid:
+            return None
+        handles = []
+        for _ in range(count):
+            (handle,) = self.invoke("sim.copyPasteObjects", [template], 3)
+            self.obj(handle)["model_property"] = model_property
+            handles.append(handle)
+        return handles
+
+    def create_shapes(
+        self, types, sizes, poses, colors, masses, flags
+    ) -> List[int]:
+        """Python version of pyrepExt.createShapes"""
+        sc = sim_const
+        primitives = {
+            0: sc.sim_pure_primitive_cuboid,
+            1: sc.sim_pure_primitive_spheroid,
+            2: sc.sim_pure_primitive_cylinder,
+            3: sc.sim_pure_primitive_cone,
+        }
+        handles = []
+        for i, primitive in enumerate(types):
+            j3, j7 = 3 * i, 7 * i
+            h = self.invoke(
+                "sim.createPrimitiveShape",
+                primitives[primitive],
+                sizes[j3 : j3 + 3],
+                0,
+            )
+            self.invoke("sim.setObjectPose", h, poses[j7 : j7 + 7], -1)
+            if colors:
+                self.invoke(
+                    "sim.setShapeColor",
+                    h,
+                    None,
+                    sc.sim_colorcomponent_ambient_diffuse,
+                    colors[j3 : j3 + 3],
+                )
+            if masses:
+                self.invoke("sim.setShapeMass", h, masses[i])
+            static = 0 if flags[i] & 1 else 1
+            respondable = 1 if flags[i] & 2 else 0
+            self.invoke(
+                "sim.setObjectInt32Param",
+                h,
+                sc.sim_shapeintparam_static,
+                static,
+            )
+            self.invoke(
+                "sim.setObjectInt32Param",
+                h,
+                sc.sim_shapeintparam_respondable,
+                respondable,
+            )
+            handles.append(h)
+        return handles
+
+    # struct formats of the typed arrays pyrepExt.cborDecode accepts
+    _CBOR_TYPED_FORMATS = {
+        64: "B",
+        69: "H",
+        70: "I",
+        71: "Q",
+        72: "b",
+        77: "h",
+        78: "i",
+        79: "q",
+        85: "f",
+        86: "d",
+    }
+
+    def cbor_decode(self, data) -> Any:
+        """Python version of pyrepExt.cborDecode"""
+
+        def tag_hook(*args):
+            tag = args[0] if isinstance(args[0], cbor2.CBORTag) else args[1]
+            fmt = self._CBOR_TYPED_FORMATS.get(tag.tag)
+            if fmt is not None:
+                n = len(tag.value) // struct.calcsize(fmt)
+                return list(struct.unpack(f"<{n}{fmt}", tag.value))
+            if tag.tag == 40:
+                return tag.value[1]
+            return tag.value
+
+        if isinstance(data, str):  # see from_item
+            data = data.encode("utf-8")
+        return _like_stack(cbor2.loads(data, tag_hook=tag_hook))
+
+    def cbor_encode(self, value) -> bytes:
+        """Python version of pyrepExt.cborEncode"""
+        return cbor2.dumps(value)
+
+    def cbor_call(self, func, nargs, data) -> bytes:
+        """Python version of pyrepExt.cborCall"""
+        args = self.cbor_decode(data)
+        ret = self.invoke(func, *args[:nargs])
+        if ret is None:
+            ret = ()
+        elif not isinstance(ret, tuple):
+            ret = (ret,)
+        return self.cbor_encode(list(ret))
+
+    def call_script_many(self, script, func, calls, nargs) -> List[Any]:
+        """Python version of pyrepExt.callScriptMany"""
+        results = []
+        for args in calls:
+            ret = self.invoke("sim.callScriptFunction", func, script, *args)
+            results.append(list(ret) if isinstance(ret, tuple) else ret)
+        return results
+
+    def check_collisions(self, a, b, early_exit) -> List[int]:
+        """Python version of pyrepExt.checkCollisions"""
+        out = [0] * (len(a) * len(b))
+        for i, ha in enumerate(a):
+            for j, hb in enumerate(b):
+                if ha == hb:
+                    continue
+                result, _ = self.invoke("sim.checkCollision", ha, hb)
+                if result == 1:
+                    out[i * len(b) + j] = 1
+                    if early_exit:
+                        return out
+        return out
+
+    def check_distances(self, a, b, threshold, early_exit) -> List[float]:
+        """Python version of pyrepExt.checkDistances"""
+        out = [math.nan] * (len(a) * len(b) * 7)
+        for i, ha in enumerate(a):
+            for j, hb in enumerate(b):
+                if ha == hb:
+                    continue
+                o = (i * len(b) + j) * 7
+                result, data, _ = self.invoke(
+                    "sim.checkDistance", ha, hb, threshold
+                )
+                if result == 1:
+                    out[o : o + 7] = data
+                    if early_exit and threshold > 0:
+                        return out
+                else:
+                    out[o + 6] = math.inf
+        return out
+
+    def get_meshes(self, handles, stamps) -> Tuple[list, ...]:
+        """Python version of pyrepExt.getMeshes"""
+        vertices, indices, normals, counts, out = [], [], [], [], []
+        for i, h in enumerate(handles):
+            stamp = [self.invoke("sim.getObjectUid", h)]
+            stamp += self.invoke("sim.getShapeBB", h)
+            out += stamp
+            if stamp == list(stamps[4 * i : 4 * i + 4]):
+                counts += [0, 0]
+                continue
+            v, ind, n = self.invoke("sim.getShapeMesh", h)
+            vertices += v
+            indices += ind
+            normals += n
+            counts += [len(v) // 3, len(ind) // 3]
+        return vertices, indices, normals, counts, out
+
+    def read_proximity_sensors(self, handles) -> List[float]:
+        """Python version of pyrepExt.readProximitySensors"""
+        out = []
+        for h in handles:
+            result, distance, point, _, _ = self.invoke(
+                "sim.readProximitySensor", h
+            )
+            if result == 1:
+                out += [1, distance] + list(point)
+            else:
+                out += [0, math.inf] + [math.nan] * 3
+        return out
+
+    def read_force_sensors(self, handles) -> List[float]:
+        """Python version of pyrepExt.readForceSensors"""
+        out = []
+        for h in handles:
+            result, force, torque = self.invoke("sim.readForceSensor", h)
+            if result & 1:
+                out += list(force) + list(torque)
+            else:
+                out += [math.nan] * 6
+        return out
+
+    def aabb(self, handle: int) -> Tuple[List[float], List[float]]:
+        """The axis-aligned box of an object, from its position and size"""
+        obj = self.obj(handle)
+        half = [0.5 * size for size in obj.get("sizes", [0.0] * 3)]
+        position = obj["position"]
+        return (
+            [p - h for p, h in zip(position, half)],
+            [p + h for p, h in zip(position, half)],
+        )
+
+    # struct formats of the dtypes pyrepExt.channelWrite accepts
+    _CHANNEL_FORMATS = {
+        "<f4": "f",
+        "<f8": "d",
+        "|i1": "b",
+        "<i2": "h",
+        "<i4": "i",
+        "<i8": "q",
+        "|u1": "B",
+        "<u2": "H",
+        "<u4": "I",
+        "<u8": "Q",
+        "|b1": "?",
+    }
+
+    def channel_publish(self, handle, name, data) -> int:
+        """Python version of pyrepExt.channelPublish"""
+        key = f"customData.{name}"
+        version = self.invoke("sim.getIntProperty", handle, f"{key}.version")
+        version += 1
+        self.invoke(
+            "sim.setBufferProperty", handle, f"{key}.{version % 2}", data
+        )
+        self.invoke("sim.setIntProperty", handle, f"{key}.version", version)
+        return version
+
+    def channel_fetch(self, handle, name, since) -> Tuple[int, bytes]:
+        """Python version of pyrepExt.channelFetch"""
+        key = f"customData.{name}"
+        version = self.invoke("sim.getIntProperty", handle, f"{key}.version")
+        if version in (since, 0):
+            return version, b""
+        key = f"{key}.{version % 2}"
+        return version, self.invoke("sim.getBufferProperty", handle, key)
+
+    def channel_clear(self, handle, name) -> None:
+        """Python version of pyrepExt.channelClear"""
+        for slot in (0, 1):
+            key = f"customData.{name}.{slot}"
+            self.invoke("sim.removeProperty", handle, key)
+
+    def channel_write(self, handle, name, values, shape, dtype) -> int:
+        """Python version of pyrepExt.channelWrite"""
+        fmt = self._CHANNEL_FORMATS[dtype]
+        data = struct.pack(
+            "<4s4sI4x", b"PXA1", dtype.encode(), len(shape)
+        ) + struct.pack(f"<{len(shape)}Q{len(values)}{fmt}", *shape, *values)
+        return self.channel_publish(handle, name, data)
+
+    def channel_read(self, handle, name):
+        """Python version of pyrepExt.channelRead"""
+        version, data = self.channel_fetch(handle, name, -1)
+        if not data:
+            return None
+        if isinstance(data, str):  # see from_item
+            data = data.encode("utf-8")
+        magic, dtype, ndim = struct.unpack_from("<4s4sI4x", data)
+        fmt = self._CHANNEL_FORMATS[dtype.rstrip(b"\0").decode()]
+        shape = list(struct.unpack_from(f"<{ndim}Q", data, 16))
+        n = math.prod(shape)
+        values = struct.unpack_from(f"<{n}{fmt}", data, 16 + 8 * ndim)
+        return list(values), shape, version
+
+    def ik_create(
+        self,
+        key,
+        base,
+        tip,
+        target,
+        joints,
+        constraints,
+        method,
+        damping,
+        max_iterations,
+    ) -> str:
+        """Python version of pyrepExt.ikCreate"""
+        if key in self.ik:
+            return key
+        env = self.invoke("simIK.createEnvironment")
+        group = self.invoke("simIK.createGroup", env)
+        self.invoke(
+            "simIK.setGroupCalculation",
+            env,
+            group,
+            method,
+            damping,
+            max_iterations,
+        )
+        temp_target = target == -1
+        if temp_target:
+            target = self.invoke("sim.createDummy", 0.01)
+            pose = self.invoke("sim.getObjectPose", tip, -1)
+            self.invoke("sim.setObjectPose", target, pose, -1)
+        _, sim_to_ik, _ = self.invoke(
+            "simIK.addElementFromScene",
+            env,
+            group,
+            base,
+            tip,
+            target,
+            constraints,
+        )
+        self.ik[key] = {
+            "env": env,
+            "group": group,
+            "base": base,
+            "ik_base": sim_to_ik.get(base, -1),
+            "joints": list(joints),
+            "ik_joints": [sim_to_ik[j] for j in joints],
+            "target": sim_to_ik[target],
+        }
+        if temp_target:
+            self.invoke("sim.removeObjects", [target])
+        return key
+
+    def ik_sync(self, key: str) -> List[float]:
+        """Python version of pyrepExt.ikSync"""
+        chain = self.ik[key]
+        env = chain["env"]
+        if chain["base"] != -1:
+            pose = self.invoke("sim.getObjectPose", chain["base"], -1)
+            self.invoke("simIK.setObjectPose", env, chain["ik_base"], pose, -1)
+        positions = []
+        for j, ik_joint in zip(chain["joints"], chain["ik_joints"]):
+            positions.append(self.invoke("sim.getJointPosition", j))
+            self.invoke("simIK.setJointPosition", env, ik_joint, positions[-1])
+        return positions
+
+    def ik_solve(self, key, poses, seeds, rel_to) -> Tuple[List, List]:
+        """Python version of pyrepExt.ikSolve"""
+        chain = self.ik[key]
+        env, joints = chain["env"], chain["ik_joints"]
+        dof = len(joints)
+        seeds = list(seeds) or self.ik_sync(key)
+        stride = 0 if len(seeds) == dof else dof
+        rel_pose = None
+        if rel_to != -1:
+            rel_pose = self.invoke("sim.getObjectPose", rel_to, -1)
+        solutions, success = [], []
+        for i in range(len(poses) // 7):
+            for k, j in enumerate(joints):
+                value = seeds[stride * i + k]
+                self.invoke("simIK.setJointPosition", env, j, value)
+            pose = list(poses[7 * i : 7 * i + 7])
+            if rel_pose is not None:
+                pose = self.invoke("sim.multiplyPoses", rel_pose, pose)
+            self.invoke("simIK.setObjectPose", env, chain["target"], pose, -1)
+            result, _, _ = self.invoke("simIK.handleGroup", env, chain["group"])
+            success.append(result == 1)
+            solutions += [
+                self.invoke("simIK.getJointPosition", env, j) for j in joints
+            ]
+        return solutions, success
+
+    def ik_erase(self, key: str) -> None:
+        """Python version of pyrepExt.ikErase"""
+        chain = self.ik.pop(key, None)
+        if chain is not None:
+            self.invoke("simIK.eraseEnvironment", chain["env"])
+
+    def ompl_create(self, key, joints, collision_pairs) -> str:
+        """Python version of pyrepExt.omplCreate"""
+        if key in self.ompl:
+            return key
+        task = self.invoke("simOMPL.createTask", f"pyrepExt:{key}")
+        spaces = []
+        for i, j in enumerate(joints):
+            cyclic, (low, span) = self.invoke("sim.getJointInterval", j)
+            high = low + span
+            if cyclic:
+                low, high = -math.pi, math.pi
+            spaces.append(
+                self.invoke(
+                    "simOMPL.createStateSpace",
+                    f"joint{i + 1}",
+                    0,
+                    j,
+                    [low],
+                    [high],
+                    int(i < 3),
+                )
+            )
+        self.invoke("simOMPL.setStateSpace", task, spaces)
+        if collision_pairs:
+            self.invoke("simOMPL.setCollisionPairs", task, collision_pairs)
+        self.ompl[key] = {
+            "task": task,
+            "joints": list(joints),
+            "state": "cancelled",
+            "budget": 0.0,
+            "slice": 0.0,
+        }
+        return key
+
+    def ompl_start(self, key, algorithm, start, goal, budget, slice) -> str:
+        """Python version of pyrepExt.omplStart"""
+        p = self.ompl[key]
+        if not start:
+            start = [
+                self.invoke("sim.getJointPosition", j) for j in p["joints"]
+            ]
+        self.invoke("simOMPL.setAlgorithm", p["task"], algorithm)
+        self.invoke("simOMPL.setStartState", p["task"], list(start))
+        self.invoke("simOMPL.setGoalState", p["task"], list(goal))
+        self.invoke("simOMPL.setup", p["task"])
+        p.update(state="planning", budget=budget, slice=slice)
+        if slice <= 0:
+            return self.ompl_advance(key, budget)
+        return p["state"]
+
+    def ompl_advance(self, key, dt) -> str:
+        """Python version of pyrepExt.omplAdvance"""
+        p = self.ompl[key]
+        if p["state"] != "planning":
+            return p["state"]
+        dt = min(dt if dt > 0 else p["slice"], p["budget"])
+        self.invoke("simOMPL.solve", p["task"], dt)
+        p["budget"] -= dt
+        if self.invoke("simOMPL.hasExactSolution", p["task"]):
+            p["state"] = "solved"
+        elif p["budget"] <= 0:
+            p["state"] = "failed"
+        return p["state"]
+
+    def ompl_advance_all(self) -> None:
+        """Python version of pyrepExt.omplAdvanceAll"""
+        for key, p in self.ompl.items():
+            if p["state"] == "planning" and p["slice"] > 0:
+                self.ompl_advance(key, 0)
+
+    def ompl_path(self, key, simplify_time, states) -> List[float]:
+        """Python version of pyrepExt.omplPath"""
+        task = self.ompl[key]["task"]
+        if simplify_time > 0:
+            self.invoke("simOMPL.simplifyPath", task, simplify_time)
+        if states > 0:
+            self.invoke("simOMPL.interpolatePath", task, states)
+        return self.invoke("simOMPL.getPath", task)
+
+    def ompl_cancel(self, key) -> None:
+        """Python version of pyrepExt.omplCancel"""
+        p = self.ompl[key]
+        if p["state"] == "planning":
+            p["state"] = "cancelled"
+
+    def traj_start(self, key, joints, points, times, set_target) -> int:
+        """Python version of pyrepExt.trajStart"""
+        dt = self.invoke("sim.getSimulationTimeStep")
+        n = len(points) // len(joints)
+        steps = int(math.floor(times[-1] / dt + 1e-9)) + 1 if times else n
+        setter = "sim.setJointTargetPosition" if set_target else None
+        self.trajectories[key] = {
+            "joints": list(joints),
+            "points": list(points),
+            "times": list(times),
+            "n": n,
+            "dt": dt,
+            "set": setter or "sim.setJointPosition",
+            "steps": steps,
+            "step": 0,
+            "segment": 0,
+        }
+        return steps
+
+    def _follow_trajectory(self, traj: Dict[str, Any]) -> None:
+        # 0-based version of followTrajectory
+        dof, times, n = len(traj["joints"]), traj["times"], traj["n"]
+        i, a = traj["step"], 0.0
+        if times:
+            t = traj["step"] * traj["dt"]
+            while traj["segment"] < n - 1 and times[traj["segment"] + 1] <= t:
+                traj["segment"] += 1
+            i = traj["segment"]
+            if i < n - 1:
+                a = (t - times[i]) / (times[i + 1] - times[i])
+        points = traj["points"]
+        for k, j in enumerate(traj["joints"]):
+            p = points[i * dof + k]
+            if a > 0:
+                p += a * (points[(i + 1) * dof + k] - p)
+            self.invoke(traj["set"], j, p)
+        traj["step"] += 1
+
+    def traj_advance_all(self) -> None:
+        """Python version of pyrepExt.trajAdvanceAll"""
+        for traj in self.trajectories.values():
+            if traj["step"] < traj["steps"]:
+                self._follow_trajectory(traj)
+
+    def traj_progress(self, key) -> Tuple[int, int]:
+        """Python version of pyrepExt.trajProgress"""
+        traj = self.trajectories.get(key)
+        return (0, 0) if traj is None else (traj["step"], traj["steps"])
+
+    def run_hooks(self, phase: str) -> None:
+        """Python version of pyrepExt.runHooks"""
+        for index, reads, writes in self.hooks[phase]:
+            args = [self.invoke(name, *a) for name, a in reads]
+            outs = self.lib.invoke_callback(index, *args)
+            for (name, a), value in zip(writes, outs):
+                self.invoke(name, *a, value)
+
+    def _register_defaults(self) -> None:
+        sc = sim_const
+        reg = self.register
+        nop = lambda *args: None  # noqa: E731
+
+        reg("require", nop)
+        reg("dofile", nop)
+        reg("pyrepExt.setHooks", lambda p, h: self.hooks.update({p: h}))
+        reg("pyrepExt.invoke", lambda i, *a: self.lib.invoke_callback(i, *a))
+        reg("pyrepExt.batch", self.batch)
+        reg("pyrepExt.instantiate", self.instantiate)
+        reg("pyrepExt.createShapes", self.create_shapes)
+        reg("pyrepExt.cborDecode", self.cbor_decode)
+        reg("pyrepExt.cborEncode", self.cbor_encode)
+        reg("pyrepExt.cborCall", self.cbor_call)
+        reg("pyrepExt.callScriptMany", self.call_script_many)
+        reg("pyrepExt.checkCollisions", self.check_collisions)
+        reg("pyrepExt.checkDistances", self.check_distances)
+        reg("pyrepExt.getMeshes", self.get_meshes)
+        reg("pyrepExt.readProximitySensors", self.read_proximity_sensors)
+        reg("pyrepExt.readForceSensors", self.read_force_sensors)
+        reg("pyrepExt.channelPublish", self.channel_publish)
+        reg("pyrepExt.channelFetch", self.channel_fetch)
+        reg("pyrepExt.channelClear", self.channel_clear)
+        reg("pyrepExt.channelWrite", self.channel_write)
+        reg("pyrepExt.channelRead", self.channel_read)
+        reg("pyrepExt.ikCreate", self.ik_create)
+        reg("pyrepExt.ikSync", self.ik_sync)
+        reg("pyrepExt.ikSolve", self.ik_solve)
+        reg("pyrepExt.ikErase", self.ik_erase)
+        reg("pyrepExt.omplCreate", self.ompl_create)
+        reg("pyrepExt.omplStart", self.ompl_start)
+        reg("pyrepExt.omplAdvance", self.ompl_advance)
+        reg("pyrepExt.omplAdvanceAll", self.ompl_advance_all)
+        reg("pyrepExt.omplPath", self.ompl_path)
+        reg("pyrepExt.omplState", lambda key: self.ompl[key]["state"])
+        reg("pyrepExt.omplCancel", self.ompl_cancel)
+        reg("pyrepExt.trajStart", self.traj_start)
+        reg("pyrepExt.trajAdvanceAll", self.traj_advance_all)
+        reg("pyrepExt.trajProgress", self.traj_progress)
+        reg("pyrepExt.trajStop", lambda key: self.trajectories.pop(key, None))
+        reg("scriptClientBridge.require", nop)
+        reg("scriptClientBridge.info", self.info)
+        reg("sim.getApiInfo", lambda *args: "")
+        reg("sim.getInt32Param", lambda p: self.version)
+        reg("sim.loadScene", nop)
+        reg("sim.saveScene", lambda path: open(path, "wb").close())
+        reg("sim.loadModel", lambda *args: self.add_object("model", 0))
+
+        def start():
+            self.state = sc.sim_simulation_advancing_running
+
+        def stop():
+            self.state = sc.sim_simulation_stopped
+            self.time = 0.0
+
+        def set_timestep(param, value):
+            if param == sc.sim_floatparam_simulation_time_step:
+                self.timestep = value
+
+        reg("sim.getSimulationState", lambda: self.state)
+        reg("sim.startSimulation", start)
+        reg("sim.stopSimulation", stop)
+        reg("sim.getSimulationTime", lambda: self.time)
+        reg("sim.getSimulationTimeStep", lambda: self.timestep)
+        reg("sim.setFloatParameter", set_timestep)
+        reg("sim.setFloatParam", set_timestep)
+
+        def get_object(path, options=None):
+            return self.find_object(path)
+
+        def get_prop(kind, default):
+            return lambda h, name, *a: self.properties.get((h, name), default)
+
+        def set_prop(h, name, value):
+            self.properties[(h, name)] = value
+
+        reg("sim.getObject", get_object)
+        # All scripts share the functions registered in the stub
+        reg(
+            "sim.callScriptFunction",
+            lambda func, script, *args: self.invoke(func, *args),
+        )
+        reg("sim.isHandle", lambda h: h in self.objects)
+        reg("sim.getObjectType", lambda h: self.obj(h)["type"])
+        reg("sim.getObjectAlias", lambda h, *a: self.obj(h)["alias"])
+        reg("sim.setObjectAlias", lambda h, n: self.obj(h).update(alias=n))
+
+        def copy_paste(handles, options=0):
+            copies = []
+            for h in handles:
+                handle = self.add_object("copy", 0)
+                self.objects[handle] = copy.deepcopy(self.obj(h))
+                copies.append(handle)
+            return copies
+
+        reg("sim.copyPasteObjects", copy_paste)
+        reg("sim.removeModel", self.remove_object)
+        reg(
+            "sim.getModelProperty",
+            lambda h: self.obj(h).get("model_property", 0),
+        )
+        reg(
+            "sim.setModelProperty",
+            lambda h, p: self.obj(h).update(model_property=p),
+        )
+        for kind, default in (
+            ("Bool", False),
+            ("Int", 0),
+            ("Float", 0.0),
+            ("String", ""),
+            ("Buffer", b""),
+            ("IntArray", []),
+            ("FloatArray", []),
+        ):
+            reg(f"sim.get{kind}Property", get_prop(kind, default))
+            reg(f"sim.set{kind}Property", set_prop)
+        reg(
+            "sim.removeProperty",
+            lambda h, name, *a: self.properties.pop((h, name), None),
+        )
+
+        def get_position(h, rel_to=sc.sim_handle_world):
+            m = self.relative_matrix(h, rel_to)
+            return [m[3], m[7], m[11]]
+
+        def set_position(h, pos, rel_to=sc.sim_handle_world):
+            m = self.relative_matrix(h, rel_to)
+            m[3], m[7], m[11] = map(float, pos)
+            self.set_relative_matrix(h, m, rel_to)
+
+        def get_quaternion(h, rel_to=sc.sim_handle_world):
+            return _matrix_to_quat(self.relative_matrix(h, rel_to))
+
+        def set_quaternion(h, quat, rel_to=sc.sim_handle_world):
+            m = self.relative_matrix(h, rel_to)
+            pos = [m[3], m[7], m[11]]
+            self.set_relative_matrix(h, _pose_to_matrix(pos, quat), rel_to)
+
+        def get_matrix(h, rel_to=sc.sim_handle_world):
+            return self.relative_matrix(h, rel_to)
+
+        def set_matrix(h, m, rel_to=sc.sim_handle_world):
+            self.set_relative_matrix(h, list(map(float, m)), rel_to)
+
+        reg("sim.getObjectPosition", get_position)
+        reg("sim.setObjectPosition", set_position)
+        reg("sim.getObjectQuaternion", get_quaternion)
+        reg("sim.setObjectQuaternion", set_quaternion)
+        reg("sim.getObjectMatrix", get_matrix)
+        reg("sim.setObjectMatrix", set_matrix)
+        reg("sim.getObjectVelocity", lambda h: ([0.0] * 3, [0.0] * 3))
+        reg("sim.resetDynamicObject", nop)
+
+        def get_pose(h, rel_to=sc.sim_handle_world):
+            return get_position(h, rel_to) + get_quaternion(h, rel_to)
+
+        def set_pose(h, pose, rel_to=sc.sim_handle_world):
+            m = _pose_to_matrix(list(map(float, pose[:3])), pose[3:])
+            self.set_relative_matrix(h, m, rel_to)
+
+        reg("sim.getObjectPose", get_pose)
+        reg("sim.setObjectPose", set_pose)
+        reg("sim.removeObjects", lambda hs: [self.remove_object(h) for h in hs])
+
+        def create_primitive(primitive, sizes, options=0):
+            return self.add_object(
+                "Shape",
+                sc.sim_object_shape_type,
+                primitive=primitive,
+                sizes=list(map(float, sizes)),
+            )
+
+        def get_param(key, default):
+            return lambda h, p: self.obj(h).get((key, p), default)
+
+        def set_param(key):
+            return lambda h, p, v: self.obj(h).update({(key, p): v})
+
+        reg("sim.createPrimitiveShape", create_primitive)
+        reg(
+            "sim.getShapeColor",
+            lambda h, n, c: (1, self.obj(h).get(("color", c), [0.5] * 3)),
+        )
+        reg(
+            "sim.setShapeColor",
+            lambda h, n, c, rgb: self.obj(h).update({("color", c): rgb}),
+        )
+        reg("sim.getShapeMass", lambda h: self.obj(h).get("mass", 1.0))
+        reg("sim.setShapeMass", lambda h, m: self.obj(h).update(mass=m))
+        reg("sim.getObjectInt32Param", get_param("int", 0))
+        reg("sim.setObjectInt32Param", set_param("int"))
+        reg("sim.getObjectFloatParam", get_param("float", 0.0))
+        reg("sim.setObjectFloatParam", set_param("float"))
+        reg(
+            "sim.getEngineFloatParam",
+            lambda p, h: self.obj(h).get(("engine", p), 0.0),
+        )
+        reg(
+            "sim.setEngineFloatParam",
+            lambda p, h, v: self.obj(h).update({("engine", p): v}),
+        )
+
+        def set_texture(h, texture, mode, options, scaling, *args):
+            self.obj(h).update(texture=(texture, mode, options, scaling))
+
+        def set_light(h, state, reserved, diffuse, specular):
+            self.obj(h).update(light=(state, diffuse, specular))
+
+        reg("sim.setShapeTexture", set_texture)
+        reg("sim.setLightParameters", set_light)
+
+        def joint_getter(key, default):
+            return lambda h: self.obj(h).get(key, default)
+
+        def joint_setter(key):
+            return lambda h, v, *a: self.obj(h).update({key: v})
+
+        reg("sim.getJointPosition", joint_getter("joint_position", 0.0))
+        reg("sim.setJointPosition", joint_setter("joint_position"))
+        reg("sim.getJointVelocity", joint_getter("joint_velocity", 0.0))
+        reg("sim.getJointTargetForce", joint_getter("target_force", 0.0))
+        reg("sim.setJointTargetForce", joint_setter("target_force"))
+        reg("sim.setJointTargetPosition", joint_setter("target_position"))
+        reg("sim.setJointTargetVelocity", joint_setter("target_velocity"))
+        reg(
+            "sim.getJointType",
+            joint_getter("joint_type", sc.sim_joint_revolute_subtype),
+        )
+        reg(
+            "sim.getJointMode",
+            lambda h: (self.obj(h).get("joint_mode", 0), 0),
+        )
+        reg("sim.setJointMode", joint_setter("joint_mode"))
+        reg(
+            "sim.getJointInterval",
+            joint_getter("interval", (False, [-math.pi, 2 * math.pi])),
+        )
+        reg(
+            "sim.setJointInterval",
+            lambda h, cyclic, interval: self.obj(h).update(
+                interval=(cyclic, list(interval))
+            ),
+        )
+        reg(
+            "sim.createDummy",
+            lambda size: self.add_object("Dummy", sc.sim_object_dummy_type),
+        )
+
+        def multiply_poses(a, b):
+            m = _matrix_mul(
+                _pose_to_matrix(a[:3], a[3:]), _pose_to_matrix(b[:3], b[3:])
+            )
+            return [m[3], m[7], m[11]] + _matrix_to_quat(m)
+
+        reg("sim.multiplyPoses", multiply_poses)
+
+        # Collisions and distances between the axis-aligned boxes of objects
+        def closest_points(a, b):
+            (min_a, max_a), (min_b, max_b) = self.aabb(a), self.aabb(b)
+            pa, pb = [], []
+            for lo_a, hi_a, lo_b, hi_b in zip(min_a, max_a, min_b, max_b):
+                if hi_a < lo_b:
+                    pa.append(hi_a), pb.append(lo_b)
+                elif hi_b < lo_a:
+                    pa.append(lo_a), pb.append(hi_b)
+                else:
+                    middle = 0.5 * (max(lo_a, lo_b) + min(hi_a, hi_b))
+                    pa.append(middle), pb.append(middle)
+            return pa, pb
+
+        def check_collision(a, b):
+            pa, pb = closest_points(a, b)
+            return (int(pa == pb), [a, b] if pa == pb else [])
+
+        def check_distance(a, b, threshold=0.0):
+            pa, pb = closest_points(a, b)
+            distance = math.dist(pa, pb)
+            if 0 < threshold < distance:
+                return 0, [], []
+            return 1, pa + pb + [distance], [a, b]
+
+        reg("sim.checkCollision", check_collision)
+        reg("sim.checkDistance", check_distance)
+
+        # Sensors report what is stored on them: proximity sensors detect
+        # their "detected_point", if any, force sensors have data once a
+        # "force" (and optionally a "torque") is set
+        def read_proximity_sensor(h):
+            point = self.obj(h).get("detected_point")
+            if point is None:
+                return 0, 0.0, [0.0] * 3, -1, [0.0] * 3
+            return 1, math.dist(point, [0.0] * 3), list(point), -1, [0.0] * 3
+
+        def read_force_sensor(h):
+            obj = self.obj(h)
+            if "force" not in obj:
+                return 0, [0.0] * 3, [0.0] * 3
+            return 1, list(obj["force"]), list(obj.get("torque", [0.0] * 3))
+
+        reg("sim.readProximitySensor", read_proximity_sensor)
+        reg("sim.readForceSensor", read_force_sensor)
+
+        # Shape meshes are the boxes of their "sizes", with a normal per
+        # triangle corner
+        def get_shape_mesh(h):
+            half = [0.5 * size for size in self.obj(h).get("sizes", [0.0] * 3)]
+            vertices = []
+            for k in range(8):
+                vertices += [
+                    half[axis] if k >> axis & 1 else -half[axis]
+                    for axis in range(3)
+                ]
+            indices, normals = [], []
+            for axis in range(3):
+                for side in (0, 1):
+                    # corners of the face, counterclockwise seen from outside
+                    u, v = (1 << (axis + 1) % 3), (1 << (axis + 2) % 3)
+                    base = side << axis
+                    face = [base, base + u, base + u + v, base + v]
+                    if side == 0:
+                        face.reverse()
+                    indices += [face[0], face[1], face[2]]
+                    indices += [face[0], face[2], face[3]]
+                    normal = [0.0] * 3
+                    normal[axis] = 1.0 if side else -1.0
+                    normals += normal * 6
+            return vertices, indices, normals
+
+        reg("sim.getShapeMesh", get_shape_mesh)
+        reg("sim.getShapeBB", lambda h: list(self.obj(h).get("sizes", [0] * 3)))
+        # Handles are never reused by the stub, unlike the simulator's
+        reg("sim.getObjectUid", lambda h: self.obj(h).get("uid", h))
+        self._register_ik()
+        self._register_ompl()
+
+    def _register_ik(self) -> None:
+        # A toy simIK: every chain is a Cartesian robot, whose joints are the
+        # scene joints between its base and tip (in handle order) translating
+        # the tip along x, y, z in turn, within [-1, 1]. handleGroup solves for
+        # the position of the target, ignoring its orientation
+        reg = self.register
+        envs = self.ik_envs
+
+        def create_environment():
+            env = len(envs) + 1
+            envs[env] = {"joints": {}, "poses": {}, "groups": {}}
+            return env
+
+        def create_group(env):
+            group = len(envs[env]["groups"]) + 1
+            envs[env]["groups"][group] = None
+            return group
+
+        def add_element(env, group, base, tip, target, constraints):
+            joints = [
+                h
+                for h, obj in sorted(self.objects.items())
+                if base < h < tip
+                and obj["type"] == sim_const.sim_object_joint_type
+            ]
+            envs[env]["groups"][group] = (base, joints, target)
+            for h in joints:
+                position = self.obj(h).get("joint_position", 0.0)
+                envs[env]["joints"][h] = position
+            for h in (base, target):
+                if h != -1:
+                    pose = self.invoke("sim.getObjectPose", h, -1)
+                    envs[env]["poses"][h] = pose
+            mapping = {h: h for h in self.objects}
+            return 1, mapping, mapping
+
+        def set_joint_position(env, joint, position):
+            envs[env]["joints"][joint] = float(position)
+
+        def set_object_pose(env, handle, pose, rel_to):
+            envs[env]["poses"][handle] = list(pose)
+
+        def handle_group(env, group, options=None):
+            base, joints, target = envs[env]["groups"][group]
+            poses = envs[env]["poses"]
+            origin = poses.get(base, [0.0] * 3)
+            offset = [t - o for t, o in zip(poses[target], origin)]
+            ok = True
+            for k, h in enumerate(joints[:3]):
+                value = min(max(offset[k], -1.0), 1.0)
+                ok = ok and value == offset[k]
+                envs[env]["joints"][h] = value
+            return (1 if ok else 2), 0, [0.0, 0.0]
+
+        reg("simIK.createEnvironment", create_environment)
+        reg("simIK.eraseEnvironment", lambda env: envs.pop(env))
+        reg("simIK.createGroup", create_group)
+        reg("simIK.setGroupCalculation", lambda *args: None)
+        reg("simIK.addElementFromScene", add_element)
+        reg("simIK.getJointPosition", lambda env, j: envs[env]["joints"][j])
+        reg("simIK.setJointPosition", set_joint_position)
+        reg("simIK.setObjectPose", set_object_pose)
+        reg("simIK.handleGroup", handle_group)
+
+    def _register_ompl(self) -> None:
+        # A toy simOMPL: solving takes `ompl_work` seconds of planning, after
+        # which the path is the straight line from start to goal, unless the
+        # goal is out of the state space bounds
+        reg = self.register
+        tasks = self.ompl_tasks
+        spaces: List[Tuple[float, float]] = []
+
+        def create_task(name):
+            task = len(tasks) + 1
+            tasks[task] = {"name": name, "spaces": [], "states": 2}
+            return task
+
+        def create_state_space(name, kind, handle, low, high, *args):
+            spaces.append((low[0], high[0]))
+            return len(spaces)
+
+        def set_state_space(task, space_handles):
+            tasks[task]["spaces"] = [spaces[h - 1] for h in space_handles]
+
+        def setup(task):
+            t = tasks[task]
+            t.update(elapsed=0.0, states=2, solved=False)
+            t["reachable"] = all(
+                low <= g <= high
+                for g, (low, high) in zip(t["goal"], t["spaces"])
+            )
+
+        def solve(task, max_time):
+            t = tasks[task]
+            t["elapsed"] += max_time
+            t["solved"] = t["reachable"] and t["elapsed"] >= self.ompl_work
+            return t["solved"]
+
+        def get_path(task):
+            t = tasks[task]
+            start, goal = t["start"], t["goal"]
+            path = []
+            for i in range(t["states"]):
+                a = i / (t["states"] - 1)
+                path += [s + a * (g - s) for s, g in zip(start, goal)]
+            return path
+
+        reg("simOMPL.createTask", create_task)
+        reg("simOMPL.createStateSpace", create_state_space)
+        reg("simOMPL.setStateSpace", set_state_space)
+        reg("simOMPL.setCollisionPairs", lambda *args: None)
+        reg("simOMPL.setAlgorithm", lambda t, a: tasks[t].update(algorithm=a))
+        reg("simOMPL.setStartState", lambda t, s: tasks[t].update(start=s))
+        reg("simOMPL.setGoalState", lambda t, g: tasks[t].update(goal=g))
+        reg("simOMPL.setup", setup)
+        reg("simOMPL.solve", solve)
+        reg("simOMPL.hasExactSolution", lambda t: tasks[t]["solved"])
+        reg("simOMPL.simplifyPath", lambda t, *args: True)
+        reg("simOMPL.interpolatePath", lambda t, n: tasks[t].update(states=n))
+        reg("simOMPL.getPath", get_path)
+
+
+class StubLib:
+    """Pure-Python implementation of the libcoppeliaSim functions we use
+
+    Stacks are lists of tagged items `(sim_stackitem_*, value)`, where tables
+    hold a list of `(key_item, value_item)` pairs. Script calls are served by
+    the functions registered in `sim` (a `StubSim`).
+    """
+
+    def __init__(self, sim: Optional[StubSim] = None):
+        self.sim = sim if sim is not None else StubSim()
+        self.sim.lib = self
+        self.stacks: Dict[int, List[Item]] = {}
+        self.callbacks: Dict[int, Any] = {}
+        self.string_params: Dict[int, bytes] = {}
+        self.last_error: Optional[str] = None
+        self.last_script: Optional[int] = None  # of the last script call
+        self._buffers: Dict[int, Any] = {}
+        self._next_stack = 1
+
+    # -------------------------------------------------------------------------
+    # Application
+
+    def simInitialize(self, appDir: Any, options: int) -> int:
+        return 1
+
+    def simDeinitialize(self) -> int:
+        return 1
+
+    def simRunGui(self, options: int) -> None:
+        return None
+
+    def simGetExitRequest(self) -> int:
+        return 0
+
+    def simLoop(self, callback: Any, option: int) -> int:
+        if option == 0:  # otherwise, only the UI is updated
+            self.sim.loop()
+        return 1
+
+    def simSetStringParam(self, param: int, value: Any) -> int:
+        self.string_params[param] = _to_bytes(value)
+        return 1
+
+    def simSetNamedStringParam(self, name: Any, value: Any, size: int) -> int:
+        return 1
+
+    def simGetStringParam(self, param: int) -> int:
+        return self._alloc(self.string_params.get(param, b""))
+
+    def simReleaseBuffer(self, ptr: int) -> int:
+        self._buffers.pop(ptr, None)
+        return 1
+
+    def simRegCallback(self, index: int, callback: Any) -> None:
+        self.callbacks[index] = callback
+
+    def invoke_callback(self, index: int, *args) -> Tuple:
+        """Calls a callback registered with simRegCallback"""
+        handle = self.simCreateStack()
+        try:
+            self.stacks[handle].extend(to_item(arg) for arg in args)
+            if not self.callbacks[index](handle):
+                raise StubError(f"callback {index} failed")
+            return tuple(from_item(item) for item in self.stacks[handle])
+        finally:
+            self.simReleaseStack(handle)
+
+    def _alloc(self, data: bytes) -> int:
+        buffer = ctypes.create_string_buffer(data, len(data) + 1)
+        address = ctypes.addressof(buffer)
+        self._buffers[address] = buffer
+        return address
+
+    # -------------------------------------------------------------------------
+    # Stacks
+
+    def simCreateStack(self) -> int:
+        handle = self._next_stack
+        self._next_stack += 1
+        self.stacks[handle] = []
+        return handle
+
+    def simReleaseStack(self, stackHandle: int) -> int:
+        self.stacks.pop(stackHandle)
+        return 1
+
+    def simCopyStack(self, stackHandle: int) -> int:
+        handle = self.simCreateStack()
+        self.stacks[handle] = list(self.stacks[stackHandle])
+        return handle
+
+    def simGetStackSize(self, stackHandle: int) -> int:
+        return len(self.stacks[stackHandle])
+
+    def simPopStackItem(self, stackHandle: int, count: int) -> int:
+        stack = self.stacks[stackHandle]
+        if count == 0 or count >= len(stack):
+            stack.clear()
+        else:
+            del stack[-count:]
+        return len(stack)
+
+    def simMoveStackItemToTop(self, stackHandle: int, cIndex: int) -> int:
+        stack = self.stacks[stackHandle]
+        stack.append(stack.pop(cIndex))
+        return 1
+
+    def simGetStackItemType(self, stackHandle: int, cIndex: int) -> int:
+        stack = self.stacks[stackHandle]
+        if not -len(stack) <= cIndex < len(stack):
+            return -1
+        return stack[cIndex][0]
+
+    def simDebugStack(self, stackHandle: int, cIndex: int) -> int:
+        print(f"[{cIndex}] {self.stacks[stackHandle][cIndex]!r}")
+        return 1
+
+    def simPushNullOntoStack(self, stackHandle: int) -> int:
+        self.stacks[stackHandle].append((const.sim_stackitem_null, None))
+        return 1
+
+    def simPushBoolOntoStack(self, stackHandle: int, value: bool) -> int:
+        self.stacks[stackHandle].append((const.sim_stackitem_bool, bool(value)))
+        return 1
+
+    def simPushInt32OntoStack(self, stackHandle: int, value: int) -> int:
+        item = (const.sim_stackitem_integer, int(value))
+        self.stacks[stackHandle].append(item)
+        return 1
+
+    simPushInt64OntoStack = simPushInt32OntoStack
+
+    def simPushDoubleOntoStack(self, stackHandle: int, value: float) -> int:
+        item = (const.sim_stackitem_double, float(value))
+        self.stacks[stackHandle].append(item)
+        return 1
+
+    def simPushStringOntoStack(
+        self, stackHandle: int, value: Any, size: int
+    ) -> int:
+        data = ctypes.string_at(value, size) if size else b""
+        self.stacks[stackHandle].append((const.sim_stackitem_string, data))
+        return 1
+
+    def _push_table(self, stackHandle: int, values: List[Item]) -> int:
+        items = [
+            ((const.sim_stackitem_integer, i + 1), v)
+            for i, v in enumerate(values)
+        ]
+        self.stacks[stackHandle].append((const.sim_stackitem_table, items))
+        return 1
+
+    def simPushUInt8TableOntoStack(
+        self, stackHandle: int, values: Any, size: int
+    ) -> int:
+        data = ctypes.string_at(values, size) if size else b""
+        items = [(const.sim_stackitem_integer, v) for v in data]
+        return self._push_table(stackHandle, items)
+
+    def simPushInt32TableOntoStack(
+        self, stackHandle: int, values: Any, size: int
+    ) -> int:
+        items = [(const.sim_stackitem_integer, values[i]) for i in range(size)]
+        return self._push_table(stackHandle, items)
+
+    simPushInt64TableOntoStack = simPushInt32TableOntoStack
+
+    def simPushDoubleTableOntoStack(
+        self, stackHandle: int, values: Any, size: int
+    ) -> int:
+        items = [(const.sim_stackitem_double, values[i]) for i in range(size)]
+        return self._push_table(stackHandle, items)
+
+    def simPushTableOntoStack(self, stackHandle: int) -> int:
+        self.stacks[stackHandle].append((const.sim_stackitem_table, []))
+        return 1
+
+    def simInsertDataIntoStackTable(self, stackHandle: int) -> int:
+        stack = self.stacks[stackHandle]
+        value = stack.pop()
+        key = stack.pop()
+        table = stack[-1][1]
+        for i, (k, _) in enumerate(table):
+            if k == key:
+                table[i] = (key, value)
+                return 1
+        table.append((key, value))
+        return 1
+
+    def _top(self, stackHandle: int) -> Item:
+        stack = self.stacks[stackHandle]
+        return stack[-1] if stack else (-1, None)
+
+    def simGetStackBoolValue(self, stackHandle: int, value: Any) -> int:
+        item_type, item = self._top(stackHandle)
+        if item_type != const.sim_stackitem_bool:
+            return 0
+        _deref(value).value = item
+        return 1
+
+    def _get_number(self, stackHandle: int, value: Any, cast: Callable) -> int:
+        item_type, item = self._top(stackHandle)
+        if item_type not in _NUMBER_TYPES:
+            return 0
+        _deref(value).value = cast(item)
+        return 1
+
+    def simGetStackInt32Value(self, stackHandle: int, value: Any) -> int:
+        return self._get_number(stackHandle, value, int)
+
+    simGetStackInt64Value = simGetStackInt32Value
+
+    def simGetStackDoubleValue(self, stackHandle: int, value: Any) -> int:
+        return self._get_number(stackHandle, value, float)
+
+    def simGetStackStringValue(self, stackHandle: int, size: Any) -> Any:
+        item_type, item = self._top(stackHandle)
+        if item_type != const.sim_stackitem_string:
+            return None
+        _deref(size).value = len(item)
+        return self._alloc(item)
+
+    def simGetStackTableInfo(self, stackHandle: int, infoType: int) -> int:
+        item_type, items = self._top(stackHandle)
+        if item_type != const.sim_stackitem_table:
+            return const.sim_stack_table_not_table
+        if infoType == 0:
+            if not items:
+                return const.sim_stack_table_empty
+            return len(items) if _is_array(items) else const.sim_stack_table_map
+        types = _TABLE_INFO_TYPES.get(infoType, ())
+        return int(all(v[0] in types for _, v in items))
+
+    def simUnfoldStackTable(self, stackHandle: int) -> int:
+        item_type, items = self._top(stackHandle)
+        if item_type != const.sim_stackitem_table:
+            return -1
+        stack = self.stacks[stackHandle]
+        stack.pop()
+        for key, value in items:
+            stack.append(key)
+            stack.append(value)
+        return 1
+
+    def _get_table(
+        self, stackHandle: int, values: Any, count: int, cast: Callable
+    ) -> int:
+        item_type, items = self._top(stackHandle)
+        if item_type != const.sim_stackitem_table:
+            return -1
+        ok = 1
+        for i, (_, (vtype, v)) in enumerate(items[:count]):
+            if vtype in _NUMBER_TYPES:
+                values[i] = cast(v)
+            else:
+                values[i], ok = cast(0), 0
+        return ok
+
+    def simGetStackUInt8Table(
+        self, stackHandle: int, values: Any, count: int
+    ) -> int:
+        data = bytearray(count)
+        ok = self._get_table(stackHandle, data, count, lambda v: int(v) & 255)
+        ctypes.memmove(values, bytes(data), count)
+        return ok
+
+    def simGetStackInt32Table(
+        self, stackHandle: int, values: Any, count: int
+    ) -> int:
+        return self._get_table(stackHandle, values, count, int)
+
+    simGetStackInt64Table = simGetStackInt32Table
+
+    def simGetStackDoubleTable(
+        self, stackHandle: int, values: Any, count: int
+    ) -> int:
+        return self._get_table(stackHandle, values, count, float)
+
+    # -------------------------------------------------------------------------
+    # Scripts
+
+    def simGetScriptHandleEx(
+        self, scriptType: int, objectHandle: int, scriptName: Any
+    ) -> int:
+        return scriptType
+
+    def simCallScriptFunctionEx(
+        self, scriptHandle: int, functionName: Any, stackHandle: int
+    ) -> int:
+        name = _to_bytes(functionName).decode("utf-8").split("@")[0]
+        self.last_script = scriptHandle
+        stack = self.stacks[stackHandle]
+        args = [from_item(item) for item in stack]
+        stack.clear()
+        try:
+            ret = self.sim.invoke(name, *args)
+        except Exception:
+            self.last_error = traceback.format_exc()
+            return -1
+        if ret is None:
+            ret = ()
+        elif not isinstance(ret, tuple):
+            ret = (ret,)
+        stack.extend(to_item(value) for value in ret)
+        return 1
+
+
+def install(stub: Optional[StubLib] = None) -> StubLib:
+    """Makes the stack, bridge and `SimBackend` use a `StubLib`
+
+    Call `pyrep_ext.core.lib.set_backend(None)` to go back to libcoppeliaSim.
+    """
+    from .bridge import getTypeHints
+    from .sim import SimBackend
+
+    stub = stub if stub is not None else StubLib()
+    set_backend(stub)
+    getTypeHints.cache_clear()
+    SimBackend._instance = None
+    return stub
+
+
+# -----------------------------------------------------------------------------
+# Pose helpers, matrices are given as 12 floats (3x4 row-major) like CoppeliaSim
+
+
+def _pose_to_matrix(position, quaternion) -> List[float]:
+    x, y, z, w = quaternion
+    n = math.sqrt(x * x + y * y + z * z + w * w) or 1.0
+    x, y, z, w = x / n, y / n, z / n, w / n
+    return [
+        1 - 2 * (y * y + z * z),
+        2 * (x * y - z * w),
+        2 * (x * z + y * w),
+        float(position[0]),
+        2 * (x * y + z * w),
+        1 - 2 * (x * x + z * z),
+        2 * (y * z - x * w),
+        float(position[1]),
+        2 * (x * z - y * w),
+        2 * (y * z + x * w),
+        1 - 2 * (x * x + y * y),
+        float(position[2]),
+    ]
+
+
+def _matrix_to_quat(m: List[float]) -> List[float]:
+    r00, r01, r02 = m[0], m[1], m[2]
+    r10, r11, r12 = m[4], m[5], m[6]
+    r20, r21, r22 = m[8], m[9], m[10]
+    trace = r00 + r11 + r22
+    if trace > 0:
+        s = 2.0 * math.sqrt(trace + 1.0)
+        q = [(r21 - r12) / s, (r02 - r20) / s, (r10 - r01) / s, 0.25 * s]
+    elif r00 > r11 and r00 > r22:
+        s = 2.0 * math.sqrt(1.0 + r00 - r11 - r22)
+        q = [0.25 * s, (r01 + r10) / s, (r02 + r20) / s, (r21 - r12) / s]
+    elif r11 > r22:
+        s = 2.0 * math.sqrt(1.0 + r11 - r00 - r22)
+        q = [(r01 + r10) / s, 0.25 * s, (r12 + r21) / s, (r02 - r20) / s]
+    else:
+        s = 2.0 * math.sqrt(1.0 + r22 - r00 - r11)
+        q = [(r02 + r20) / s, (r12 + r21) / s, 0.25 * s, (r10 - r01) / s]
+    return q
+
+
+def _matrix_mul(a: List[float], b: List[float]) -> List[float]:
+    out = []
+    for i in range(3):
+        row = a[4 * i : 4 * i + 4]
+        for j in range(4):
+            v = sum(row[k] * b[4 * k + j] for k in range(3))
+            out.append(v + (row[3] if j == 3 else 0.0))
+    return out
+
+
+def _matrix_inv(m: List[float]) -> List[float]:
+    # Rigid transform inverse: [R^T | -R^T t]
+    rt = [m[0], m[4], m[8], m[1], m[5], m[9], m[2], m[6], m[10]]
+    t = [m[3], m[7], m[11]]
+    out = []
+    for i in range(3):
+        row = rt[3 * i : 3 * i + 3]
+        out += row + [-sum(row[k] * t[k] for k in range(3))]
+    return out
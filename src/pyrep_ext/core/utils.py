@@ -17,6 +17,10 @@ def script_call(
     """Calls a script function (from a plugin, the main client application,
     or from another script). This represents a callback inside of a script.
 
+    Uses the legacy `extCallScriptFunction`, see
+    `pyrep_ext.scripts.ScriptFunction` for array payloads, calls made every
+    step and batches of calls.
+
     :param function_name_at_script_name: A string representing the function
         name and script name, e.g. myFunctionName@theScriptName. When the
         script is not associated with an object, then just specify the
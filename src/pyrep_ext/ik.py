@@ -0,0 +1,178 @@
+"""Inverse kinematics over simIK
+
+An `IKSolver` builds the simIK environment of a kinematic chain once, on the
+Lua side, where it stays cached for the lifetime of the simulator (see
+`pyrepExt.ikCreate`). Solvers built for the same chain share it. Batches of
+target poses are solved in a single call, e.g. to check the reachability of
+grasp candidates::
+
+    solver = IKSolver(arm_joints, tip=gripper_tip)
+    solutions, reachable = solver.solve_batch(grasp_poses)  # (N, 7)
+    solver.apply(solutions[np.argmax(reachable)])
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from pyrep_ext.core import bridge
+from pyrep_ext.core.sim import SimBackend
+from pyrep_ext.objects.group import ObjectGroup
+from pyrep_ext.objects.joint import Joint
+from pyrep_ext.objects.object import Object
+
+
+def _handle_of(obj: Optional[Object]) -> int:
+    return -1 if obj is None else obj.get_handle()
+
+
+class IKSolver:
+    """Inverse kinematics of a chain of joints, from `base` to `tip`
+
+    :param joints: The joints of the chain, giving the order of solutions.
+    :param tip: The object placed on the targets, e.g. a dummy at the tip of
+        the gripper.
+    :param target: The dummy the tip is linked to in the scene, if any. A
+        temporary one is used otherwise.
+    :param base: The base of the chain, the world if None.
+    :param constraints: The simIK constraints, `simIK.constraint_pose` by
+        default.
+    :param method: The simIK calculation method, damped least squares by
+        default.
+    :param damping: The damping of the damped least squares method.
+    :param max_iterations: The maximum number of iterations of each solve.
+    """
+
+    def __init__(
+        self,
+        joints: Sequence[Joint],
+        tip: Object,
+        target: Optional[Object] = None,
+        base: Optional[Object] = None,
+        constraints: Optional[int] = None,
+        method: Optional[int] = None,
+        damping: float = 0.1,
+        max_iterations: int = 50,
+    ):
+        sim_ik = SimBackend().sim_ik_api
+        if constraints is None:
+            constraints = sim_ik.constraint_pose
+        if method is None:
+            method = sim_ik.method_damped_least_squares
+        self._joints = ObjectGroup([j.get_handle() for j in joints], Joint)
+        handles = ",".join(map(str, self._joints.handles))
+        base_handle = _handle_of(base)
+        settings = (constraints, method, damping, max_iterations)
+        self._key = (
+            f"{base_handle}:{tip.get_handle()}:{_handle_of(target)}:"
+            f"{handles}:" + ":".join(map(str, settings))
+        )
+        bridge.call(
+            "pyrepExt.ikCreate",
+            (
+                self._key,
+                base_handle,
+                tip.get_handle(),
+                _handle_of(target),
+                self._joints.handles,
+            )
+            + settings,
+            (
+                ("string", "int", "int", "int", "ndarray")
+                + ("int", "int", "float", "int"),
+                ("string",),
+            ),
+        )
+
+    @property
+    def key(self) -> str:
+        """The key of the chain's IK environment on the Lua side"""
+        return self._key
+
+    @property
+    def joints(self) -> ObjectGroup:
+        return self._joints
+
+    @property
+    def dof(self) -> int:
+        return len(self._joints)
+
+    def sync(self) -> np.ndarray:
+        """Updates the IK environment from the scene, in one call
+
+        Copies the pose of the base and the positions of the joints, which
+        are returned. Done by `solve_batch` when no seeds are given.
+        """
+        return bridge.call(
+            "pyrepExt.ikSync", (self._key,), (("string",), ("ndarray",))
+        )
+
+    def get_joint_positions(self) -> np.ndarray:
+        """Returns the (dof,) positions of the joints in the scene"""
+        values = self._joints.call_each("sim.getJointPosition")
+        return np.array(values, dtype=np.float64)
+
+    def apply(self, positions: np.ndarray) -> None:
+        """Sets the joints of the scene to a (dof,) solution, in one call"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(self.dof)
+        self._joints.call_each("sim.setJointPosition", positions)
+
+    def solve_batch(
+        self,
+        poses: np.ndarray,
+        seeds: Optional[np.ndarray] = None,
+        relative_to: Optional[Object] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Solves the chain for a batch of target poses, in one call
+
+        The scene is left untouched.
+
+        :param poses: The (N, 7) target poses of the tip, position and xyzw
+            quaternion.
+        :param seeds: The (N, dof) or (dof,) configurations each solve starts
+            from, the current configuration of the scene by default.
+        :param relative_to: The reference frame of the poses, the world if
+            None.
+        :return: The (N, dof) solutions, and a (N,) mask of the successful
+            ones.
+        """
+        poses = np.asarray(poses, dtype=np.float64).reshape(-1, 7)
+        if seeds is None:
+            seeds = np.empty(0)
+        else:
+            seeds = np.asarray(seeds, dtype=np.float64)
+            if seeds.size not in (self.dof, len(poses) * self.dof):
+                raise ValueError(
+                    f"expected ({len(poses)}, {self.dof}) or ({self.dof},) "
+                    f"seeds, got {seeds.shape}"
+                )
+        if len(poses) == 0:
+            return np.empty((0, self.dof)), np.empty(0, dtype=bool)
+        solutions, success = bridge.call(
+            "pyrepExt.ikSolve",
+            (self._key, poses, seeds, _handle_of(relative_to)),
+            (("string", "ndarray", "ndarray", "int"), ("ndarray", "list")),
+        )
+        return (
+            solutions.reshape(len(poses), self.dof),
+            np.array(success, dtype=bool),
+        )
+
+    def solve(
+        self,
+        pose: np.ndarray,
+        seed: Optional[np.ndarray] = None,
+        relative_to: Optional[Object] = None,
+    ) -> Optional[np.ndarray]:
+        """Solves the chain for a single pose, None if it failed"""
+        solutions, success = self.solve_batch(pose, seed, relative_to)
+        return solutions[0] if success[0] else None
+
+    def erase(self) -> None:
+        """Erases the IK environment of the chain, shared by its solvers
+
+        Needed after the chain changed in the scene, e.g. a joint was removed.
+        """
+        bridge.call("pyrepExt.ikErase", (self._key,), (("string",), ()))
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from pyrep_ext.const import ObjectType
+from pyrep_ext.core import bridge
+from pyrep_ext.objects.group import ObjectGroup, handles_of
+from pyrep_ext.objects.object import Object
+
+
+class ForceSensor(Object):
+    def _get_requested_type(self) -> ObjectType:
+        return ObjectType.FORCE_SENSOR
+
+    def read(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Reads the force and torque measured by this sensor
+
+        Returns
+        -------
+            Tuple[np.ndarray, np.ndarray]
+                The (3,) force and (3,) torque, NaN if the sensor has no data
+                yet
+        """
+        result, force, torque = self._sim_api.readForceSensor(self._handle)
+        if not result & 1:
+            return np.full(3, np.nan), np.full(3, np.nan)
+        return (
+            np.array(force, dtype=np.float64),
+            np.array(torque, dtype=np.float64),
+        )
+
+    @classmethod
+    def read_many(
+        cls, sensors: Union[ObjectGroup, Sequence[ForceSensor]]
+    ) -> np.ndarray:
+        """Reads the force and torque of many sensors in a single call
+
+        Parameters
+        ----------
+            sensors: Union[ObjectGroup, Sequence[ForceSensor]]
+                The N sensors
+
+        Returns
+        -------
+            np.ndarray
+                The (N, 6) forces and torques, NaN for sensors without data
+                yet
+        """
+        handles = handles_of(sensors)
+        if len(handles) == 0:
+            return np.empty((0, 6))
+        return bridge.call(
+            "pyrepExt.readForceSensors",
+            (handles,),
+            (("ndarray",), ("ndarray",)),
+        ).reshape(-1, 6)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+
+from pyrep_ext.core.bridge import call_batch
+from pyrep_ext.core.errors import CoppeliaSimError
+from pyrep_ext.objects.object import Object
+from pyrep_ext.transforms import from_sim_matrix, relative_matrices
+
+CallSpec = Tuple[str, Sequence[Any]]
+
+
+def call_all(calls: List[CallSpec]) -> List[Any]:
+    """Makes the calls `(func, args)` in a single round trip, returning their
+    results and raising if any of them failed"""
+    results = call_batch(calls)
+    for (func, _), (ok, value) in zip(calls, results):
+        if not ok:
+            raise CoppeliaSimError(f"{func} failed: {value}")
+    return [value for _, value in results]
+
+
+def handles_of(
+    objects: Union[ObjectGroup, Sequence[Union[Object, int]], np.ndarray],
+) -> np.ndarray:
+    """The handles of a group, or of a sequence of objects or handles"""
+    if isinstance(objects, ObjectGroup):
+        return objects.handles
+    return np.array(
+        [o.get_handle() if isinstance(o, Object) else o for o in objects],
+        dtype=np.int64,
+    ).reshape(-1)
+
+
+class ObjectGroup:
+    """A set of scene objects, read and written in bulk
+
+    Each bulk operation costs a single round trip to the simulator, however
+    many objects are in the group. Without an `object_class` (e.g. for
+    lights), indexing the group gives handles.
+    """
+
+    def __init__(
+        self,
+        handles: Union[Sequence[int], np.ndarray],
+        object_class: Optional[Type[Object]] = None,
+    ):
+        self._handles = np.asarray(handles, dtype=np.int64).reshape(-1)
+        self._object_class = object_class
+
+    @property
+    def handles(self) -> np.ndarray:
+        return self._handles
+
+    @property
+    def object_class(self) -> Optional[Type[Object]]:
+        return self._object_class
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def __getitem__(self, index: Any) -> Union[Object, int, ObjectGroup]:
+        """An object of the group, or a group for slices and index arrays"""
+        if isinstance(index, (int, np.integer)):
+            return self._wrap(int(self._handles[index]))
+        return ObjectGroup(self._handles[index], self._object_class)
+
+    def __iter__(self) -> Iterator[Union[Object, int]]:
+        return (self._wrap(int(h)) for h in self._handles)
+
+    def __repr__(self) -> str:
+        name = getattr(self._object_class, "__name__", None)
+        return f"ObjectGroup({name}, {len(self._handles)} objects)"
+
+    def _wrap(self, handle: int) -> Union[Object, int]:
+        if self._object_class is None:
+            return handle
+        return self._object_class(handle)
+
+    def call_each(
+        self, func: str, *args_per_object: Union[Sequence, np.ndarray]
+    ) -> List[Any]:
+        """Calls `func(handle, *args)` for each object, in one round trip
+
+        Parameters
+        ----------
+            func: str
+                The API function, e.g. "sim.setShapeMass"
+            args_per_object: Union[Sequence, np.ndarray]
+                For each argument after the handle, a sequence (or array)
+                with one value per object
+
+        Returns
+        -------
+            List[Any]
+                The result of each call
+        """
+        columns = [_rows(arg, len(self)) for arg in args_per_object]
+        calls = [
+            (func, [int(h)] + [column[i] for column in columns])
+            for i, h in enumerate(self._handles)
+        ]
+        return call_all(calls)
+
+    def get_positions(self, relative_to: Optional[Object] = None) -> np.ndarray:
+        """Returns the (N, 3) positions of the objects"""
+        rel = -1 if relative_to is None else relative_to.get_handle()
+        values = self.call_each("sim.getObjectPosition", [rel] * len(self))
+        return np.array(values, dtype=np.float64).reshape(-1, 3)
+
+    def set_positions(
+        self, positions: np.ndarray, relative_to: Optional[Object] = None
+    ) -> None:
+        """Sets the positions of the objects from a (N, 3) array"""
+        rel = -1 if relative_to is None else relative_to.get_handle()
+        self.call_each("sim.setObjectPosition", positions, [rel] * len(self))
+
+    def get_quaternions(
+        self, relative_to: Optional[Object] = None
+    ) -> np.ndarray:
+        """Returns the (N, 4) orientations of the objects as xyzw quaternions"""
+        rel = -1 if relative_to is None else relative_to.get_handle()
+        values = self.call_each("sim.getObjectQuaternion", [rel] * len(self))
+        return np.array(values, dtype=np.float64).reshape(-1, 4)
+
+    def set_quaternions(
+        self, quaternions: np.ndarray, relative_to: Optional[Object] = None
+    ) -> None:
+        """Sets the orientations of the objects from a (N, 4) array"""
+        rel = -1 if relative_to is None else relative_to.get_handle()
+        self.call_each(
+            "sim.setObjectQuaternion", quaternions, [rel] * len(self)
+        )
+
+    def get_poses(self, relative_to: Optional[Object] = None) -> np.ndarray:
+        """Returns the (N, 7) poses of the objects, position and quaternion"""
+        rel = -1 if relative_to is None else relative_to.get_handle()
+        values = self.call_each("sim.getObjectPose", [rel] * len(self))
+        return np.array(values, dtype=np.float64).reshape(-1, 7)
+
+    def set_poses(
+        self, poses: np.ndarray, relative_to: Optional[Object] = None
+    ) -> None:
+        """Sets the poses of the objects from a (N, 7) array"""
+        rel = -1 if relative_to is None else relative_to.get_handle()
+        self.call_each("sim.setObjectPose", poses, [rel] * len(self))
+
+    def get_matrices(self, relative_to: Optional[Object] = None) -> np.ndarray:
+        """Returns the (N, 4, 4) transforms of the objects"""
+        rel = -1 if relative_to is None else relative_to.get_handle()
+        values = self.call_each("sim.getObjectMatrix", [rel] * len(self))
+        return from_sim_matrix(np.array(values, dtype=np.float64))
+
+    def get_relative_matrices(
+        self, pairs: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Returns the transforms of the objects relative to each other
+
+        The world transforms are read in one round trip, and combined
+        locally rather than queried for each pair.
+
+        Parameters
+        ----------
+            pairs: Optional[np.ndarray]
+                The (P, 2) indices `(i, j)` of the pairs, all of them if None
+
+        Returns
+        -------
+            np.ndarray
+                The transforms of objects i relative to objects j, as a
+                (N, N, 4, 4) array indexed by `[i, j]` or a (P, 4, 4) array
+        """
+        return relative_matrices(self.get_matrices(), pairs)
+
+    def remove(self) -> None:
+        """Removes all the objects from the scene"""
+        from pyrep_ext.objects import shape
+
+        call_all([("sim.removeObjects", [self._handles.tolist()])])
+        shape.forget_meshes(self._handles.tolist())
+
+
+def _rows(values: Union[Sequence, np.ndarray], n: int) -> List[Any]:
+    if isinstance(values, np.ndarray):
+        if len(values) != n:
+            raise ValueError(f"expected {n} rows, got {values.shape}")
+        return values.tolist()
+    values = list(values)
+    if len(values) != n:
+        raise ValueError(f"expected {n} values, got {len(values)}")
+    return values
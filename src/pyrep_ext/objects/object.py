@@ -6,7 +6,6 @@ from typing import Any, List, Optional, Tuple, Union
 import numpy as np
 
 from pyrep_ext.const import ObjectType
-from pyrep_ext.core import sim_const
 from pyrep_ext.core.errors import WrongObjectTypeError
 from pyrep_ext.core.sim import SimBackend
 
@@ -288,7 +287,7 @@ class Object(abc.ABC):
                 The 4x4 matrix transform of this object
         """
         rel_to_handle = (
-            sim_const.sim_handle_world
+            self._sim_api.handle_world
             if relative_to is None
             else relative_to.get_handle()
         )
@@ -309,7 +308,7 @@ class Object(abc.ABC):
                 An optional object to be used as reference frame
         """
         rel_to_handle = (
-            sim_const.sim_handle_world
+            self._sim_api.handle_world
             if relative_to is None
             else relative_to.get_handle()
         )
@@ -354,12 +353,12 @@ class Object(abc.ABC):
                 A list containing the AABB positions
         """
         params = [
-            sim_const.sim_objfloatparam_objbbox_min_x,
-            sim_const.sim_objfloatparam_objbbox_max_x,
-            sim_const.sim_objfloatparam_objbbox_min_y,
-            sim_const.sim_objfloatparam_objbbox_max_y,
-            sim_const.sim_objfloatparam_objbbox_min_z,
-            sim_const.sim_objfloatparam_objbbox_max_z,
+            self._sim_api.objfloatparam_objbbox_min_x,
+            self._sim_api.objfloatparam_objbbox_max_x,
+            self._sim_api.objfloatparam_objbbox_min_y,
+            self._sim_api.objfloatparam_objbbox_max_y,
+            self._sim_api.objfloatparam_objbbox_min_z,
+            self._sim_api.objfloatparam_objbbox_max_z,
         ]
         return [
             self._sim_api.getObjectFloatParam(self._handle, p) for p in params
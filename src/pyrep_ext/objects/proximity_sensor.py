@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from pyrep_ext.const import ObjectType
+from pyrep_ext.core import bridge
+from pyrep_ext.objects.group import ObjectGroup, handles_of
+from pyrep_ext.objects.object import Object
+
+
+class ProximitySensor(Object):
+    def _get_requested_type(self) -> ObjectType:
+        return ObjectType.PROXIMITY_SENSOR
+
+    def read(self) -> Tuple[bool, float, np.ndarray]:
+        """Reads the last detection of this sensor
+
+        Returns
+        -------
+            Tuple[bool, float, np.ndarray]
+                Whether something is detected, its distance (inf if not) and
+                the (3,) point detected, in the sensor's frame (NaN if not)
+        """
+        result, distance, point, _, _ = self._sim_api.readProximitySensor(
+            self._handle
+        )
+        if result != 1:
+            return False, np.inf, np.full(3, np.nan)
+        return True, distance, np.array(point, dtype=np.float64)
+
+    def is_detected(self) -> bool:
+        """Returns whether this sensor detects something"""
+        return self.read()[0]
+
+    @classmethod
+    def read_many(
+        cls, sensors: Union[ObjectGroup, Sequence[ProximitySensor]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Reads the last detection of many sensors in a single call
+
+        Parameters
+        ----------
+            sensors: Union[ObjectGroup, Sequence[ProximitySensor]]
+                The N sensors, e.g. the cells of a tactile skin
+
+        Returns
+        -------
+            Tuple[np.ndarray, np.ndarray, np.ndarray]
+                The (N,) detection flags, the (N,) distances (inf for sensors
+                detecting nothing) and the (N, 3) points detected, in the
+                frame of each sensor (NaN for sensors detecting nothing)
+        """
+        handles = handles_of(sensors)
+        if len(handles) == 0:
+            return np.empty(0, dtype=bool), np.empty(0), np.empty((0, 3))
+        values = bridge.call(
+            "pyrepExt.readProximitySensors",
+            (handles,),
+            (("ndarray",), ("ndarray",)),
+        ).reshape(-1, 5)
+        return values[:, 0] != 0, values[:, 1], values[:, 2:]
@@ -1,10 +1,182 @@
 from __future__ import annotations
 
-from pyrep_ext.const import ObjectType
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pyrep_ext.const import ObjectType, PrimitiveShape
+from pyrep_ext.core import bridge
+from pyrep_ext.objects.group import ObjectGroup, handles_of
 from pyrep_ext.objects.object import Object
 
 
-class Shape(Object):
+@dataclass(frozen=True)
+class Mesh:
+    """A triangle mesh, in the frame of its shape"""
+
+    vertices: np.ndarray  # (V, 3) float32
+    indices: np.ndarray  # (F, 3) int32, the vertices of each triangle
+    normals: np.ndarray  # (F, 3, 3) float32, at the corners of each triangle
+
+
+# Meshes of the shapes by handle, with the geometry stamp they were read at:
+# the unique ID of the shape (handles are reused) and the size of its bounding
+# box (changed by scaling), see `pyrepExt.getMeshes`
+_meshes: Dict[int, Tuple[np.ndarray, Mesh]] = {}
+
 
+def scene_changed() -> None:
+    """Drops the cached meshes, e.g. once a new scene is loaded"""
+    _meshes.clear()
+
+
+def forget_meshes(handles: Sequence[int]) -> None:
+    """Drops the cached meshes of shapes, e.g. removed from the scene"""
+    for h in handles:
+        _meshes.pop(h, None)
+
+
+class Shape(Object):
     def _get_requested_type(self) -> ObjectType:
         return ObjectType.SHAPE
+
+    def get_mesh(self) -> Mesh:
+        """Returns the mesh of this shape, read again only if its geometry
+        stamp changed (see `get_meshes`)
+
+        Returns
+        -------
+            Mesh
+                The vertices, triangles and normals, in the shape's frame
+        """
+        return Shape.get_meshes([self])[0]
+
+    def invalidate_mesh(self) -> None:
+        """Drops the cached mesh, to be called after changing the geometry of
+        this shape without changing its bounding box"""
+        _meshes.pop(self._handle, None)
+
+    @classmethod
+    def get_meshes(
+        cls, shapes: Union[ObjectGroup, Sequence[Shape]]
+    ) -> List[Mesh]:
+        """Returns the meshes of many shapes, see `get_mesh`
+
+        A single call checks the geometry stamps of the shapes (their unique
+        ID and bounding box size) against the cached ones, and reads the
+        meshes of the shapes that changed or are not cached yet.
+
+        Parameters
+        ----------
+            shapes: Union[ObjectGroup, Sequence[Shape]]
+                The N shapes
+
+        Returns
+        -------
+            List[Mesh]
+                The N meshes
+        """
+        handles = handles_of(shapes).tolist()
+        if not handles:
+            return []
+        unique = list(dict.fromkeys(handles))
+        cached = np.full((len(unique), 4), np.nan)  # NaN matches no stamp
+        for i, h in enumerate(unique):
+            if h in _meshes:
+                cached[i] = _meshes[h][0]
+        vertices, indices, normals, counts, stamps = bridge.call(
+            "pyrepExt.getMeshes",
+            (np.array(unique, dtype=np.int64), cached),
+            (("ndarray", "ndarray"), ("ndarray",) * 5),
+        )
+        stamps = stamps.reshape(-1, 4)
+        changed = np.flatnonzero(np.any(stamps != cached, axis=1))
+        if len(changed):
+            vertices = vertices.astype(np.float32).reshape(-1, 3)
+            indices = indices.astype(np.int32).reshape(-1, 3)
+            normals = normals.astype(np.float32).reshape(-1, 3, 3)
+            counts = counts.astype(np.int64).reshape(-1, 2)
+            # The meshes are views of these arrays, shared through the cache
+            for array in (vertices, indices, normals):
+                array.flags.writeable = False
+            v_ends, f_ends = np.cumsum(counts, axis=0).T
+            v_starts, f_starts = v_ends - counts[:, 0], f_ends - counts[:, 1]
+            for i in changed:
+                faces = slice(f_starts[i], f_ends[i])
+                _meshes[unique[i]] = (
+                    stamps[i],
+                    Mesh(
+                        vertices[v_starts[i] : v_ends[i]],
+                        indices[faces],
+                        normals[faces],
+                    ),
+                )
+        return [_meshes[h][1] for h in handles]
+
+    @classmethod
+    def create_many(
+        cls,
+        types: Union[Sequence[PrimitiveShape], np.ndarray],
+        sizes: np.ndarray,
+        poses: np.ndarray,
+        colors: Optional[np.ndarray] = None,
+        masses: Optional[np.ndarray] = None,
+        dynamic: Union[bool, np.ndarray] = True,
+        respondable: Union[bool, np.ndarray] = True,
+    ) -> ObjectGroup:
+        """Creates primitive shapes in a single call to the simulator
+
+        Arrays with a single row are used for all the shapes.
+
+        Parameters
+        ----------
+            types: Union[Sequence[PrimitiveShape], np.ndarray]
+                The N primitive types, as enum members or their values
+            sizes: np.ndarray
+                The (N, 3) sizes of the shapes (bounding box dimensions)
+            poses: np.ndarray
+                The (N, 7) poses (position and xyzw quaternion), or (N, 3)
+                positions, in the world frame
+            colors: Optional[np.ndarray]
+                The (N, 3) RGB colors, in [0, 1]
+            masses: Optional[np.ndarray]
+                The (N,) masses
+            dynamic: Union[bool, np.ndarray]
+                Whether each shape is dynamically simulated
+            respondable: Union[bool, np.ndarray]
+                Whether each shape collides with other respondable shapes
+
+        Returns
+        -------
+            ObjectGroup
+                The group of new shapes
+        """
+        types = np.array(
+            [t.value if isinstance(t, PrimitiveShape) else t for t in types],
+            dtype=np.int64,
+        )
+        n = len(types)
+        sizes = _broadcast(sizes, n, 3)
+        poses = np.asarray(poses, dtype=np.float64)
+        if poses.shape[-1] == 3:
+            orientations = np.zeros((n, 4))
+            orientations[:, 3] = 1.0
+            poses = np.hstack([_broadcast(poses, n, 3), orientations])
+        poses = _broadcast(poses, n, 7)
+        colors = np.zeros(0) if colors is None else _broadcast(colors, n, 3)
+        masses = np.zeros(0) if masses is None else _broadcast(masses, n, 1)
+        flags = np.broadcast_to(dynamic, n).astype(np.int64) | (
+            np.broadcast_to(respondable, n).astype(np.int64) << 1
+        )
+        handles = bridge.call(
+            "pyrepExt.createShapes",
+            (types, sizes, poses, colors, masses, flags),
+            (("ndarray",) * 6, (None,)),
+        )
+        return ObjectGroup(handles or [], cls)
+
+
+def _broadcast(values, n: int, width: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64).reshape(-1, width)
+    return np.broadcast_to(values, (n, width))
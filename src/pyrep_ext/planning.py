@@ -0,0 +1,247 @@
+"""Motion planning over simOMPL
+
+A `MotionPlanner` creates the OMPL task and state space of a robot once, on
+the Lua side, where they stay cached for the lifetime of the simulator (see
+`pyrepExt.omplCreate`), and reuses them for every request::
+
+    planner = MotionPlanner(arm_joints, collision_pairs=[arm, sim.handle_all])
+    path = planner.plan(goal, ConfigurationPathAlgorithms.RRTConnect)
+
+Requests can also be planned without blocking: `plan_async` returns at once,
+and planning proceeds by slices in the sensing phase of each simulation step,
+so the control loop keeps running::
+
+    request = planner.plan_async(goal, time_budget=2.0, slice_time=0.005)
+    while not request.done:
+        pr.step()
+    path = request.result()
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from pyrep_ext.const import ConfigurationPathAlgorithms
+from pyrep_ext.core import bridge
+from pyrep_ext.core.errors import ConfigurationPathError
+from pyrep_ext.objects.group import ObjectGroup
+from pyrep_ext.objects.joint import Joint
+
+PLANNING = "planning"
+SOLVED = "solved"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# The current request of each OMPL task, by key. Planners of the same robot
+# share the task, and so its request
+_requests: Dict[str, PlanRequest] = {}
+
+
+def _algorithm_name(algorithm: Union[ConfigurationPathAlgorithms, str]) -> str:
+    return getattr(algorithm, "value", algorithm)
+
+
+class PlanRequest:
+    """A motion planning request, see `MotionPlanner.plan_async`
+
+    Its state is one of "planning", "solved", "failed" or "cancelled". A
+    request is cancelled when the next one of its planner starts, or of any
+    planner of the same robot.
+    """
+
+    def __init__(
+        self,
+        planner: MotionPlanner,
+        state: str,
+        simplify_time: float,
+        states: int,
+    ):
+        self._planner = planner
+        self._state = state
+        self._simplify_time = simplify_time
+        self._states = states
+        self._path: Optional[np.ndarray] = None
+
+    @property
+    def state(self) -> str:
+        """The state of the request, updated from the simulator if planning"""
+        if self._state == PLANNING:
+            self._state = self._call("pyrepExt.omplState")
+        return self._state
+
+    @property
+    def done(self) -> bool:
+        return self.state != PLANNING
+
+    def advance(self, dt: float = 0.0) -> str:
+        """Plans for `dt` seconds (a slice if 0), e.g. while not stepping
+
+        Returns the new state.
+        """
+        if self._state == PLANNING:
+            self._state = self._call("pyrepExt.omplAdvance", dt or -1.0)
+        return self._state
+
+    def wait(self) -> str:
+        """Plans until the request is done, returning its state"""
+        while self.advance() == PLANNING:
+            pass
+        return self._state
+
+    def cancel(self) -> None:
+        if self._state == PLANNING:
+            self._call("pyrepExt.omplCancel")
+            self._state = CANCELLED
+
+    def result(self) -> np.ndarray:
+        """Returns the (T, dof) path, waiting for the request to be done
+
+        Raises a `ConfigurationPathError` if no path was found.
+        """
+        if self._path is None:
+            state = self.wait()
+            if state != SOLVED:
+                raise ConfigurationPathError(f"Could not find a path: {state}")
+            path = self._call(
+                "pyrepExt.omplPath",
+                float(self._simplify_time),
+                int(self._states),
+                hints=(("string", "float", "int"), ("ndarray",)),
+            )
+            self._path = path.reshape(-1, self._planner.dof)
+        return self._path
+
+    def _call(self, func: str, *args, hints=None):
+        if _requests.get(self._planner.key) is not self:
+            raise ConfigurationPathError("Request cancelled by a newer one")
+        if hints is None:
+            hints = (("string",) + ("float",) * len(args), ("string",))
+        return bridge.call(func, (self._planner.key,) + args, hints)
+
+
+class MotionPlanner:
+    """Plans collision-free paths in the configuration space of a robot
+
+    :param joints: The joints of the robot, one dimension each.
+    :param collision_pairs: A flat list of entity handles (objects or
+        collections) checked for collisions pairwise, e.g.
+        `[robot_collection, sim.handle_all]`. No collision checking if None.
+    """
+
+    def __init__(
+        self,
+        joints: Sequence[Joint],
+        collision_pairs: Optional[Sequence[int]] = None,
+    ):
+        self._joints = ObjectGroup([j.get_handle() for j in joints], Joint)
+        pairs = np.asarray(collision_pairs or [], dtype=np.int64).reshape(-1)
+        if len(pairs) % 2:
+            raise ValueError("collision_pairs needs an even number of handles")
+        self._key = ",".join(map(str, self._joints.handles))
+        if len(pairs):
+            self._key += ":" + ",".join(map(str, pairs))
+        bridge.call(
+            "pyrepExt.omplCreate",
+            (self._key, self._joints.handles, pairs),
+            (("string", "ndarray", "ndarray"), ("string",)),
+        )
+
+    @property
+    def key(self) -> str:
+        """The key of the robot's OMPL task on the Lua side"""
+        return self._key
+
+    @property
+    def joints(self) -> ObjectGroup:
+        return self._joints
+
+    @property
+    def dof(self) -> int:
+        return len(self._joints)
+
+    def plan_async(
+        self,
+        goal: np.ndarray,
+        algorithm: Union[
+            ConfigurationPathAlgorithms, str
+        ] = ConfigurationPathAlgorithms.RRTConnect,
+        start: Optional[np.ndarray] = None,
+        time_budget: float = 5.0,
+        slice_time: float = 0.01,
+        simplify_time: float = 0.1,
+        states: int = 0,
+    ) -> PlanRequest:
+        """Starts planning a path, without waiting for it
+
+        Planning runs for `slice_time` seconds in the sensing phase of each
+        simulation step, or when the request is advanced, until a path is
+        found or `time_budget` seconds were spent. Any request in progress is
+        cancelled, including those of other planners of the same robot, as
+        they share the OMPL task.
+
+        :param goal: The (dof,) goal configuration.
+        :param algorithm: The OMPL planner.
+        :param start: The (dof,) start configuration, the current one if
+            None.
+        :param time_budget: The maximum planning time, in seconds.
+        :param slice_time: The planning time per step, in seconds. With 0,
+            planning completes before returning.
+        :param simplify_time: The time spent simplifying the path, if > 0.
+        :param states: The number of states the path is interpolated to, if
+            > 0.
+        """
+        goal = np.asarray(goal, dtype=np.float64).reshape(self.dof)
+        start = (
+            np.empty(0)
+            if start is None
+            else np.asarray(start, dtype=np.float64).reshape(self.dof)
+        )
+        current = _requests.get(self._key)
+        if current is not None:
+            current.cancel()
+        state = bridge.call(
+            "pyrepExt.omplStart",
+            (
+                self._key,
+                _algorithm_name(algorithm),
+                start,
+                goal,
+                float(time_budget),
+                float(slice_time),
+            ),
+            (
+                ("string", "string", "ndarray", "ndarray", "float", "float"),
+                ("string",),
+            ),
+        )
+        request = PlanRequest(self, state, simplify_time, states)
+        _requests[self._key] = request
+        return request
+
+    def plan(
+        self,
+        goal: np.ndarray,
+        algorithm: Union[
+            ConfigurationPathAlgorithms, str
+        ] = ConfigurationPathAlgorithms.RRTConnect,
+        start: Optional[np.ndarray] = None,
+        time_budget: float = 5.0,
+        simplify_time: float = 0.1,
+        states: int = 0,
+    ) -> np.ndarray:
+        """Plans a path, see `plan_async`, returning it as a (T, dof) array
+
+        Raises a `ConfigurationPathError` if no path was found.
+        """
+        request = self.plan_async(
+            goal,
+            algorithm,
+            start,
+            time_budget,
+            slice_time=0.0,
+            simplify_time=simplify_time,
+            states=states,
+        )
+        return request.result()
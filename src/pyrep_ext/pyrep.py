@@ -3,25 +3,49 @@ import sys
 import threading
 import time
 import warnings
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
 
+from pyrep_ext.channels import DataChannel
 from pyrep_ext.const import Verbosity
-from pyrep_ext.core import utils
+from pyrep_ext.core import assets, utils
 from pyrep_ext.core.errors import PyRepError
+from pyrep_ext.core.hooks import HookRegistry
+from pyrep_ext.core.pacing import Pacer, PacingStats
 from pyrep_ext.core.sim import SimBackend
-from pyrep_ext.core.sim_const import (
-    sim_floatparam_simulation_time_step,
-    sim_handle_scene,
-)
+from pyrep_ext.objects import shape
+
+
+@dataclass
+class UIStats:
+    """Time spent holding the step lock by the responsive UI thread and by
+    the simulation thread, see `PyRep.launch(responsive_ui=True)`"""
+
+    frames: int = 0
+    skipped: int = 0  # UI updates skipped because the sim thread was waiting
+    ui_lock_time: float = 0.0
+    sim_lock_time: float = 0.0
+
+    @property
+    def ui_share(self) -> float:
+        """Fraction of the lock time used by the UI"""
+        total = self.ui_lock_time + self.sim_lock_time
+        return self.ui_lock_time / total if total > 0 else 0.0
 
 
 class PyRep(object):
     def __init__(self):
         self.running = False
         self._ui_thread = None
+        self._responsive_ui_thread = None
+        self._ui_fps = 30.0
+        self._ui_stats: Optional[UIStats] = None
+        self._sim_waiting = False
+        self._pacer: Optional[Pacer] = None
+        self._models: Optional[assets.ModelCache] = None
         self._handles_to_objects = {}
         self._step_lock = utils.step_lock
         self._sim_api = None  # check later
@@ -39,12 +63,28 @@ class PyRep(object):
             )
 
     def _run_responsive_ui_thread(self) -> None:
-        while True:
+        stats = self._ui_stats
+        period = 1.0 / self._ui_fps
+        next_frame = time.perf_counter()
+        while not self._shutting_down:
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if self._sim_waiting:
+                # Let the simulation thread go first, and try again shortly
+                stats.skipped += 1
+                next_frame = time.perf_counter() + period / 10
+                continue
             with utils.step_lock:
                 if self._shutting_down or self._sim_backend.simGetExitRequest():
                     break
+                start = time.perf_counter()
                 self._sim_backend.simLoop()
-            time.sleep(0.01)
+                end = time.perf_counter()
+            stats.frames += 1
+            stats.ui_lock_time += end - start
+            # Keep the frame rate, without bursts after a long wait
+            next_frame = max(next_frame + period, end)
         # If the exit request was from the UI, then call shutdown, otherwise
         # shutdown caused this thread to terminate.
         if not self._shutting_down:
@@ -57,6 +97,7 @@ class PyRep(object):
         responsive_ui: bool = False,
         blocking: bool = False,
         verbosity: Verbosity = Verbosity.NONE,
+        ui_fps: float = 30.0,
     ) -> None:
         """Launches CoppeliaSim.
 
@@ -66,13 +107,14 @@ class PyRep(object):
         :param scene_file: The scene file to load. Empty string for empty scene.
         :param headless: Run CoppeliaSim in simulation mode.
         :param responsive_ui: If True, then a separate thread will be created to
-            asynchronously step the UI of CoppeliaSim. Note, that will reduce
-            the responsiveness of the simulation thread.
+            asynchronously step the UI of CoppeliaSim. UI updates yield to
+            the simulation thread, see `ui_stats`.
         :param blocking: Causes CoppeliaSim to launch as if running the default
             c++ client application. This is causes the function to block.
             For most users, this will be set to False.
         :param verbosity: The verbosity level for CoppeliaSim.
             Usually Verbosity.NONE or Verbosity.LOAD_INFOS.
+        :param ui_fps: Target frame rate of the responsive UI thread.
         """
         abs_scene_file: str = ""
         scene_file_valid: bool = False
@@ -93,14 +135,18 @@ class PyRep(object):
         self._sim_api = self._sim_backend.simInitialize(
             self._coppeliasim_root, verbosity.value
         )
+        shape.scene_changed()
         if scene_file_valid:
-            self._sim_api.loadScene(abs_scene_file)
+            assets.load_scene(abs_scene_file)
 
         if blocking:
             while not self._sim_backend.simGetExitRequest():
                 self._sim_backend.simLoop(True)
             self.shutdown()
         elif responsive_ui:
+            self._ui_fps = ui_fps
+            self._ui_stats = UIStats()
+            self._shutting_down = False
             self._responsive_ui_thread = threading.Thread(
                 target=self._run_responsive_ui_thread
             )
@@ -122,7 +168,14 @@ class PyRep(object):
                 "CoppeliaSim has not been launched. Call launch first."
             )
         if self._ui_thread is not None:
-            # self._shutting_down = True
+            self._shutting_down = True
+            ui_thread = self._responsive_ui_thread
+            if (
+                ui_thread is not None
+                and ui_thread is not threading.current_thread()
+            ):
+                ui_thread.join()
+            self._responsive_ui_thread = None
             self.stop()
             self.step_ui()
             self._sim_backend.simDeinitialize()
@@ -136,6 +189,10 @@ class PyRep(object):
             # # TODO: A small sleep stops this for now.
             # time.sleep(0.1)
         self._ui_thread = None
+        self._ui_stats = None
+        self._sim_waiting = False
+        self._models = None
+        shape.scene_changed()
         # self._shutting_down = False
 
     def start(self) -> None:
@@ -147,6 +204,8 @@ class PyRep(object):
         if not self.running:
             self._sim_backend.simStartSimulation()
             self.running = True
+            if self._pacer is not None:
+                self._pacer.reset()
 
     def stop(self) -> None:
         """Stops the physics simulation if it is running."""
@@ -164,8 +223,24 @@ class PyRep(object):
         If the physics simulation is not running, then this will only update
         the UI.
         """
+        if self._pacer is not None:
+            self._pacer.wait()
+        if self._ui_stats is None:
+            with self._step_lock:
+                self._sim_backend.simStep()
+            return
+        # Tell the responsive UI thread to skip frames until we got the lock
+        self._sim_waiting = True
         with self._step_lock:
+            self._sim_waiting = False
+            start = time.perf_counter()
             self._sim_backend.simStep()
+            self._ui_stats.sim_lock_time += time.perf_counter() - start
+
+    @property
+    def ui_stats(self) -> Optional[UIStats]:
+        """Lock usage of the responsive UI thread, if launched with one"""
+        return self._ui_stats
 
     def step_ui(self) -> None:
         """Update the UI.
@@ -177,10 +252,46 @@ class PyRep(object):
         with self._step_lock:
             self._sim_backend.simLoop()
 
+    @property
+    def hooks(self) -> HookRegistry:
+        """Python callbacks run inside each simulation step
+
+        See `pyrep_ext.core.hooks` for details.
+        """
+        if self._ui_thread is None:
+            raise PyRepError(
+                "CoppeliaSim has not been launched. Call launch first."
+            )
+        return self._sim_backend.hooks
+
+    def set_realtime_pacing(
+        self, enabled: bool = True, policy: str = "catch_up", **kwargs
+    ) -> None:
+        """Paces `step` at one simulation timestep of wall-clock time
+
+        Unlike `set_realtime_sim`, this doesn't depend on the UI loop: each
+        call to `step` waits for its slot with a sleep/spin hybrid (see
+        `pyrep_ext.core.pacing`). When disabled, `step` isn't slowed down.
+
+        :param enabled: Whether to pace the steps.
+        :param policy: After an overrun, "catch_up" runs the next steps back
+            to back until on schedule, "skip" drops the missed slots.
+        :param kwargs: Other arguments of `Pacer`, e.g. `spin`.
+        """
+        if not enabled:
+            self._pacer = None
+            return
+        self._pacer = Pacer(self.get_simulation_timestep(), policy, **kwargs)
+
+    @property
+    def pacing_stats(self) -> Optional[PacingStats]:
+        """Steps, overruns and drift of realtime pacing, if enabled"""
+        return None if self._pacer is None else self._pacer.stats
+
     def set_simulation_timestep(self, dt: float) -> None:
         if self._sim_api is not None:
             self._sim_api.setFloatParameter(
-                sim_floatparam_simulation_time_step, dt
+                self._sim_api.floatparam_simulation_time_step, dt
             )
             if not np.allclose(self.get_simulation_timestep(), dt):
                 warnings.warn(
@@ -188,6 +299,8 @@ class PyRep(object):
                     f"simulation timestep to value {dt}. You may need to "
                     'change it to "custom dt" using simulation settings dialog.'
                 )
+            if self._pacer is not None:
+                self._pacer.period = self.get_simulation_timestep()
 
     def get_simulation_timestep(self) -> float:
         if self._sim_api is not None:
@@ -197,9 +310,41 @@ class PyRep(object):
     def set_realtime_sim(self, realtime: bool = True) -> None:
         if self._sim_api is not None:
             self._sim_api.setBoolProperty(
-                sim_handle_scene, "realtimeSimulation", realtime
+                self._sim_api.handle_scene, "realtimeSimulation", realtime
             )
 
-    def import_model(self, filepath: str) -> None:
-        if self._sim_api is not None:
-            _ = self._sim_api.loadModel(filepath)
+    def import_model(self, filepath: str, cache: bool = False) -> int:
+        """Loads a model into the scene, returning the handle of its root
+
+        :param filepath: The model file (.ttm).
+        :param cache: If True, the model is loaded once and further imports
+            copy it in the simulator, see `models`.
+        """
+        if self._sim_api is None:
+            return -1
+        if cache:
+            return self.models.instantiate(filepath)[0]
+        return assets.load_model(filepath)
+
+    def channel(self, name: str, handle: Optional[int] = None) -> DataChannel:
+        """Returns a typed data channel, see `pyrep_ext.channels`
+
+        :param name: The name of the channel.
+        :param handle: The object the data is attached to, the scene if None.
+        """
+        if self._sim_api is None:
+            raise PyRepError(
+                "CoppeliaSim has not been launched. Call launch first."
+            )
+        return DataChannel(name, handle)
+
+    @property
+    def models(self) -> assets.ModelCache:
+        """Cache of the models imported with `import_model(cache=True)`"""
+        if self._sim_api is None:
+            raise PyRepError(
+                "CoppeliaSim has not been launched. Call launch first."
+            )
+        if self._models is None:
+            self._models = assets.ModelCache(self._sim_api)
+        return self._models
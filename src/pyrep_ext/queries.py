@@ -0,0 +1,78 @@
+"""Batched collision and distance queries between sets of objects
+
+Checking every pair of two sets with `sim.checkCollision` or
+`sim.checkDistance` costs a call to the simulator per pair. These queries
+check all the pairs in a single call, looping on the Lua side (see
+`pyrepExt.checkCollisions`)::
+
+    colliding = check_collisions(grippers, obstacles)  # (Na, Nb) bool
+    distances, points_a, points_b = min_distances(grippers, obstacles)
+
+Sets are object groups, sequences of objects or arrays of handles. Pairs of
+an object with itself are not checked.
+"""
+
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from pyrep_ext.core import bridge
+from pyrep_ext.objects.group import ObjectGroup, handles_of
+from pyrep_ext.objects.object import Object
+
+ObjectSet = Union[ObjectGroup, Sequence[Object], Sequence[int], np.ndarray]
+
+
+def check_collisions(
+    group_a: ObjectSet, group_b: ObjectSet, early_exit: bool = False
+) -> np.ndarray:
+    """Checks the collisions between every object of a set and of another
+
+    :param group_a: The Na objects of the first set.
+    :param group_b: The Nb objects of the second set.
+    :param early_exit: Whether to stop at the first collision, e.g. to only
+        know whether any pair collides. Pairs after it are then False.
+    :return: The (Na, Nb) collision matrix.
+    """
+    a, b = handles_of(group_a), handles_of(group_b)
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=bool)
+    result = bridge.call(
+        "pyrepExt.checkCollisions",
+        (a, b, early_exit),
+        (("ndarray", "ndarray", "bool"), ("ndarray",)),
+    )
+    return result.reshape(len(a), len(b)) != 0
+
+
+def min_distances(
+    group_a: ObjectSet,
+    group_b: ObjectSet,
+    threshold: float = 0.0,
+    early_exit: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Measures the minimum distances between the objects of two sets
+
+    :param group_a: The Na objects of the first set.
+    :param group_b: The Nb objects of the second set.
+    :param threshold: If > 0, pairs further apart are not measured, and
+        their distance is inf.
+    :param early_exit: Whether to stop at the first pair within `threshold`
+        (if > 0). The pairs after it are NaN.
+    :return: The (Na, Nb) distances, and the (Na, Nb, 3) closest points on
+        the objects of each set (NaN for pairs not measured).
+    """
+    a, b = handles_of(group_a), handles_of(group_b)
+    if len(a) == 0 or len(b) == 0:
+        return (
+            np.empty((len(a), len(b))),
+            np.empty((len(a), len(b), 3)),
+            np.empty((len(a), len(b), 3)),
+        )
+    result = bridge.call(
+        "pyrepExt.checkDistances",
+        (a, b, float(threshold), early_exit),
+        (("ndarray", "ndarray", "float", "bool"), ("ndarray",)),
+    )
+    result = result.reshape(len(a), len(b), 7)
+    return result[..., 6], result[..., :3], result[..., 3:6]
@@ -0,0 +1,242 @@
+"""Domain randomization over groups of objects
+
+Randomizations are declared as specs over `ObjectGroup`s. At each `apply`,
+the values for all the objects are sampled at once with NumPy, and all the
+changes are sent to the simulator in a single batched call::
+
+    clutter = Shape.create_many(...)
+    randomizer = Randomizer(
+        [
+            PoseNoise(clutter, position=[0.05, 0.05, 0.0], rotation=[0, 0, np.pi]),
+            Color(clutter),
+            Mass(clutter, low=0.1, high=0.5),
+            Friction(clutter, low=0.3, high=1.0),
+        ],
+        seed=0,
+    )
+
+    def reset():
+        randomizer.apply()
+        ...
+"""
+
+from __future__ import annotations
+
+import abc
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from pyrep_ext.const import TextureMappingMode
+from pyrep_ext.core.sim import SimBackend
+from pyrep_ext.objects.group import CallSpec, ObjectGroup, call_all
+from pyrep_ext.transforms import euler_to_quaternion, quaternion_multiply
+
+ArrayLike = Any  # a scalar, a sequence or an array, broadcast as needed
+
+
+class Spec(abc.ABC):
+    """A randomization of some property over a group of objects"""
+
+    group: ObjectGroup
+
+    @abc.abstractmethod
+    def sample(self, rng: np.random.Generator) -> np.ndarray:
+        """Draws the values of the property, one row per object"""
+
+    @abc.abstractmethod
+    def calls(self, values: np.ndarray) -> List[CallSpec]:
+        """The API calls setting the sampled values"""
+
+    def prepare(self) -> None:
+        """Called before the first sample, e.g. to read nominal values"""
+
+
+def _uniform(rng: np.random.Generator, low, high, shape) -> np.ndarray:
+    return rng.uniform(
+        np.broadcast_to(low, shape), np.broadcast_to(high, shape), shape
+    )
+
+
+@dataclass
+class PoseNoise(Spec):
+    """Uniform noise around the nominal poses of the objects
+
+    The nominal poses are read from the scene before the first sample, unless
+    given. Rotations are XYZ Euler angles, applied in the object frame.
+    """
+
+    group: ObjectGroup
+    position: ArrayLike = 0.0  # half-range of the position noise, per axis
+    rotation: ArrayLike = 0.0  # half-range of the angle noise, per axis
+    nominal: Optional[np.ndarray] = None  # (N, 7) poses
+
+    def prepare(self) -> None:
+        if self.nominal is None:
+            self.nominal = self.group.get_poses()
+
+    def sample(self, rng: np.random.Generator) -> np.ndarray:
+        n = len(self.group)
+        position = np.broadcast_to(self.position, 3)
+        rotation = np.broadcast_to(self.rotation, 3)
+        poses = np.array(self.nominal, dtype=np.float64)
+        poses[:, :3] += _uniform(rng, -position, position, (n, 3))
+        noise = euler_to_quaternion(_uniform(rng, -rotation, rotation, (n, 3)))
+        poses[:, 3:] = quaternion_multiply(poses[:, 3:], noise)
+        return poses
+
+    def calls(self, values: np.ndarray) -> List[CallSpec]:
+        return [
+            ("sim.setObjectPose", [int(h), pose, -1])
+            for h, pose in zip(self.group.handles, values.tolist())
+        ]
+
+
+@dataclass
+class Color(Spec):
+    """Uniformly sampled RGB colors of shapes"""
+
+    group: ObjectGroup
+    low: ArrayLike = 0.0
+    high: ArrayLike = 1.0
+    color_name: Optional[str] = None  # None for all the components
+
+    def sample(self, rng: np.random.Generator) -> np.ndarray:
+        return _uniform(rng, self.low, self.high, (len(self.group), 3))
+
+    def calls(self, values: np.ndarray) -> List[CallSpec]:
+        component = SimBackend().sim_api.colorcomponent_ambient_diffuse
+        return [
+            ("sim.setShapeColor", [int(h), self.color_name, component, rgb])
+            for h, rgb in zip(self.group.handles, values.tolist())
+        ]
+
+
+@dataclass
+class Texture(Spec):
+    """Textures picked among `texture_ids`, with uniform UV scaling"""
+
+    group: ObjectGroup
+    texture_ids: Sequence[int]
+    mapping_mode: TextureMappingMode = TextureMappingMode.PLANE
+    scaling_low: ArrayLike = 1.0
+    scaling_high: ArrayLike = 1.0
+    options: int = 0  # see sim.setShapeTexture
+
+    def sample(self, rng: np.random.Generator) -> np.ndarray:
+        n = len(self.group)
+        values = np.empty((n, 3))
+        values[:, 0] = rng.choice(np.asarray(self.texture_ids), n)
+        values[:, 1:] = _uniform(
+            rng, self.scaling_low, self.scaling_high, (n, 2)
+        )
+        return values
+
+    def calls(self, values: np.ndarray) -> List[CallSpec]:
+        mode = self.mapping_mode.value
+        return [
+            (
+                "sim.setShapeTexture",
+                [int(h), int(texture), mode, self.options, [u, v]],
+            )
+            for h, (texture, u, v) in zip(self.group.handles, values.tolist())
+        ]
+
+
+@dataclass
+class Mass(Spec):
+    """Uniformly sampled masses of shapes"""
+
+    group: ObjectGroup
+    low: ArrayLike = 1.0
+    high: ArrayLike = 1.0
+
+    def sample(self, rng: np.random.Generator) -> np.ndarray:
+        return _uniform(rng, self.low, self.high, (len(self.group),))
+
+    def calls(self, values: np.ndarray) -> List[CallSpec]:
+        return [
+            ("sim.setShapeMass", [int(h), mass])
+            for h, mass in zip(self.group.handles, values.tolist())
+        ]
+
+
+@dataclass
+class Friction(Spec):
+    """Uniformly sampled friction of shapes, for a given physics engine"""
+
+    group: ObjectGroup
+    low: ArrayLike = 1.0
+    high: ArrayLike = 1.0
+    param: str = "bullet_body_friction"  # e.g. "ode_body_friction"
+
+    def sample(self, rng: np.random.Generator) -> np.ndarray:
+        return _uniform(rng, self.low, self.high, (len(self.group),))
+
+    def calls(self, values: np.ndarray) -> List[CallSpec]:
+        param = getattr(SimBackend().sim_api, self.param)
+        return [
+            ("sim.setEngineFloatParam", [param, int(h), friction])
+            for h, friction in zip(self.group.handles, values.tolist())
+        ]
+
+
+@dataclass
+class LightIntensity(Spec):
+    """Uniformly sampled intensity of lights, scaling their `color`"""
+
+    group: ObjectGroup
+    low: ArrayLike = 1.0
+    high: ArrayLike = 1.0
+    color: ArrayLike = field(default_factory=lambda: [1.0, 1.0, 1.0])
+
+    def sample(self, rng: np.random.Generator) -> np.ndarray:
+        intensity = _uniform(rng, self.low, self.high, (len(self.group), 1))
+        return intensity * np.broadcast_to(self.color, 3)
+
+    def calls(self, values: np.ndarray) -> List[CallSpec]:
+        return [
+            ("sim.setLightParameters", [int(h), 1, None, rgb, rgb])
+            for h, rgb in zip(self.group.handles, values.tolist())
+        ]
+
+
+class Randomizer:
+    """Samples and applies a set of randomization specs
+
+    :param specs: The randomizations, applied in order.
+    :param seed: Seed of the random generator, for reproducible samples.
+    """
+
+    def __init__(self, specs: Sequence[Spec], seed: Optional[int] = None):
+        self.specs = list(specs)
+        self.rng = np.random.default_rng(seed)
+        self._prepared = False
+
+    def seed(self, seed: Optional[int]) -> None:
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self) -> List[np.ndarray]:
+        """Draws the values of every spec, without applying them"""
+        if not self._prepared:
+            for spec in self.specs:
+                spec.prepare()
+            self._prepared = True
+        return [spec.sample(self.rng) for spec in self.specs]
+
+    def apply(
+        self, values: Optional[List[np.ndarray]] = None
+    ) -> List[np.ndarray]:
+        """Applies sampled values (new ones by default) in a single call
+
+        Returns the applied values.
+        """
+        if values is None:
+            values = self.sample()
+        calls: List[CallSpec] = []
+        for spec, spec_values in zip(self.specs, values):
+            calls.extend(spec.calls(spec_values))
+        if calls:
+            call_all(calls)
+        return values
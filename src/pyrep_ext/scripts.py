@@ -0,0 +1,151 @@
+"""Calls to functions of the scripts of a scene
+
+A `ScriptFunction` resolves its script once, and builds the type hints and
+argument conversions of its calls once, so that each call is a single push
+of its arguments (arrays as one bulk table each) into the script, without
+going through the sandbox::
+
+    read_tactile = ScriptFunction(
+        "readTactile", "/hand/script", args=("ndarray", "float"),
+        returns=("ndarray",),
+    )
+    pressures = read_tactile(cell_handles, 0.01)  # an ndarray
+
+Repeated calls can also be queued, and made in a single round trip::
+
+    for cells in fingers:
+        read_tactile.queue(cells, 0.01)
+    per_finger = read_tactile.flush()
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pyrep_ext.core import bridge
+from pyrep_ext.core.sim import SimBackend
+
+
+def _to_array(value: Any) -> np.ndarray:
+    # Integer and boolean arrays keep their type (e.g. handles), see
+    # stack.write_array
+    value = np.asarray(value)
+    return value if value.dtype.kind in "iub" else value.astype(np.float64)
+
+
+def _from_array(value: Any) -> np.ndarray:
+    # Results of queued calls arrive as lists, or dicts when empty
+    if isinstance(value, np.ndarray):
+        return value
+    return np.array(list(value) if value else [], dtype=np.float64)
+
+
+_ENCODERS: Dict[str, Callable] = {
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "string": str,
+    "buffer": bytes,
+    "ndarray": _to_array,
+}
+_DECODERS: Dict[str, Callable] = {"ndarray": _from_array}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class ScriptFunction:
+    """A function of a script in the scene
+
+    :param function: The function name, e.g. "readTactile". With a script
+        path after an "@", e.g. "readTactile@/hand/script", `script` is
+        optional.
+    :param script: The script, as a handle or a path, e.g. "/hand/script".
+    :param args: The type hints of the arguments ("int", "float", "bool",
+        "string", "buffer", "ndarray", "list" or "dict"). Untyped arguments
+        are marshalled by their Python type if None.
+    :param returns: The type hints of the return values, e.g. ("ndarray",).
+    """
+
+    def __init__(
+        self,
+        function: str,
+        script: Optional[Union[int, str]] = None,
+        args: Optional[Sequence[str]] = None,
+        returns: Optional[Sequence[str]] = None,
+    ):
+        if "@" in function:
+            function, script = function.split("@", 1)
+        if script is None:
+            raise ValueError(f"No script given for {function}")
+        if isinstance(script, str):
+            script = SimBackend().sim_api.getObject(script)
+        self._function = function
+        self._script = int(script)
+        self._args = None if args is None else tuple(args)
+        self._returns = None if returns is None else tuple(returns)
+        self._hints = (self._args or (), self._returns or ())
+        self._encoders: Optional[List[Callable]] = None
+        if self._args is not None:
+            self._encoders = [_ENCODERS.get(h, _identity) for h in self._args]
+        self._decoders = [_DECODERS.get(h, _identity) for h in returns or ()]
+        self._queue: List[Sequence[Any]] = []
+
+    @property
+    def function(self) -> str:
+        return self._function
+
+    @property
+    def script(self) -> int:
+        """The handle of the script"""
+        return self._script
+
+    @property
+    def pending(self) -> int:
+        """The number of queued calls"""
+        return len(self._queue)
+
+    def _encode(self, args: Sequence[Any]) -> Tuple[Any, ...]:
+        if self._encoders is None:
+            return tuple(args)
+        if len(args) != len(self._encoders):
+            raise TypeError(
+                f"{self._function} takes {len(self._encoders)} arguments, "
+                f"got {len(args)}"
+            )
+        return tuple(f(a) for f, a in zip(self._encoders, args))
+
+    def __call__(self, *args: Any) -> Any:
+        """Calls the function, returning its result (a tuple if several
+        values, None if none)"""
+        return bridge.call(
+            self._function, self._encode(args), self._hints, self._script
+        )
+
+    def queue(self, *args: Any) -> None:
+        """Queues a call, made by the next `flush`"""
+        self._queue.append(self._encode(args))
+
+    def flush(self) -> List[Any]:
+        """Makes the queued calls in a single round trip, returning their
+        results"""
+        calls, self._queue = self._queue, []
+        if not calls:
+            return []
+        nargs = len(calls[0])
+        if any(len(c) != nargs for c in calls):
+            raise TypeError("queued calls with different numbers of arguments")
+        results = bridge.call(
+            "pyrepExt.callScriptMany",
+            (self._script, self._function, [list(c) for c in calls], nargs),
+            (("int", "string", "list", "int"), ("list",)),
+        )
+        return [self._decode(r) for r in results]
+
+    def _decode(self, result: Any) -> Any:
+        if len(self._decoders) == 1:
+            return self._decoders[0](result)
+        if len(self._decoders) > 1:
+            return tuple(f(r) for f, r in zip(self._decoders, result))
+        return result
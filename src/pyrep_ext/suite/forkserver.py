@@ -0,0 +1,326 @@
+"""Fork-server (zygote) for environment workers
+
+Launching an environment in a fresh process pays for the interpreter start,
+the imports and reading the scene and model files, on top of the simulator
+launch itself. A `ForkServer` does that work once, in a zygote process, and
+forks a worker from it for each environment. Workers then only launch the
+simulator, from the preloaded scene::
+
+    with ForkServer(PendulumEnv) as server:
+        workers = [server.spawn(headless=True) for _ in range(8)]
+        obs = [worker.reset() for worker in workers]
+        ...
+        for worker in workers:
+            worker.close()
+
+Requires `os.fork`, i.e. not available on Windows.
+"""
+
+import importlib
+import multiprocessing
+import os
+import secrets
+import signal
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+from pyrep_ext import MODELS_DIR, SCENES_DIR
+from pyrep_ext.const import BASE_SCENE
+from pyrep_ext.core.errors import PyRepError
+
+# Imported by the zygote, so that workers start with them loaded
+DEFAULT_MODULES = (
+    "numpy",
+    "gymnasium.spaces",
+    "pyrep_ext.pyrep",
+    "pyrep_ext.objects.joint",
+    "pyrep_ext.objects.shape",
+    "pyrep_ext.suite.pendulum",
+)
+
+DEFAULT_ASSETS = (SCENES_DIR / BASE_SCENE, MODELS_DIR / "pendulum.ttm")
+
+
+def _warm_up(modules: Sequence[str], assets: Sequence[Union[str, Path]]):
+    from pyrep_ext.core import assets as asset_cache
+
+    for module in modules:
+        importlib.import_module(module)
+    # The parser used for the type hints of API functions
+    python_dir = Path(os.environ.get("COPPELIASIM_ROOT", "")) / "python"
+    if python_dir.is_dir():
+        sys.path.append(str(python_dir))
+        try:
+            importlib.import_module("calltip")
+        except ImportError:
+            pass
+    for path in assets:
+        if os.path.isfile(path):
+            asset_cache.preload(path)
+
+
+def _serve_env(conn: Connection, env_factory: Callable, kwargs) -> None:
+    try:
+        env = env_factory(**kwargs)
+    except Exception as e:
+        conn.send((False, e))
+        return
+    conn.send((True, None))
+    while True:
+        try:
+            method, args = conn.recv()
+        except EOFError:
+            method, args = "close", ()
+        try:
+            conn.send((True, getattr(env, method)(*args)))
+        except Exception as e:
+            conn.send((False, e))
+        if method == "close":
+            return
+
+
+def _zygote(
+    conn: Connection,
+    address: Any,
+    authkey: bytes,
+    modules: Sequence[str],
+    assets: Sequence[Union[str, Path]],
+    initializer: Optional[Callable[[], Any]],
+) -> None:
+    # Finished workers are reaped by the system
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    if initializer is not None:
+        initializer()
+    _warm_up(modules, assets)
+    conn.send(os.getpid())
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        env_factory, kwargs = request
+        pid = os.fork()
+        if pid == 0:
+            # Restores the default, for the worker to wait for its own
+            # children (e.g. subprocess.run)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            conn.close()
+            code = 0
+            try:
+                with Client(address, authkey=authkey) as worker_conn:
+                    worker_conn.send(os.getpid())
+                    _serve_env(worker_conn, env_factory, kwargs)
+            except BaseException:
+                code = 1
+            os._exit(code)
+        conn.send(pid)
+
+
+def _is_running(pid: int) -> bool:
+    # The zygote reaps its children, so no zombie is left behind
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class EnvWorker:
+    """An environment running in a process forked by a `ForkServer`
+
+    Method calls are forwarded to the environment, and exceptions raised
+    there are raised again here.
+    """
+
+    def __init__(self, conn: Connection, pid: int):
+        self._conn = conn
+        self.pid = pid
+
+    def call(self, method: str, *args) -> Any:
+        self._conn.send((method, args))
+        ok, value = self._conn.recv()
+        if not ok:
+            raise value
+        return value
+
+    def reset(self) -> Tuple[Any, dict]:
+        return self.call("reset")
+
+    def step(self, action) -> Tuple[Any, float, bool, bool, dict]:
+        return self.call("step", action)
+
+    def close(self) -> None:
+        if self._conn.closed:
+            return
+        try:
+            self.call("close")
+        finally:
+            self._conn.close()
+
+
+class ForkServer:
+    """Forks environment workers from a warmed up zygote process
+
+    :param env_factory: Creates the environment in the worker, given the
+        keyword arguments of `spawn`. Must be picklable, e.g. a class.
+    :param modules: Modules imported by the zygote.
+    :param assets: Scene and model files read into memory by the zygote, see
+        `pyrep_ext.core.assets`.
+    :param initializer: Called first in the zygote, e.g. to select the
+        simulator library.
+    :param connect_timeout: The time a forked worker has to connect back,
+        in seconds.
+    """
+
+    def __init__(
+        self,
+        env_factory: Optional[Callable] = None,
+        modules: Sequence[str] = DEFAULT_MODULES,
+        assets: Sequence[Union[str, Path]] = DEFAULT_ASSETS,
+        initializer: Optional[Callable[[], Any]] = None,
+        connect_timeout: float = 30.0,
+    ):
+        if not hasattr(os, "fork"):
+            raise PyRepError("ForkServer requires os.fork")
+        if env_factory is None:
+            from pyrep_ext.suite.pendulum import PendulumEnv
+
+            env_factory = PendulumEnv
+        self._env_factory = env_factory
+        self._modules = tuple(modules)
+        self._assets = tuple(str(path) for path in assets)
+        self._initializer = initializer
+        self._connect_timeout = connect_timeout
+        self._authkey = secrets.token_bytes(16)
+        self._listener: Optional[Listener] = None
+        self._conn: Optional[Connection] = None
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._lock = threading.Lock()
+        # Connections of the workers by pid, see `_accept_workers`
+        self._accepted: Dict[int, Connection] = {}
+        self._accepted_cond = threading.Condition()
+        self._acceptor: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the zygote and waits until it is warmed up"""
+        if self._process is not None:
+            raise PyRepError("ForkServer already started")
+        self._listener = Listener(authkey=self._authkey)
+        self._acceptor = threading.Thread(
+            target=self._accept_workers, daemon=True
+        )
+        self._acceptor.start()
+        # A fresh interpreter, as forking a process with threads or a
+        # simulator running is unsafe
+        ctx = multiprocessing.get_context("spawn")
+        conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_zygote,
+            args=(
+                child_conn,
+                self._listener.address,
+                self._authkey,
+                self._modules,
+                self._assets,
+                self._initializer,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = conn
+        try:
+            conn.recv()
+        except EOFError:
+            self.shutdown()
+            raise PyRepError("ForkServer zygote failed to start") from None
+
+    def spawn(self, **kwargs) -> EnvWorker:
+        """Forks a worker and creates its environment with `kwargs`"""
+        if self._conn is None:
+            self.start()
+        with self._lock:
+            try:
+                self._conn.send((self._env_factory, kwargs))
+                pid = self._conn.recv()
+            except (EOFError, OSError) as e:
+                raise PyRepError("ForkServer zygote died") from e
+        conn = self._wait_worker(pid)
+        try:
+            ok, error = conn.recv()
+        except EOFError:
+            conn.close()
+            raise PyRepError(f"ForkServer worker {pid} died") from None
+        if not ok:
+            conn.close()
+            raise error
+        return EnvWorker(conn, pid)
+
+    def _accept_workers(self) -> None:
+        # Runs in a thread, as Listener.accept cannot time out. Workers send
+        # their pid first, None stops the thread (see `shutdown`)
+        while True:
+            try:
+                conn = self._listener.accept()
+                pid = conn.recv()
+            except (OSError, EOFError, multiprocessing.AuthenticationError):
+                continue  # a worker died while connecting
+            if pid is None:
+                conn.close()
+                return
+            with self._accepted_cond:
+                self._accepted[pid] = conn
+                self._accepted_cond.notify_all()
+
+    def _wait_worker(self, pid: int) -> Connection:
+        deadline = time.monotonic() + self._connect_timeout
+        with self._accepted_cond:
+            while pid not in self._accepted:
+                if not _is_running(pid) or time.monotonic() > deadline:
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except OSError:
+                        pass
+                    raise PyRepError(f"ForkServer worker {pid} did not connect")
+                self._accepted_cond.wait(0.05)
+            return self._accepted.pop(pid)
+
+    def shutdown(self) -> None:
+        """Stops the zygote. Workers keep running until closed"""
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            self._process.join()
+            self._process = None
+        if self._acceptor is not None:
+            with Client(self._listener.address, authkey=self._authkey) as conn:
+                conn.send(None)
+            self._acceptor.join()
+            self._acceptor = None
+        with self._accepted_cond:
+            for conn in self._accepted.values():
+                conn.close()
+            self._accepted.clear()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def __enter__(self) -> "ForkServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
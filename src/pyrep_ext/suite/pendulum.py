@@ -1,35 +1,98 @@
-from typing import Any, Dict, Tuple
+from __future__ import annotations
+
+import functools
+from collections import deque
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Optional, Tuple
 
 import numpy as np
-from gymnasium import spaces
 
 from pyrep_ext import MODELS_DIR, SCENES_DIR
 from pyrep_ext.const import BASE_SCENE, JointControlMode, JointMode
+from pyrep_ext.core.executor import SimExecutor
 from pyrep_ext.objects.joint import Joint
 from pyrep_ext.objects.shape import Shape
 from pyrep_ext.pyrep import PyRep
 
+if TYPE_CHECKING:
+    from gymnasium import spaces
+
 SIMULATION_DT = 0.005
 
 
 class PendulumEnv:
+    """Torque-controlled pendulum
+
+    :param pipelined: If True, the simulator runs on its own thread and
+        `step` only waits for the step issued `action_latency` calls ago, so
+        physics and observation gathering overlap with the computation of the
+        next action on the calling thread (the simulator releases the GIL
+        while stepping). The observation returned by `step` is then the one
+        reached `action_latency` steps before the given action is applied.
+    :param action_latency: Number of steps in flight in pipelined mode.
+    """
 
     def __init__(
         self,
         render_mode: str = "human",
         headless: bool = False,
         realtime: bool = False,
+        pipelined: bool = False,
+        action_latency: int = 1,
     ):
+        if action_latency < 0:
+            raise ValueError("action_latency must be non-negative")
+        # gymnasium takes longer to import than the rest of pyrep_ext, so we
+        # defer it until an environment is actually created
+        from gymnasium import spaces
+
         self._render_mode = render_mode
 
         scene_filepath = SCENES_DIR / BASE_SCENE
         model_filepath = MODELS_DIR / "pendulum.ttm"
 
         self._pyrep = PyRep()
+        self._executor = SimExecutor() if pipelined else None
+        self._action_latency = action_latency if pipelined else 0
+        # Observation buffers, written by the simulation thread in turns. Two
+        # more than the steps in flight, so the one returned by `step` stays
+        # untouched until the next call to `step` returns
+        self._buffers = np.zeros((self._action_latency + 2, 3))
+        self._next_buffer = 0
+        self._in_flight: Deque[Future] = deque()
+        self._last_obs = self._buffers[-1]
+
+        # In pipelined mode, the executor thread becomes the simulation thread
+        launch = functools.partial(
+            self._launch,
+            scene_filepath,
+            model_filepath,
+            (self._render_mode == "rgb_array") or headless,
+            realtime,
+        )
+        if self._executor is not None:
+            self._executor.start(init=launch)
+        else:
+            launch()
+
+        self._action_space = spaces.Box(
+            low=-1.0, high=1.0, shape=(1,), dtype=np.float32
+        )
+        self._observation_space = spaces.Box(
+            low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32
+        )
+
+    def _launch(
+        self,
+        scene_filepath,
+        model_filepath,
+        headless: bool,
+        realtime: bool,
+    ) -> None:
         self._pyrep.launch(
             scene_file=str(scene_filepath.resolve()),
             responsive_ui=False,
-            headless=(self._render_mode == "rgb_array") or headless,
+            headless=headless,
         )
         self._pyrep.import_model(str(model_filepath.resolve()))
         self._pyrep.set_realtime_sim(realtime)
@@ -41,12 +104,16 @@ class PendulumEnv:
 
         self._body_mass = Shape("/mass")
 
-        self._action_space = spaces.Box(
-            low=-1.0, high=1.0, shape=(1,), dtype=np.float32
-        )
-        self._observation_space = spaces.Box(
-            low=-np.inf, high=np.inf, shape=(3,), dtype=np.float32
-        )
+    def _run(self, func: Callable, *args) -> Any:
+        """Runs `func` on the simulation thread, waiting for the result"""
+        if self._executor is None:
+            return func(*args)
+        self._wait_in_flight()
+        return self._executor.submit(func, *args).result()
+
+    def _wait_in_flight(self) -> None:
+        while self._in_flight:
+            self._last_obs = self._in_flight.popleft().result()
 
     @property
     def render_mode(self) -> str:
@@ -60,18 +127,33 @@ class PendulumEnv:
     def observation_space(self) -> spaces.Box:
         return self._observation_space
 
+    @property
+    def pipelined(self) -> bool:
+        return self._executor is not None
+
+    @property
+    def action_latency(self) -> int:
+        return self._action_latency
+
     def get_observation(self) -> np.ndarray:
+        return self._run(self._get_observation)
+
+    def _get_observation(self) -> np.ndarray:
         mass_position = self._body_mass.get_position()
         qpos = self._jnt_hinge.get_joint_position()
         qvel = self._jnt_hinge.get_joint_velocity()
         return np.array([qpos, qvel, mass_position[2]], dtype=np.float64)
 
     def reset(self) -> Tuple[np.ndarray, Dict[str, Any]]:
-        self._jnt_hinge.set_joint_position(np.random.uniform(-np.pi, np.pi))
-        self._pyrep.start()
-        obs = self.get_observation()
+        obs = self._run(self._reset, np.random.uniform(-np.pi, np.pi))
+        self._last_obs = obs
         return obs, {}
 
+    def _reset(self, qpos: float) -> np.ndarray:
+        self._jnt_hinge.set_joint_position(qpos)
+        self._pyrep.start()
+        return self._get_observation()
+
     def step(
         self, action: np.ndarray
     ) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
@@ -82,14 +164,51 @@ class PendulumEnv:
                 )
             )
 
+        if self._executor is None:
+            obs = self._step(action.item())
+            return obs, 0.0, False, False, {}
+        self.step_async(action)
+        while len(self._in_flight) > self._action_latency:
+            self._last_obs = self._in_flight.popleft().result()
+        return self._last_obs, 0.0, False, False, {}
+
+    def step_async(self, action: np.ndarray) -> None:
+        """Issues a step with the given action, without waiting for it
+
+        Only available in pipelined mode. The resulting observations are
+        collected by `step` or `step_wait`.
+        """
+        if self._executor is None:
+            raise RuntimeError("step_async requires pipelined=True")
+        out = self._buffers[self._next_buffer]
+        self._next_buffer = (self._next_buffer + 1) % len(self._buffers)
+        future = self._executor.submit(self._step, action.item(), out)
+        self._in_flight.append(future)
+
+    def step_wait(self) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        """Waits for all the steps issued so far, see `step_async`"""
+        self._wait_in_flight()
+        return self._last_obs, 0.0, False, False, {}
+
+    def _step(
+        self, torque: float, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         # Set torque directly to the actuated joint
-        self._jnt_hinge.set_joint_target_force(action.item())  # type: ignore
+        self._jnt_hinge.set_joint_target_force(torque)
         # Take a step in the simulator
         self._pyrep.step()
 
-        obs = self.get_observation()
-        return obs, 0.0, False, False, {}
+        obs = self._get_observation()
+        if out is None:
+            return obs
+        out[:] = obs
+        return out
 
     def close(self) -> None:
+        self._run(self._close)
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _close(self) -> None:
         self._pyrep.stop()
         self._pyrep.shutdown()
@@ -0,0 +1,393 @@
+"""Parallel motion planning in worker processes
+
+One simulator plans one query at a time. A `PlanningPool` saves the current
+scene, launches it headless in several worker processes, each with its own
+`MotionPlanner`, and dispatches queries to whichever worker is idle::
+
+    with PlanningPool(arm_joints, num_workers=8) as pool:
+        paths = pool.plan_all(
+            [(start, goal, ConfigurationPathAlgorithms.RRTConnect)
+             for goal in goals],
+            timeout=2.0,
+        )
+
+`submit` returns a `concurrent.futures.Future` per query. Cancelling the
+future drops the query, or stops it in its worker if it is being planned.
+Queries submitted with the same `group` are alternatives (e.g. the same goal
+with different algorithms, or several grasps of an object): once one of them
+is solved, the others are cancelled.
+"""
+
+import itertools
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from pyrep_ext.const import ConfigurationPathAlgorithms
+from pyrep_ext.core.errors import ConfigurationPathError, PyRepError
+from pyrep_ext.objects.object import Object
+
+Algorithm = Union[ConfigurationPathAlgorithms, str]
+Query = Tuple[Optional[np.ndarray], np.ndarray, Algorithm]
+Entity = Union[Object, str, int]
+
+# sim.getObjectAlias option giving the full path of an object, e.g.
+# "/robot/joint1", which workers resolve with sim.getObject
+_PATH_ALIAS = 1
+
+
+def _object_path(entity: Entity) -> Union[str, int]:
+    if isinstance(entity, Object):
+        return entity._sim_api.getObjectAlias(entity.get_handle(), _PATH_ALIAS)
+    return entity
+
+
+def _resolve(sim_api: Any, entity: Union[str, int]) -> int:
+    return sim_api.getObject(entity) if isinstance(entity, str) else entity
+
+
+def _serve_planner(
+    conn: Connection,
+    scene_file: str,
+    joints: Sequence[str],
+    collision_pairs: Sequence[Union[str, int]],
+    slice_time: float,
+    initializer: Optional[Callable[[], Any]],
+) -> None:
+    try:
+        if initializer is not None:
+            initializer()
+        from pyrep_ext.core.sim import SimBackend
+        from pyrep_ext.objects.joint import Joint
+        from pyrep_ext.planning import PLANNING, SOLVED, MotionPlanner
+        from pyrep_ext.pyrep import PyRep
+
+        pr = PyRep()
+        pr.launch(scene_file, headless=True)
+        sim_api = SimBackend().sim_api
+        planner = MotionPlanner(
+            [Joint(path) for path in joints],
+            [_resolve(sim_api, e) for e in collision_pairs] or None,
+        )
+    except Exception as e:
+        conn.send((False, e))
+        return
+    conn.send((True, None))
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            message = None
+        if message is None:
+            break
+        if message[0] != "plan":
+            continue  # a cancellation arriving after the reply
+        _, qid, start, goal, algorithm, timeout, simplify_time, states = message
+        try:
+            request = planner.plan_async(
+                goal,
+                algorithm,
+                start,
+                time_budget=timeout,
+                slice_time=slice_time,
+                simplify_time=simplify_time,
+                states=states,
+            )
+            # Plans by slices, to handle cancellations in between
+            while request.advance() == PLANNING:
+                if conn.poll() and conn.recv() == ("cancel", qid):
+                    request.cancel()
+            path = request.result() if request.state == SOLVED else None
+            conn.send((qid, request.state, path))
+        except Exception as e:
+            conn.send((qid, "error", e))
+    pr.shutdown()
+
+
+class PlanningPool:
+    """Plans queries in parallel, in worker processes running the scene
+
+    :param joints: The joints of the robot, as objects or paths.
+    :param collision_pairs: Entities checked for collisions pairwise, see
+        `MotionPlanner`, as objects, paths or special handles (e.g.
+        `sim.handle_all`).
+    :param num_workers: The number of worker processes.
+    :param scene_file: The scene the workers run. By default, the current
+        scene is saved to a temporary file.
+    :param slice_time: The planning time between checks for cancellation.
+    :param initializer: Called first in each worker, e.g. to select the
+        simulator library. Must be picklable.
+    """
+
+    def __init__(
+        self,
+        joints: Sequence[Entity],
+        collision_pairs: Optional[Sequence[Entity]] = None,
+        num_workers: Optional[int] = None,
+        scene_file: Optional[Union[str, Path]] = None,
+        slice_time: float = 0.05,
+        initializer: Optional[Callable[[], Any]] = None,
+    ):
+        self._joints = [_object_path(j) for j in joints]
+        self._collision_pairs = [_object_path(e) for e in collision_pairs or []]
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self._scene_file = None if scene_file is None else str(scene_file)
+        self._slice_time = slice_time
+        self._initializer = initializer
+        self._tmp_dir: Optional[str] = None
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        self._conns: List[Connection] = []
+        self._pending: Deque[Tuple[int, Future, tuple]] = deque()
+        self._running: Dict[Connection, Tuple[int, Future]] = {}
+        self._cancelling: set = set()
+        self._groups: Dict[Hashable, List[Future]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup_r, self._wakeup_w = multiprocessing.Pipe(duplex=False)
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+        self._sweep = False  # whether queued queries were cancelled
+
+    def start(self) -> None:
+        """Launches the workers and waits until they are ready"""
+        if self._dispatcher is not None:
+            raise PyRepError("PlanningPool already started")
+        scene_file = self._scene_file
+        if scene_file is None:
+            from pyrep_ext.core.sim import SimBackend
+
+            self._tmp_dir = tempfile.mkdtemp(prefix="pyrep_ext_pool_")
+            scene_file = os.path.join(self._tmp_dir, "scene.ttt")
+            SimBackend().sim_api.saveScene(scene_file)
+        # Fresh interpreters, as forking a process running the simulator is
+        # unsafe
+        ctx = multiprocessing.get_context("spawn")
+        for _ in range(self.num_workers):
+            conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_serve_planner,
+                args=(
+                    child_conn,
+                    scene_file,
+                    self._joints,
+                    self._collision_pairs,
+                    self._slice_time,
+                    self._initializer,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._processes.append(process)
+            self._conns.append(conn)
+        for conn in self._conns:
+            try:
+                ok, error = conn.recv()
+            except EOFError:
+                ok, error = False, PyRepError("Planning worker failed to start")
+            if not ok:
+                self.shutdown()
+                raise error
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def submit(
+        self,
+        goal: np.ndarray,
+        algorithm: Algorithm = ConfigurationPathAlgorithms.RRTConnect,
+        start: Optional[np.ndarray] = None,
+        timeout: float = 5.0,
+        group: Optional[Hashable] = None,
+        simplify_time: float = 0.1,
+        states: int = 0,
+    ) -> "Future[np.ndarray]":
+        """Queues a query, returning the future of its (T, dof) path
+
+        The future raises a `ConfigurationPathError` if no path was found
+        within `timeout` seconds of planning. See `MotionPlanner.plan_async`
+        for the other arguments.
+        """
+        if self._dispatcher is None:
+            self.start()
+        if self._closed:
+            raise PyRepError("PlanningPool is shut down")
+        algorithm = getattr(algorithm, "value", algorithm)
+        goal = np.asarray(goal, dtype=np.float64)
+        if start is not None:
+            start = np.asarray(start, dtype=np.float64)
+        future: Future = Future()
+        qid = next(self._ids)
+        args = (start, goal, algorithm, timeout, simplify_time, states)
+        with self._lock:
+            self._pending.append((qid, future, args))
+            if group is not None:
+                self._groups.setdefault(group, []).append(future)
+                future.add_done_callback(
+                    lambda f: self._on_group_done(group, f)
+                )
+        future.add_done_callback(self._on_done)
+        self._wakeup()
+        return future
+
+    def plan_all(
+        self, queries: Iterable[Query], timeout: float = 5.0, **kwargs
+    ) -> List[Optional[np.ndarray]]:
+        """Plans `(start, goal, algorithm)` queries, waiting for all of them
+
+        Returns the paths, None for the queries that failed.
+        """
+        futures = [
+            self.submit(goal, algorithm, start, timeout, **kwargs)
+            for start, goal, algorithm in queries
+        ]
+        paths: List[Optional[np.ndarray]] = []
+        for future in futures:
+            try:
+                paths.append(future.result())
+            except ConfigurationPathError:
+                paths.append(None)
+        return paths
+
+    def shutdown(self) -> None:
+        """Cancels the queries left and stops the workers"""
+        self._closed = True
+        with self._lock:
+            futures = [future for _, future, _ in self._pending]
+            self._pending.clear()
+        for future in futures:
+            future.cancel()
+            future.set_running_or_notify_cancel()
+        # The dispatcher cancels the queries being planned
+        self._wakeup()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+            self._dispatcher = None
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._processes, self._conns = [], []
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+
+    def __enter__(self) -> "PlanningPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def _wakeup(self) -> None:
+        try:
+            self._wakeup_w.send_bytes(b"")
+        except OSError:
+            pass
+
+    def _on_done(self, future: Future) -> None:
+        if future.cancelled():
+            self._sweep = True
+            self._wakeup()
+
+    def _on_group_done(self, group: Hashable, future: Future) -> None:
+        with self._lock:
+            futures = self._groups.get(group, [])
+            if future.cancelled() or future.exception() is not None:
+                # Forgets the group once none of its queries is left
+                if all(f.done() for f in futures):
+                    self._groups.pop(group, None)
+                return
+            siblings = self._groups.pop(group, [])
+        for sibling in siblings:
+            if sibling is not future:
+                sibling.cancel()
+
+    def _dispatch(self) -> None:
+        idle = list(self._conns)
+        while not (self._closed and not self._running):
+            with self._lock:
+                if self._sweep:
+                    # Notifies the waiters of cancelled queries, e.g. for
+                    # concurrent.futures.wait
+                    self._sweep = False
+                    for item in list(self._pending):
+                        if item[1].cancelled():
+                            self._pending.remove(item)
+                            item[1].set_running_or_notify_cancel()
+                while idle and self._pending:
+                    qid, future, args = self._pending.popleft()
+                    if future.cancelled():
+                        future.set_running_or_notify_cancel()
+                        continue
+                    conn = idle.pop()
+                    self._running[conn] = (qid, future)
+                    try:
+                        conn.send(("plan", qid) + args)
+                    except OSError:
+                        self._running.pop(conn)
+                        self._pending.appendleft((qid, future, args))
+            for conn, (qid, future) in self._running.items():
+                if self._closed:
+                    future.cancel()
+                if future.cancelled() and qid not in self._cancelling:
+                    try:
+                        conn.send(("cancel", qid))
+                    except OSError:
+                        pass  # the worker died, reported by wait below
+                    self._cancelling.add(qid)
+            ready = wait(list(self._running) + [self._wakeup_r])
+            for conn in ready:
+                if conn is self._wakeup_r:
+                    while self._wakeup_r.poll():
+                        self._wakeup_r.recv_bytes()
+                    continue
+                try:
+                    qid, state, value = conn.recv()
+                except EOFError:
+                    qid, state, value = None, "error", None
+                    value = PyRepError("Planning worker died")
+                _, future = self._running.pop(conn)
+                self._cancelling.discard(qid)
+                if qid is not None:
+                    idle.append(conn)
+                self._complete(future, state, value)
+
+    def _complete(self, future: Future, state: str, value: Any) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        if state == "solved":
+            future.set_result(value)
+        elif state == "error":
+            future.set_exception(value)
+        else:
+            future.set_exception(
+                ConfigurationPathError(f"Could not find a path: {state}")
+            )
@@ -0,0 +1,119 @@
+"""Joint trajectories executed by the simulator
+
+A `TrajectoryExecutor` uploads a whole (T, dof) trajectory in one call. The
+waypoints are then applied in the actuation phase of each simulation step, on
+the Lua side (see `pyrepExt.trajStart`), rather than with a call per joint
+and step from Python::
+
+    executor = TrajectoryExecutor(arm_joints)
+    executor.execute(planner.plan(goal))
+    executor.wait(pr)  # steps until the last waypoint is applied
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pyrep_ext.core import bridge
+from pyrep_ext.objects.group import ObjectGroup
+from pyrep_ext.objects.joint import Joint
+
+if TYPE_CHECKING:
+    from pyrep_ext.pyrep import PyRep
+
+
+class TrajectoryExecutor:
+    """Follows joint trajectories, one waypoint per simulation step
+
+    :param joints: The joints, in the order of the trajectory columns.
+    :param set_target: Whether to set target positions, for joints in
+        position control, or to set positions, for kinematic joints.
+    """
+
+    def __init__(self, joints: Sequence[Joint], set_target: bool = True):
+        self._joints = ObjectGroup([j.get_handle() for j in joints], Joint)
+        self._key = ",".join(map(str, self._joints.handles))
+        self.set_target = set_target
+
+    @property
+    def joints(self) -> ObjectGroup:
+        return self._joints
+
+    @property
+    def dof(self) -> int:
+        return len(self._joints)
+
+    def execute(
+        self, trajectory: np.ndarray, times: Optional[np.ndarray] = None
+    ) -> int:
+        """Uploads a trajectory, followed from the next simulation step on
+
+        Replaces the trajectory in progress, if any.
+
+        :param trajectory: The (T, dof) waypoints.
+        :param times: The (T,) times of the waypoints, increasing from 0, in
+            seconds. The joints then follow the linear interpolation of the
+            waypoints, at the time of each step. By default, a waypoint is
+            applied per step.
+        :return: The number of steps the trajectory takes.
+        """
+        trajectory = np.asarray(trajectory, dtype=np.float64)
+        trajectory = trajectory.reshape(-1, self.dof)
+        if len(trajectory) == 0:
+            raise ValueError("empty trajectory")
+        if times is None:
+            times = np.empty(0)
+        else:
+            times = np.asarray(times, dtype=np.float64).reshape(-1)
+            if len(times) != len(trajectory):
+                raise ValueError(
+                    f"expected {len(trajectory)} times, got {len(times)}"
+                )
+            if times[0] != 0.0 or np.any(np.diff(times) <= 0.0):
+                raise ValueError("times must increase from 0")
+        return bridge.call(
+            "pyrepExt.trajStart",
+            (
+                self._key,
+                self._joints.handles,
+                trajectory,
+                times,
+                self.set_target,
+            ),
+            (("string", "ndarray", "ndarray", "ndarray", "bool"), ("int",)),
+        )
+
+    def poll(self) -> Tuple[int, int]:
+        """Returns the number of steps done so far, and in total"""
+        return bridge.call(
+            "pyrepExt.trajProgress",
+            (self._key,),
+            (("string",), ("int", "int")),
+        )
+
+    @property
+    def progress(self) -> float:
+        """The fraction of the trajectory done, 1 when no trajectory"""
+        done, total = self.poll()
+        return done / total if total else 1.0
+
+    @property
+    def done(self) -> bool:
+        done, total = self.poll()
+        return done >= total
+
+    def wait(self, pr: PyRep) -> None:
+        """Steps the simulation until the trajectory is done
+
+        The steps left are known after a single query, so nothing is polled
+        while stepping.
+        """
+        done, total = self.poll()
+        for _ in range(total - done):
+            pr.step()
+
+    def stop(self) -> None:
+        """Stops the trajectory in progress, leaving the joints as they are"""
+        bridge.call("pyrepExt.trajStop", (self._key,), (("string",), ()))
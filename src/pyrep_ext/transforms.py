@@ -0,0 +1,223 @@
+"""Vectorized rigid transform math, following CoppeliaSim's conventions
+
+Quaternions are `xyzw`, Euler angles are CoppeliaSim's alpha, beta, gamma
+(`R = Rx(alpha) @ Ry(beta) @ Rz(gamma)`), poses are position and quaternion
+`(x, y, z, qx, qy, qz, qw)` and transforms are 4x4 homogeneous matrices. All
+functions work on arrays with any number of leading dimensions.
+
+Rather than asking the simulator for poses `relative_to` other objects, one
+query per pair, the world matrices of a group can be read once and combined
+locally::
+
+    world = group.get_matrices()  # (N, 4, 4), one round trip
+    relative = relative_matrices(world)  # (N, N, 4, 4), i relative to j
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def quaternion_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Hamilton product `a * b`, i.e. the rotation `b` followed by `a`"""
+    ax, ay, az, aw = np.moveaxis(np.asarray(a, dtype=np.float64), -1, 0)
+    bx, by, bz, bw = np.moveaxis(np.asarray(b, dtype=np.float64), -1, 0)
+    return np.stack(
+        [
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+            aw * bw - ax * bx - ay * by - az * bz,
+        ],
+        axis=-1,
+    )
+
+
+def quaternion_inverse(q: np.ndarray) -> np.ndarray:
+    """Inverse of unit quaternions, i.e. their conjugate"""
+    q = np.array(q, dtype=np.float64)
+    q[..., :3] *= -1.0
+    return q
+
+
+def quaternion_to_matrix(q: np.ndarray) -> np.ndarray:
+    """Unit quaternions (..., 4) to rotation matrices (..., 3, 3)"""
+    x, y, z, w = np.moveaxis(np.asarray(q, dtype=np.float64), -1, 0)
+    return np.stack(
+        [
+            np.stack(
+                [
+                    1 - 2 * (y * y + z * z),
+                    2 * (x * y - z * w),
+                    2 * (x * z + y * w),
+                ],
+                axis=-1,
+            ),
+            np.stack(
+                [
+                    2 * (x * y + z * w),
+                    1 - 2 * (x * x + z * z),
+                    2 * (y * z - x * w),
+                ],
+                axis=-1,
+            ),
+            np.stack(
+                [
+                    2 * (x * z - y * w),
+                    2 * (y * z + x * w),
+                    1 - 2 * (x * x + y * y),
+                ],
+                axis=-1,
+            ),
+        ],
+        axis=-2,
+    )
+
+
+def matrix_to_quaternion(m: np.ndarray) -> np.ndarray:
+    """Rotation matrices (..., 3, 3) or transforms (..., 4, 4) to unit
+    quaternions (..., 4), with a non-negative `w`"""
+    m = np.asarray(m, dtype=np.float64)[..., :3, :3]
+    m00, m11, m22 = m[..., 0, 0], m[..., 1, 1], m[..., 2, 2]
+    d21 = m[..., 2, 1] - m[..., 1, 2]
+    d02 = m[..., 0, 2] - m[..., 2, 0]
+    d10 = m[..., 1, 0] - m[..., 0, 1]
+    s21 = m[..., 2, 1] + m[..., 1, 2]
+    s02 = m[..., 0, 2] + m[..., 2, 0]
+    s10 = m[..., 1, 0] + m[..., 0, 1]
+    # 4 * x^2, 4 * y^2, 4 * z^2 and 4 * w^2. Dividing by the largest one is
+    # numerically stable (Shepperd's method)
+    squares = np.stack(
+        [
+            1 + m00 - m11 - m22,
+            1 - m00 + m11 - m22,
+            1 - m00 - m11 + m22,
+            1 + m00 + m11 + m22,
+        ],
+        axis=-1,
+    )
+    largest = np.argmax(squares, axis=-1)[..., None]
+    s = np.sqrt(np.take_along_axis(squares, largest, -1))  # 2 * |component|
+    candidates = np.stack(
+        [
+            np.stack([s[..., 0] ** 2, s10, s02, d21], axis=-1),
+            np.stack([s10, s[..., 0] ** 2, s21, d02], axis=-1),
+            np.stack([s02, s21, s[..., 0] ** 2, d10], axis=-1),
+            np.stack([d21, d02, d10, s[..., 0] ** 2], axis=-1),
+        ],
+        axis=-2,
+    )
+    q = np.take_along_axis(candidates, largest[..., None], -2)[..., 0, :]
+    q = q / (2 * s)
+    return np.where(q[..., 3:] < 0, -q, q)
+
+
+def euler_to_matrix(euler: np.ndarray) -> np.ndarray:
+    """Euler angles (..., 3) to rotation matrices (..., 3, 3)"""
+    return quaternion_to_matrix(euler_to_quaternion(euler))
+
+
+def euler_to_quaternion(euler: np.ndarray) -> np.ndarray:
+    """Euler angles (..., 3) to unit quaternions (..., 4)"""
+    half = 0.5 * np.asarray(euler, dtype=np.float64)
+    cx, cy, cz = np.moveaxis(np.cos(half), -1, 0)
+    sx, sy, sz = np.moveaxis(np.sin(half), -1, 0)
+    return np.stack(
+        [
+            sx * cy * cz + cx * sy * sz,
+            cx * sy * cz - sx * cy * sz,
+            cx * cy * sz + sx * sy * cz,
+            cx * cy * cz - sx * sy * sz,
+        ],
+        axis=-1,
+    )
+
+
+def matrix_to_euler(m: np.ndarray) -> np.ndarray:
+    """Rotation matrices (..., 3, 3) or transforms to Euler angles (..., 3)
+
+    At gimbal lock (`beta` = +-pi/2), `gamma` is set to 0.
+    """
+    m = np.asarray(m, dtype=np.float64)
+    beta = np.arcsin(np.clip(m[..., 0, 2], -1.0, 1.0))
+    locked = np.abs(m[..., 0, 2]) > 1.0 - 1e-9
+    alpha = np.where(
+        locked,
+        np.arctan2(m[..., 2, 1], m[..., 1, 1]),
+        np.arctan2(-m[..., 1, 2], m[..., 2, 2]),
+    )
+    gamma = np.where(locked, 0.0, np.arctan2(-m[..., 0, 1], m[..., 0, 0]))
+    return np.stack([alpha, beta, gamma], axis=-1)
+
+
+def quaternion_to_euler(q: np.ndarray) -> np.ndarray:
+    """Unit quaternions (..., 4) to Euler angles (..., 3)"""
+    return matrix_to_euler(quaternion_to_matrix(q))
+
+
+def pose_to_matrix(pose: np.ndarray) -> np.ndarray:
+    """Poses (..., 7) to transforms (..., 4, 4)"""
+    pose = np.asarray(pose, dtype=np.float64)
+    m = np.zeros(pose.shape[:-1] + (4, 4))
+    m[..., :3, :3] = quaternion_to_matrix(pose[..., 3:])
+    m[..., :3, 3] = pose[..., :3]
+    m[..., 3, 3] = 1.0
+    return m
+
+
+def matrix_to_pose(m: np.ndarray) -> np.ndarray:
+    """Transforms (..., 4, 4) to poses (..., 7)"""
+    m = np.asarray(m, dtype=np.float64)
+    return np.concatenate([m[..., :3, 3], matrix_to_quaternion(m)], axis=-1)
+
+
+def from_sim_matrix(m: np.ndarray) -> np.ndarray:
+    """CoppeliaSim's 12-value row-major matrices (..., 12) to (..., 4, 4)"""
+    m = np.asarray(m, dtype=np.float64)
+    out = np.zeros(m.shape[:-1] + (4, 4))
+    out[..., :3, :] = m.reshape(m.shape[:-1] + (3, 4))
+    out[..., 3, 3] = 1.0
+    return out
+
+
+def invert(m: np.ndarray) -> np.ndarray:
+    """Inverse of rigid transforms (..., 4, 4), without a general inverse"""
+    m = np.asarray(m, dtype=np.float64)
+    rt = np.swapaxes(m[..., :3, :3], -1, -2)
+    out = np.zeros_like(m)
+    out[..., :3, :3] = rt
+    out[..., :3, 3] = -np.einsum("...ij,...j->...i", rt, m[..., :3, 3])
+    out[..., 3, 3] = 1.0
+    return out
+
+
+def compose(*transforms: np.ndarray) -> np.ndarray:
+    """Product of transforms, e.g. `compose(a_in_world, b_in_a)`"""
+    out = np.asarray(transforms[0], dtype=np.float64)
+    for m in transforms[1:]:
+        out = out @ m
+    return out
+
+
+def transform_points(m: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Applies transforms (..., 4, 4) to points (..., 3)"""
+    m = np.asarray(m, dtype=np.float64)
+    return np.einsum("...ij,...j->...i", m[..., :3, :3], points) + m[..., :3, 3]
+
+
+def relative_matrices(
+    world: np.ndarray, pairs: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Transforms of objects relative to each other, from their world ones
+
+    :param world: The (N, 4, 4) world transforms.
+    :param pairs: Optional (P, 2) indices `(i, j)`.
+    :return: `inv(world[j]) @ world[i]`, the transform of i relative to j,
+        as a (N, N, 4, 4) array indexed by `[i, j]`, or (P, 4, 4) for pairs.
+    """
+    world = np.asarray(world, dtype=np.float64)
+    inverse = invert(world)
+    if pairs is None:
+        return inverse[None, :] @ world[:, None]
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    return inverse[pairs[:, 1]] @ world[pairs[:, 0]]
@@ -0,0 +1,51 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from pyrep_ext.aio import AsyncJoint, AsyncPyRep
+from pyrep_ext.const import ObjectType
+from pyrep_ext.core.errors import CoppeliaSimError
+from pyrep_ext.objects.joint import Joint
+from pyrep_ext.objects.shape import Shape
+
+
+@pytest.fixture
+def env(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    stub.sim.add_object("/hinge", ObjectType.JOINT.value)
+    stub.sim.add_object("/mass", ObjectType.SHAPE.value, position=(1, 2, 3))
+    return stub
+
+
+def test_concurrent_calls_are_batched(env) -> None:
+    async def main():
+        aio = await AsyncPyRep.launch()
+        hinge = await aio.get_object(Joint, "/hinge")
+        mass = await aio.get_object(Shape, "/mass")
+        assert isinstance(hinge, AsyncJoint)
+        await hinge.set_joint_position(0.5)
+
+        batches = aio.num_batches
+        q, pose, matrix = await asyncio.gather(
+            hinge.get_joint_position(),
+            mass.get_pose(),
+            mass.get_matrix(relative_to=hinge),
+        )
+        assert aio.num_batches == batches + 1
+        assert q == 0.5
+        np.testing.assert_allclose(pose, [1, 2, 3, 0, 0, 0, 1])
+        assert matrix.shape == (4, 4)
+
+        with pytest.raises(CoppeliaSimError):
+            await aio.call("sim.doesNotExist")
+
+        await aio.start()
+        for _ in range(3):
+            await aio.step()
+        time = await aio.call("sim.getSimulationTime")
+        await aio.stop()
+        await aio.shutdown()
+        return time
+
+    assert asyncio.run(main()) > 0.0
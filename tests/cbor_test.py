@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.core import bridge, cbor_codec
+from pyrep_ext.pyrep import PyRep
+
+
+@pytest.fixture
+def pr(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    stub.sim.register("assert", lambda *args: args)
+    pr = PyRep()
+    pr.launch(headless=True)
+    yield pr
+    pr.shutdown()
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.arange(5, dtype=np.float32),
+        np.arange(6, dtype=">i2").reshape(2, 3),
+        np.arange(24.0).reshape(2, 3, 4)[:, ::2],
+        np.array(7, dtype=np.uint64),
+    ],
+)
+def test_typed_arrays(array) -> None:
+    decoded = cbor_codec.decode(cbor_codec.encode({"array": array}))["array"]
+    assert decoded.shape == array.shape
+    np.testing.assert_array_equal(decoded, array)
+    assert not decoded.flags.writeable
+
+
+def test_bool_arrays() -> None:
+    # As booleans, like stack.write_array pushes them
+    flags = np.array([[True, False], [False, True]])
+    expected = [True, False, False, True]
+    assert cbor_codec.decode(cbor_codec.encode(flags)) == expected
+
+
+def test_count_items() -> None:
+    values = ([1, [2.0, 3.0]], {"a": np.zeros(100), "b": "c"}, 4)
+    assert cbor_codec.count_items(values, 100) == 11
+    assert cbor_codec.count_items(values, 5) == 5
+
+
+def scene(n):
+    return [
+        {
+            "handle": i,
+            "pose": np.array([0.0, 0.0, i, 0.0, 0.0, 0.0, 1.0]),
+            "tags": ["dynamic", b"\xff"] if i % 2 else [],
+            "mass": None if i == 0 else 0.5,
+        }
+        for i in range(n)
+    ]
+
+
+def test_same_results(pr, stub, monkeypatch) -> None:
+    args = (scene(8), 3, np.arange(3))
+    monkeypatch.setattr(bridge, "CBOR_THRESHOLD", None)
+    expected = bridge.call("assert", args, ((), ()))
+    assert stub.sim.calls.get("pyrepExt.cborCall", 0) == 0
+    result = bridge.call_cbor("assert", args)
+    assert stub.sim.calls["pyrepExt.cborCall"] == 1
+    assert result == expected
+    assert expected[0][1]["pose"] == [0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
+    assert expected[0][1]["tags"] == ["dynamic", b"\xff"]
+
+
+def test_type_hints(pr, stub) -> None:
+    hints = (("float", "list", "ndarray"), ("float", "list", "ndarray"))
+    args = (1, [], np.array([[1, 2], [3, 4]]))
+    expected = bridge.call("assert", args, hints)
+    result = bridge.call_cbor("assert", args, hints)
+    assert isinstance(result[0], float) and result[0] == expected[0] == 1.0
+    assert result[1] == expected[1] == []
+    assert result[2].dtype == expected[2].dtype == np.float64
+    np.testing.assert_array_equal(result[2], expected[2])
+    assert bridge.call_cbor("assert", (b"\x00\xff",), (("buffer",),) * 2) == (
+        b"\x00\xff"
+    )
+
+
+def test_auto_select(pr, stub, monkeypatch) -> None:
+    monkeypatch.setattr(bridge, "CBOR_THRESHOLD", 64)
+    bridge.call("assert", (scene(2),), ((), ()))
+    assert stub.sim.calls.get("pyrepExt.cborCall", 0) == 0
+    # the batches of object groups go through CBOR too
+    result = bridge.call("assert", (scene(16),), ((), ()))
+    assert stub.sim.calls["pyrepExt.cborCall"] == 1
+    assert len(result) == 16 and result[15]["handle"] == 15
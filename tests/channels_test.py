@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.channels import decode_array, encode_array
+from pyrep_ext.core import bridge
+from pyrep_ext.pyrep import PyRep
+
+
+@pytest.fixture
+def pr(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    pr = PyRep()
+    pr.launch(headless=True)
+    yield pr
+    pr.shutdown()
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.arange(12, dtype=np.float32).reshape(3, 4),
+        np.arange(6, dtype=">i4").reshape(2, 3),  # converted to little-endian
+        np.arange(24.0).reshape(2, 3, 4)[:, ::2],  # not contiguous
+        np.array([True, False]),
+        np.array(3, dtype=np.uint8),
+        np.empty((0, 3)),
+    ],
+)
+def test_encode_decode(array) -> None:
+    data = encode_array(array)
+    decoded = decode_array(data)
+    assert decoded.shape == array.shape
+    assert decoded.dtype == array.dtype.newbyteorder("<")
+    np.testing.assert_array_equal(decoded, array)
+    # a view of the buffer, not a copy
+    assert not decoded.flags.writeable
+    assert len(data) == 16 + 8 * array.ndim + array.nbytes
+
+
+def test_unsupported_dtype() -> None:
+    with pytest.raises(TypeError):
+        encode_array(np.zeros(2, dtype=np.complex64))
+
+
+def test_versions(pr, stub) -> None:
+    channel = pr.channel("heightmap")
+    assert channel.read() is None and channel.version == 0
+    first = np.ones((2, 2), dtype=np.float32)
+    assert channel.write(first) == 1
+    assert channel.write(2 * first) == 2
+    # double buffered: both versions are kept, in alternate slots
+    scene = stub.sim.constants["sim.handle_scene"]
+    slots = [
+        stub.sim.properties[(scene, f"customData.heightmap.{k}")]
+        for k in (1, 0)
+    ]
+    # the stub stores the buffers as strings when they are valid UTF-8
+    slots = [
+        decode_array(slot if isinstance(slot, bytes) else slot.encode())
+        for slot in slots
+    ]
+    np.testing.assert_array_equal(slots, [first, 2 * first])
+
+    np.testing.assert_array_equal(channel.poll(), 2 * first)
+    assert channel.version == 2
+    # unchanged: only the version is transferred
+    reads = stub.sim.calls["sim.getBufferProperty"]
+    assert channel.poll() is None
+    np.testing.assert_array_equal(channel.read(), 2 * first)
+    assert stub.sim.calls["sim.getBufferProperty"] == reads
+
+    channel.clear()
+    assert channel.read() is not None  # the last array read is kept
+    assert pr.channel("heightmap").read() is None
+    assert channel.write(first) == 3
+    np.testing.assert_array_equal(channel.poll(), first)
+
+
+def test_lua_helpers(pr, stub) -> None:
+    handle = stub.sim.add_object("/lidar", 0)
+    channel = pr.channel("scans", handle=handle)
+    # written by a script in the scene
+    version = bridge.call(
+        "pyrepExt.channelWrite",
+        (handle, "scans", [1.5, 2.5, 3.5, 4.5], [2, 2], "<f8"),
+        (("int", "string", "list", "list", "string"), ("int",)),
+    )
+    assert version == 1
+    np.testing.assert_array_equal(channel.read(), [[1.5, 2.5], [3.5, 4.5]])
+    # read by a script in the scene
+    channel.write(np.arange(6, dtype=np.int16).reshape(3, 2))
+    values, shape, version = bridge.call(
+        "pyrepExt.channelRead",
+        (handle, "scans"),
+        (("int", "string"), ("list", "list", "int")),
+    )
+    assert values == list(range(6)) and shape == [3, 2] and version == 2
+    assert pr.channel("scans").read() is None
+
+
+def test_lua_helpers_bool(pr, stub) -> None:
+    channel = pr.channel("contacts")
+    scene = stub.sim.constants["sim.handle_scene"]
+    bridge.call(
+        "pyrepExt.channelWrite",
+        (scene, "contacts", [True, False, True], [3], "|b1"),
+        (("int", "string", "list", "list", "string"), ("int",)),
+    )
+    flags = channel.read()
+    assert flags.dtype == np.bool_
+    np.testing.assert_array_equal(flags, [True, False, True])
+    values, shape, _ = bridge.call(
+        "pyrepExt.channelRead",
+        (scene, "contacts"),
+        (("int", "string"), ("list", "list", "int")),
+    )
+    assert values == [True, False, True] and shape == [3]
@@ -0,0 +1,15 @@
+import pytest
+
+from pyrep_ext.core import lib
+from pyrep_ext.core.sim import SimBackend
+from pyrep_ext.core.stub import StubLib, install
+
+
+@pytest.fixture
+def stub() -> StubLib:
+    """Runs the test against a fresh stubbed simulator backend"""
+    stub = install()
+    SimBackend().simInitialize("", "none")
+    yield stub
+    lib.set_backend(None)
+    SimBackend._instance = None
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from pyrep_ext.const import ObjectType
+from pyrep_ext.core.errors import CoppeliaSimError
+from pyrep_ext.core.executor import SimExecutor
+from pyrep_ext.core.sim import SimBackend
+
+
+def test_call_batch(stub) -> None:
+    from pyrep_ext.core.bridge import call_batch
+
+    stub.sim.register("sim.pair", lambda a: (a, a + 1))
+    results = call_batch(
+        [("sim.getSimulationTime", ()), ("sim.pair", (1,)), ("sim.nope", ())]
+    )
+    assert results[0] == (True, 0.0)
+    assert results[1] == (True, [1, 2])
+    assert results[2][0] is False
+
+
+def test_calls_are_coalesced(stub) -> None:
+    handle = stub.sim.add_object(
+        "/a", ObjectType.SHAPE.value, position=(1, 2, 3)
+    )
+    executor = SimExecutor()
+    # queued before the sim thread starts, so they go in a single batch
+    futures = [
+        executor.call("sim.getObjectPosition", handle, -1) for _ in range(10)
+    ]
+    bad = executor.call("sim.nope")
+    executor.start()
+    assert all(f.result(1.0) == [1.0, 2.0, 3.0] for f in futures)
+    with pytest.raises(CoppeliaSimError):
+        bad.result(1.0)
+    assert executor.num_batches == 1
+    executor.shutdown()
+
+
+def test_submit_from_many_threads(stub) -> None:
+    backend = SimBackend()
+    backend.simStartSimulation()
+    executor = SimExecutor()
+    executor.start(step=backend.simStep)
+    sim_threads = []
+
+    def worker() -> None:
+        for _ in range(20):
+            sim_threads.append(executor.submit(threading.get_ident).result(1.0))
+            executor.call("sim.getSimulationTime").result(1.0)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    executor.shutdown()
+    assert len(set(sim_threads)) == 1
+    assert sim_threads[0] != threading.get_ident()
+    assert len(sim_threads) == 80
+    assert stub.sim.time > 0.0
+
+
+def test_init_errors_are_raised(stub) -> None:
+    def init() -> None:
+        raise ValueError("launch failed")
+
+    executor = SimExecutor()
+    with pytest.raises(ValueError):
+        executor.start(init=init)
+    assert not executor.is_running
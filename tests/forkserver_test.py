@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from pyrep_ext.const import ObjectType
+from pyrep_ext.core.errors import PyRepError
+from pyrep_ext.suite.forkserver import ForkServer
+
+
+def init_stub() -> None:
+    from pyrep_ext.core.stub import install
+
+    sim = install().sim
+    sim.add_object("/hinge", ObjectType.JOINT.value)
+    sim.add_object("/mass", ObjectType.SHAPE.value, position=(0, 0, 1))
+
+
+def init_dying() -> None:
+    # Workers exit before connecting back
+    from pyrep_ext.suite import forkserver
+
+    def exit(*args, **kwargs):
+        os._exit(1)
+
+    forkserver.Client = exit
+
+
+class Shell:
+    def run(self, code: int) -> int:
+        command = [sys.executable, "-c", f"raise SystemExit({code})"]
+        return subprocess.run(command).returncode
+
+    def close(self) -> None:
+        pass
+
+
+def test_fork_server(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    with ForkServer(initializer=init_stub) as server:
+        workers = [server.spawn(render_mode="rgb_array") for _ in range(2)]
+        assert workers[0].pid != workers[1].pid
+        for worker in workers:
+            obs, _ = worker.reset()
+            assert obs[2] == 1.0
+            obs, *_ = worker.step(np.zeros(1, dtype=np.float32))
+            assert obs.shape == (3,)
+            with pytest.raises(ValueError):
+                worker.step(np.zeros(2, dtype=np.float32))
+            worker.close()
+
+
+def test_worker_subprocess() -> None:
+    with ForkServer(Shell, modules=(), assets=()) as server:
+        worker = server.spawn()
+        assert worker.call("run", 3) == 3
+        worker.close()
+
+
+def test_worker_died() -> None:
+    with ForkServer(
+        Shell, modules=(), assets=(), initializer=init_dying
+    ) as server:
+        with pytest.raises(PyRepError):
+            server.spawn()
+
+
+def test_zygote_died() -> None:
+    with ForkServer(Shell, modules=(), assets=()) as server:
+        server._process.kill()
+        server._process.join()
+        with pytest.raises(PyRepError):
+            server.spawn()
@@ -0,0 +1,41 @@
+from pyrep_ext.const import ObjectType
+from pyrep_ext.core.sim import SimBackend
+
+
+def test_step_counts_ticks(stub) -> None:
+    backend = SimBackend()
+    assert backend._tick_hook is not None
+    backend.simStartSimulation()
+    for _ in range(3):
+        backend.simStep()
+    assert stub.sim.time == 3 * stub.sim.timestep
+    assert "sim.getSimulationTime" not in stub.sim.calls
+
+
+def test_actuation_and_sensing_hooks(stub) -> None:
+    hinge = stub.sim.add_object("/hinge", ObjectType.JOINT.value)
+    stub.sim.objects[hinge]["joint_position"] = 0.5
+    backend = SimBackend()
+
+    @backend.hooks.actuation(
+        reads=[("sim.getJointPosition", (hinge,))],
+        writes=[("sim.setJointTargetForce", (hinge,))],
+    )
+    def controller(q: float) -> float:
+        return -2.0 * q
+
+    observations = []
+
+    @backend.hooks.sensing(reads=[("sim.getSimulationTime", ())])
+    def collect(t: float) -> None:
+        observations.append(t)
+
+    backend.simStartSimulation()
+    backend.simStep()
+    backend.simStep()
+    assert stub.sim.objects[hinge]["target_force"] == -1.0
+    assert observations == [stub.sim.timestep, 2 * stub.sim.timestep]
+
+    backend.hooks.remove(collect)
+    backend.simStep()
+    assert len(observations) == 2
@@ -0,0 +1,76 @@
+import numpy as np
+
+from pyrep_ext.const import ObjectType
+from pyrep_ext.ik import IKSolver
+from pyrep_ext.objects.joint import Joint
+from pyrep_ext.objects.shape import Shape
+
+
+def make_chain(stub):
+    # The stub's simIK treats the joints between base and tip as a Cartesian
+    # robot, translating the tip along x, y, z within [-1, 1]
+    sim = stub.sim
+    sim.add_object("/base", ObjectType.SHAPE.value, position=(0.5, 0, 0))
+    for axis in "xyz":
+        sim.add_object(f"/{axis}", ObjectType.JOINT.value)
+    sim.add_object("/tip", ObjectType.SHAPE.value)
+    joints = [Joint(f"/{axis}") for axis in "xyz"]
+    return joints, Shape("/tip"), Shape("/base")
+
+
+def test_solve_batch(stub) -> None:
+    joints, tip, base = make_chain(stub)
+    solver = IKSolver(joints, tip, base=base)
+    assert solver.dof == 3
+    assert len(stub.sim.objects) == 5  # the temporary target is removed
+
+    poses = np.zeros((4, 7))
+    poses[:, 6] = 1.0
+    poses[:, :3] = [[0.7, 0.2, 0.1], [1.0, -0.5, 0.0], [2.0, 0, 0], [0.5, 0, 0]]
+    calls = dict(stub.sim.calls)
+    solutions, success = solver.solve_batch(poses)
+    assert stub.sim.calls["pyrepExt.ikSolve"] == 1
+    assert stub.sim.calls.get("pyrepExt.batch", 0) == calls.get(
+        "pyrepExt.batch", 0
+    )
+    assert solutions.shape == (4, 3)
+    np.testing.assert_array_equal(success, [True, True, False, True])
+    np.testing.assert_allclose(solutions[:2], [[0.2, 0.2, 0.1], [0.5, -0.5, 0]])
+    np.testing.assert_array_equal(solutions[3], 0.0)
+
+    # relative poses, and seeds
+    solutions, success = solver.solve_batch(
+        poses[:2], seeds=np.ones((2, 3)), relative_to=base
+    )
+    np.testing.assert_allclose(solutions, [[0.7, 0.2, 0.1], [1.0, -0.5, 0]])
+
+    assert solver.solve(poses[2]) is None
+    solver.apply(solver.solve(poses[0]))
+    np.testing.assert_allclose(solver.get_joint_positions(), [0.2, 0.2, 0.1])
+    np.testing.assert_allclose(
+        [j.get_joint_position() for j in joints], [0.2, 0.2, 0.1]
+    )
+
+
+def test_sync(stub) -> None:
+    joints, tip, base = make_chain(stub)
+    solver = IKSolver(joints, tip, base=base)
+    joints[1].set_joint_position(0.3)
+    base.set_position([0.0, 0.0, 0.0])
+    np.testing.assert_allclose(solver.sync(), [0.0, 0.3, 0.0])
+    pose = [0.7, 0.2, 0.1, 0, 0, 0, 1]
+    np.testing.assert_allclose(solver.solve(pose, seed=[0, 0, 0]), pose[:3])
+
+
+def test_environment_is_cached(stub) -> None:
+    joints, tip, base = make_chain(stub)
+    first = IKSolver(joints, tip, base=base)
+    second = IKSolver(joints, tip, base=base)
+    assert first.key == second.key
+    assert stub.sim.calls["simIK.createEnvironment"] == 1
+    assert IKSolver(joints[:2], tip, base=base).key != first.key
+    assert stub.sim.calls["simIK.createEnvironment"] == 2
+
+    first.erase()
+    IKSolver(joints, tip, base=base)
+    assert stub.sim.calls["simIK.createEnvironment"] == 3
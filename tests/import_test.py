@@ -0,0 +1,28 @@
+import os
+import pickle
+import subprocess
+import sys
+from enum import EnumMeta
+
+from pyrep_ext import const
+
+
+def test_import_does_not_load_simulator() -> None:
+    code = (
+        "import sys\n"
+        "import pyrep_ext.suite.pendulum\n"
+        "from pyrep_ext.core.lib import get_backend\n"
+        "assert get_backend() is None\n"
+        "assert 'gymnasium' not in sys.modules\n"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "COPPELIASIM_ROOT"}
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+
+def test_enums() -> None:
+    # Static classes, seen by type checkers
+    assert isinstance(vars(const)["JointMode"], EnumMeta)
+    assert const.JointMode.DYNAMIC.value == 5
+    assert pickle.loads(pickle.dumps(const.JointMode.DYNAMIC)) is (
+        const.JointMode.DYNAMIC
+    )
@@ -0,0 +1,66 @@
+import shutil
+import subprocess
+
+import pytest
+
+from pyrep_ext import LUA_DIR
+
+# The stub mirrors the Lua helpers in Python, so the helpers themselves only
+# run against the real simulator. These tests at least load them, and run a
+# few against a mock `sim`, when lupa (or luac) is available
+LUA_FILE = LUA_DIR / "pyrepExt.lua"
+
+
+def lua_runtime():
+    lua54 = pytest.importorskip("lupa.lua54")
+    lua = lua54.LuaRuntime()
+    lua.execute(LUA_FILE.read_text())
+    return lua
+
+
+def test_pyrep_ext_loads() -> None:
+    luac = shutil.which("luac5.4")
+    if luac is not None:
+        subprocess.run([luac, "-p", str(LUA_FILE)], check=True)
+    else:
+        lua_runtime()
+
+
+def test_get_meshes() -> None:
+    lua = lua_runtime()
+    lua.execute(
+        """
+        sim = {
+            getShapeBB = function(h) return {h, 1, 1} end,
+            getObjectUid = function(h) return 100 + h end,
+            getShapeMesh = function(h)
+                return {0, 0, 0, h, 0, 0, 0, h, 0}, {0, 1, 2}, {0, 0, 1}
+            end,
+        }
+        """
+    )
+    vertices, _, _, counts, stamps = lua.eval(
+        "pyrepExt.getMeshes({1, 2}, {101, 1, 1, 1})"
+    )
+    assert list(counts.values()) == [0, 0, 3, 1]
+    assert list(vertices.values())[3] == 2
+    assert list(stamps.values()) == [101, 1, 1, 1, 102, 2, 1, 1]
+
+
+def test_bool_channels() -> None:
+    lua = lua_runtime()
+    lua.execute(
+        """
+        local properties = {}
+        sim = {
+            getIntProperty = function(h, k) return properties[k] end,
+            setIntProperty = function(h, k, v) properties[k] = v end,
+            getBufferProperty = function(h, k) return properties[k] end,
+            setBufferProperty = function(h, k, v) properties[k] = v end,
+        }
+        """
+    )
+    lua.execute("pyrepExt.channelWrite(-1, 'flags', {true, false}, {2}, '|b1')")
+    values, shape, version = lua.eval("pyrepExt.channelRead(-1, 'flags')")
+    assert list(values.values()) == [True, False]
+    assert list(shape.values()) == [2] and version == 1
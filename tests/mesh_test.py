@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.const import PrimitiveShape
+from pyrep_ext.objects import shape
+from pyrep_ext.objects.shape import Shape
+from pyrep_ext.pyrep import PyRep
+
+
+@pytest.fixture
+def pr(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    pr = PyRep()
+    pr.launch(headless=True)
+    yield pr
+    pr.shutdown()
+
+
+def make_boxes(sizes):
+    return Shape.create_many(
+        [PrimitiveShape.CUBOID] * len(sizes), sizes=sizes, poses=[[0, 0, 0]]
+    )
+
+
+def test_get_mesh(pr, stub) -> None:
+    box = make_boxes([[1.0, 2.0, 4.0]])[0]
+    mesh = box.get_mesh()
+    assert mesh.vertices.shape == (8, 3) and mesh.vertices.dtype == np.float32
+    assert mesh.indices.shape == (12, 3) and mesh.indices.dtype == np.int32
+    assert mesh.normals.shape == (12, 3, 3)
+    np.testing.assert_array_equal(mesh.vertices.max(axis=0), [0.5, 1, 2])
+    # the normals point out of the triangles
+    a, b, c = np.moveaxis(mesh.vertices[mesh.indices], 1, 0)
+    normals = np.cross(b - a, c - a)
+    normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    np.testing.assert_allclose(normals, mesh.normals[:, 0])
+    assert not mesh.vertices.flags.writeable
+
+    reads = stub.sim.calls["sim.getShapeMesh"]
+    assert box.get_mesh() is mesh
+    assert stub.sim.calls["sim.getShapeMesh"] == reads
+    box.invalidate_mesh()
+    assert box.get_mesh() is not mesh
+    assert stub.sim.calls["sim.getShapeMesh"] == reads + 1
+
+
+def test_geometry_changed(pr, stub) -> None:
+    box, other = make_boxes([[1.0, 1.0, 1.0], [2.0, 2.0, 2.0]])
+    mesh = box.get_mesh()
+    # Scaled
+    stub.sim.obj(box.get_handle())["sizes"] = [2.0, 2.0, 2.0]
+    scaled = box.get_mesh()
+    assert scaled is not mesh
+    np.testing.assert_array_equal(scaled.vertices.max(axis=0), 1)
+    # Removed, and its handle reused by a shape of the same size
+    moved = stub.sim.objects.pop(other.get_handle())
+    moved["uid"] = other.get_handle()
+    stub.sim.objects[box.get_handle()] = moved
+    reads = stub.sim.calls["sim.getShapeMesh"]
+    assert box.get_mesh() is not scaled
+    assert stub.sim.calls["sim.getShapeMesh"] == reads + 1
+
+
+def test_removed_shapes_forgotten(pr, stub) -> None:
+    boxes = make_boxes([[1, 1, 1], [2, 2, 2]])
+    Shape.get_meshes(boxes)
+    assert all(h in shape._meshes for h in boxes.handles)
+    boxes.remove()
+    assert not any(h in shape._meshes for h in boxes.handles)
+
+
+def test_get_meshes(pr, stub) -> None:
+    boxes = make_boxes([[1, 1, 1], [2, 2, 2], [3, 3, 3]])
+    first = boxes[0].get_mesh()
+    calls = stub.sim.calls["pyrepExt.getMeshes"]
+    shape_calls = stub.sim.calls["sim.getShapeMesh"]
+    meshes = Shape.get_meshes(boxes)
+    # the two meshes not cached read in one call
+    assert stub.sim.calls["pyrepExt.getMeshes"] == calls + 1
+    assert stub.sim.calls["sim.getShapeMesh"] == shape_calls + 2
+    assert meshes[0] is first
+    for size, mesh in zip([1, 2, 3], meshes):
+        np.testing.assert_array_equal(mesh.vertices.max(axis=0), size / 2)
+        assert mesh.indices.min() == 0 and mesh.indices.max() == 7
+    assert Shape.get_meshes([]) == []
+
+
+def test_cache_cleared_on_launch(stub, monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    pr = PyRep()
+    pr.launch(headless=True)
+    handle = make_boxes([[1, 1, 1]])[0].get_handle()
+    Shape(handle).get_mesh()
+    pr.shutdown()
+    calls = stub.sim.calls["pyrepExt.getMeshes"]
+    pr.launch(headless=True)
+    Shape(handle).get_mesh()
+    assert stub.sim.calls["pyrepExt.getMeshes"] == calls + 1
+    pr.shutdown()
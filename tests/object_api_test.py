@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.const import JointMode, ObjectType
+from pyrep_ext.core.errors import WrongObjectTypeError
+from pyrep_ext.objects.joint import Joint
+from pyrep_ext.objects.shape import Shape
+
+
+def test_get_object_by_name(stub) -> None:
+    handle = stub.sim.add_object("/mass", ObjectType.SHAPE.value)
+    mass = Shape("mass")
+    assert mass.get_handle() == handle
+    assert mass.get_name() == "mass"
+    assert mass.still_exists()
+
+
+def test_missing_object(stub) -> None:
+    with pytest.raises(ValueError):
+        Shape("/does_not_exist")
+
+
+def test_wrong_object_type(stub) -> None:
+    stub.sim.add_object("/hinge", ObjectType.JOINT.value)
+    with pytest.raises(WrongObjectTypeError):
+        Shape("/hinge")
+
+
+def test_object_pose(stub) -> None:
+    stub.sim.add_object("/a", ObjectType.SHAPE.value, position=(1, 0, 0))
+    stub.sim.add_object("/b", ObjectType.SHAPE.value)
+    a, b = Shape("/a"), Shape("/b")
+    b.set_position([1.0, 2.0, 3.0])
+    np.testing.assert_allclose(b.get_position(), [1.0, 2.0, 3.0])
+    np.testing.assert_allclose(b.get_position(relative_to=a), [0.0, 2.0, 3.0])
+
+    quat = np.array([0.0, 0.0, np.sin(np.pi / 4), np.cos(np.pi / 4)])
+    b.set_quaternion(quat)
+    np.testing.assert_allclose(b.get_quaternion(), quat, atol=1e-12)
+    matrix = b.get_matrix()
+    assert matrix.shape == (4, 4)
+    np.testing.assert_allclose(matrix[:3, 3], [1.0, 2.0, 3.0])
+    np.testing.assert_allclose(matrix[:3, 0], [0.0, 1.0, 0.0], atol=1e-12)
+
+
+def test_joint(stub) -> None:
+    stub.sim.add_object("/hinge", ObjectType.JOINT.value)
+    hinge = Joint("/hinge")
+    hinge.set_joint_position(0.25)
+    assert hinge.get_joint_position() == 0.25
+    hinge.set_joint_mode(JointMode.DYNAMIC)
+    assert hinge.get_joint_mode() == JointMode.DYNAMIC
+
+
+def test_create_many(stub) -> None:
+    from pyrep_ext.const import PrimitiveShape
+
+    n = 5
+    positions = np.arange(n * 3, dtype=np.float64).reshape(n, 3)
+    group = Shape.create_many(
+        [PrimitiveShape.CUBOID] * 3 + [PrimitiveShape.SPHERE] * 2,
+        sizes=[0.1, 0.2, 0.3],
+        poses=positions,
+        colors=np.ones((n, 3)),
+        masses=np.full(n, 2.0),
+        dynamic=np.array([True, False, True, False, True]),
+    )
+    assert len(group) == n
+    assert stub.sim.calls["pyrepExt.createShapes"] == 1
+    np.testing.assert_allclose(group.get_positions(), positions)
+    poses = group.get_poses()
+    np.testing.assert_allclose(poses[:, 3:], [[0, 0, 0, 1]] * n, atol=1e-12)
+    shape = group[1]
+    assert isinstance(shape, Shape)
+    assert stub.sim.obj(shape.get_handle())["mass"] == 2.0
+    static = stub.sim.constants["sim.shapeintparam_static"]
+    assert stub.sim.obj(shape.get_handle())[("int", static)] == 1
+
+    group[::2].set_positions(np.zeros((3, 3)))
+    np.testing.assert_allclose(group.get_positions()[1::2], positions[1::2])
+    assert not group.get_positions()[::2].any()
+    group.remove()
+    assert not any(h in stub.sim.objects for h in group.handles)
@@ -0,0 +1,58 @@
+import pytest
+
+from pyrep_ext.core.pacing import Pacer
+
+
+class FakeClock:
+    """A clock advancing by 10us per read, as if spinning, and by sleeps"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 1e-5
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def make_pacer(policy: str = "catch_up"):
+    clock = FakeClock()
+    return Pacer(0.005, policy, clock=clock, sleep=clock.sleep), clock
+
+
+def test_pacing() -> None:
+    pacer, clock = make_pacer()
+    pacer.wait()
+    start = clock.now
+    for _ in range(10):
+        pacer.wait()
+    assert clock.now - start == pytest.approx(0.05, abs=1e-4)
+    assert pacer.stats.steps == 11
+    assert pacer.stats.overruns == 0
+    assert pacer.stats.drift == pytest.approx(0.0, abs=1e-9)
+
+
+@pytest.mark.parametrize("policy", ["catch_up", "skip"])
+def test_overrun(policy) -> None:
+    pacer, clock = make_pacer(policy)
+    pacer.wait()
+    clock.sleep(0.0175)  # 12.5ms late for the next slot, 2 more slots missed
+    pacer.wait()
+    assert pacer.stats.overruns == 1
+    assert pacer.stats.max_lateness == pytest.approx(0.0125, abs=1e-4)
+    start = clock.now
+    pacer.wait()
+    if policy == "catch_up":
+        assert clock.now - start < 1e-4  # still behind schedule
+        assert pacer.stats.skipped == 0
+    else:
+        assert clock.now - start == pytest.approx(0.0025, abs=1e-4)
+        assert pacer.stats.skipped == 2
+        assert pacer.stats.drift == pytest.approx(0.01, abs=1e-4)
+
+
+def test_unknown_policy() -> None:
+    with pytest.raises(ValueError):
+        Pacer(0.005, "wait")
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.const import ObjectType
+from pyrep_ext.suite.pendulum import SIMULATION_DT, PendulumEnv
+
+
+@pytest.fixture
+def scene(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    hinge = stub.sim.add_object("/hinge", ObjectType.JOINT.value)
+    stub.sim.add_object("/mass", ObjectType.SHAPE.value, position=(0, 0, 1))
+    return stub, hinge
+
+
+def test_step(scene) -> None:
+    stub, _ = scene
+    env = PendulumEnv(render_mode="rgb_array")
+    obs, _ = env.reset()
+    first, *_ = env.step(np.zeros(1, dtype=np.float32))
+    second, *_ = env.step(np.zeros(1, dtype=np.float32))
+    assert first is not second
+    assert obs[2] == 1.0
+    assert stub.sim.time == pytest.approx(2 * SIMULATION_DT)
+    env.close()
+
+
+def test_pipelined_step(scene) -> None:
+    stub, hinge = scene
+    env = PendulumEnv(render_mode="rgb_array", pipelined=True)
+    assert env.pipelined and env.action_latency == 1
+    obs, _ = env.reset()
+    # the first step returns the observation from before the action
+    first, *_ = env.step(np.full(1, 0.5, dtype=np.float32))
+    np.testing.assert_array_equal(first, obs)
+    for i in range(5):
+        env.step(np.full(1, float(i), dtype=np.float32))
+    env.step_wait()
+    assert stub.sim.time == pytest.approx(6 * SIMULATION_DT)
+    assert stub.sim.obj(hinge)["target_force"] == 4.0
+
+    # other calls wait for the steps in flight
+    env.step_async(np.zeros(1, dtype=np.float32))
+    env.get_observation()
+    assert stub.sim.time == pytest.approx(7 * SIMULATION_DT)
+    env.close()
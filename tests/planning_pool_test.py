@@ -0,0 +1,120 @@
+import time
+from concurrent.futures import wait
+
+import numpy as np
+import pytest
+
+from pyrep_ext.const import ConfigurationPathAlgorithms, ObjectType
+from pyrep_ext.core.errors import ConfigurationPathError
+from pyrep_ext.objects.joint import Joint
+from pyrep_ext.suite.planning_pool import PlanningPool
+
+
+def init_stub() -> None:
+    # The toy simOMPL plans in real time, and needs 0.05s to find a path
+    from pyrep_ext.core.stub import install
+
+    sim = install().sim
+    for i in range(2):
+        sim.add_object(f"/joint{i}", ObjectType.JOINT.value)
+    sim.ompl_work = 0.05
+    solve = sim.functions["simOMPL.solve"]
+
+    def slow_solve(task, max_time):
+        time.sleep(max_time)
+        return solve(task, max_time)
+
+    sim.register("simOMPL.solve", slow_solve)
+
+
+def queries(n):
+    return [(None, [0.1 * i, 0.0], "RRTConnect") for i in range(n)]
+
+
+def test_planning_pool(stub, monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    for i in range(2):
+        stub.sim.add_object(f"/joint{i}", ObjectType.JOINT.value)
+    joints = [Joint(f"/joint{i}") for i in range(2)]
+
+    with PlanningPool(
+        joints, num_workers=2, slice_time=0.01, initializer=init_stub
+    ) as pool:
+        paths = pool.plan_all(
+            [
+                (None, [1.0, 1.0], ConfigurationPathAlgorithms.RRTConnect),
+                ([1.0, 0.0], [0.0, 1.0], ConfigurationPathAlgorithms.PRM),
+                (None, [9.0, 0.0], ConfigurationPathAlgorithms.RRT),
+            ],
+            timeout=0.1,
+            states=3,
+        )
+        np.testing.assert_allclose(paths[0], [[0, 0], [0.5, 0.5], [1, 1]])
+        np.testing.assert_allclose(paths[1][0], [1.0, 0.0])
+        assert paths[2] is None  # out of the joint limits
+
+        # Once a query of the group is solved, the others are cancelled,
+        # whether queued or being planned
+        futures = [
+            pool.submit([9.0, 0.0], timeout=10.0, group="grasp"),
+            pool.submit([0.5, 0.5], timeout=10.0, group="grasp"),
+            pool.submit([9.0, 1.0], timeout=10.0, group="grasp"),
+        ]
+        assert futures[1].result(timeout=5.0).shape == (2, 2)
+        wait([futures[0], futures[2]], timeout=5.0)  # callbacks run after
+        assert futures[0].cancelled() and futures[2].cancelled()
+        start = time.perf_counter()
+        assert all(p is not None for p in pool.plan_all(queries(2)))
+        assert time.perf_counter() - start < 5.0  # both workers are free
+
+        slow = pool.submit([9.0, 0.0], timeout=10.0)
+        time.sleep(0.05)
+        assert slow.cancel()
+        start = time.perf_counter()
+        assert all(p is not None for p in pool.plan_all(queries(2)))
+        assert time.perf_counter() - start < 5.0
+
+        with pytest.raises(ConfigurationPathError):
+            pool.submit([9.0, 0.0], timeout=0.05).result(timeout=5.0)
+
+
+def test_late_cancel(stub, monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    for i in range(2):
+        stub.sim.add_object(f"/joint{i}", ObjectType.JOINT.value)
+    joints = [Joint(f"/joint{i}") for i in range(2)]
+
+    with PlanningPool(joints, num_workers=1, initializer=init_stub) as pool:
+        first = pool.submit([0.5, 0.5])
+        assert first.result(timeout=5.0) is not None
+        # As if the query was cancelled just after the worker replied
+        pool._conns[0].send(("cancel", 0))
+        assert pool.submit([1.0, 0.5]).result(timeout=5.0) is not None
+        assert pool._processes[0].is_alive()
+
+        # Groups without any solved query are forgotten too
+        futures = [
+            pool.submit([9.0, i], timeout=0.05, group="grasp") for i in range(2)
+        ]
+        wait(futures, timeout=5.0)
+        deadline = time.perf_counter() + 5.0
+        while pool._groups and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        assert not pool._groups
+
+
+def test_shutdown(stub, monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    for i in range(2):
+        stub.sim.add_object(f"/joint{i}", ObjectType.JOINT.value)
+    joints = [Joint(f"/joint{i}") for i in range(2)]
+
+    pool = PlanningPool(joints, num_workers=1, initializer=init_stub)
+    pool.start()
+    running = pool.submit([9.0, 0.0], timeout=10.0)
+    queued = pool.submit([9.0, 1.0], timeout=10.0)
+    time.sleep(0.05)
+    start = time.perf_counter()
+    pool.shutdown()
+    assert time.perf_counter() - start < 5.0
+    assert running.cancelled() and queued.cancelled()
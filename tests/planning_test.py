@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.const import ConfigurationPathAlgorithms, ObjectType
+from pyrep_ext.core.errors import ConfigurationPathError
+from pyrep_ext.objects.joint import Joint
+from pyrep_ext.planning import MotionPlanner
+from pyrep_ext.pyrep import PyRep
+
+
+def make_joints(stub, n=3):
+    for i in range(n):
+        stub.sim.add_object(f"/joint{i}", ObjectType.JOINT.value)
+    return [Joint(f"/joint{i}") for i in range(n)]
+
+
+def test_plan(stub) -> None:
+    # The stub's simOMPL needs 0.02s of planning, then gives a straight path
+    joints = make_joints(stub)
+    joints[0].set_joint_position(0.5)
+    planner = MotionPlanner(
+        joints, collision_pairs=[joints[0].get_handle(), -1]
+    )
+    path = planner.plan([1.0, 2.0, -1.0], states=5)
+    assert path.shape == (5, 3)
+    np.testing.assert_allclose(path[0], [0.5, 0.0, 0.0])
+    np.testing.assert_allclose(path[-1], [1.0, 2.0, -1.0])
+
+    path = planner.plan(
+        [0.0, 0.0, 0.0], ConfigurationPathAlgorithms.PRM, start=[1, 1, 1]
+    )
+    assert path.shape == (2, 3)
+    assert stub.sim.ompl_tasks[1]["algorithm"] == "PRM"
+
+    # cached task
+    MotionPlanner(joints, collision_pairs=[joints[0].get_handle(), -1])
+    assert stub.sim.calls["simOMPL.createTask"] == 1
+
+    with pytest.raises(ConfigurationPathError):
+        planner.plan([4.0, 0.0, 0.0], time_budget=0.1)  # out of bounds
+
+
+def test_plan_between_steps(stub, monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    pr = PyRep()
+    pr.launch(headless=True)
+    pr.start()
+    planner = MotionPlanner(make_joints(stub))
+
+    request = planner.plan_async([1.0, 1.0, 1.0], slice_time=0.005)
+    steps = 0
+    while not request.done:
+        pr.step()
+        steps += 1
+    assert steps == 4
+    assert request.state == "solved"
+    assert request.result().shape == (2, 3)
+
+    first = planner.plan_async([1.0, 1.0, 1.0], slice_time=0.005)
+    second = planner.plan_async([1.0, 1.0, 1.0], slice_time=0.005)
+    assert first.state == "cancelled"
+    with pytest.raises(ConfigurationPathError):
+        first.result()
+    assert second.advance(0.05) == "solved"
+
+    # Planners of the same robot share the task, and its current request
+    other = MotionPlanner(planner.joints)
+    mine = planner.plan_async([1.0, 1.0, 1.0], slice_time=0.005)
+    theirs = other.plan_async([0.5, 0.5, 0.5], slice_time=0.005)
+    assert mine.state == "cancelled"
+    with pytest.raises(ConfigurationPathError):
+        mine.result()
+    np.testing.assert_allclose(theirs.result()[-1], [0.5, 0.5, 0.5])
+
+    failing = planner.plan_async([9.0, 0, 0], time_budget=0.02)
+    for _ in range(3):
+        pr.step()
+    assert failing.state == "failed"
+    pr.shutdown()
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from pyrep_ext.pyrep import PyRep
+
+
+@pytest.fixture
+def pr(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    return PyRep()
+
+
+def test_responsive_ui(pr) -> None:
+    pr.launch(headless=True, responsive_ui=True, ui_fps=500.0)
+    pr.start()
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        pr.step()
+    stats = pr.ui_stats
+    assert stats.frames > 0
+    assert stats.sim_lock_time > 0.0
+    assert 0.0 < stats.ui_share < 1.0
+    pr.shutdown()
+    assert pr._responsive_ui_thread is None
+    # Relaunched without the responsive UI
+    pr.launch(headless=True)
+    assert pr.ui_stats is None
+    pr.shutdown()
+
+
+def test_no_responsive_ui(pr) -> None:
+    pr.launch(headless=True)
+    assert pr.ui_stats is None
+    pr.shutdown()
+
+
+def test_realtime_pacing(pr) -> None:
+    pr.launch(headless=True)
+    pr.set_simulation_timestep(0.01)
+    pr.set_realtime_pacing(policy="skip")
+    pr.start()
+    start = time.perf_counter()
+    for _ in range(5):
+        pr.step()
+    assert time.perf_counter() - start >= 0.04
+    assert pr.pacing_stats.steps == 5
+    pr.set_realtime_pacing(False)
+    assert pr.pacing_stats is None
+    pr.shutdown()
+
+
+def test_preloaded_model(pr, stub, monkeypatch, tmp_path) -> None:
+    from pyrep_ext.core import assets, bridge
+
+    # The calltip of sim.loadModel, missing from the stub
+    hints = {"sim.loadModel": (("string",), ("int",))}
+    monkeypatch.setattr(
+        bridge, "getTypeHints", lambda func: hints.get(func, (None, None))
+    )
+    loaded = []
+    stub.sim.register("sim.loadModel", lambda model: loaded.append(model))
+    path = tmp_path / "model.ttm"
+    path.write_bytes(b"\xffmodel")
+    pr.launch(headless=True)
+    pr.import_model(str(path))
+    assets.preload(path)
+    pr.import_model(str(path))
+    assets.clear_preloaded()
+    assert loaded[0] == str(path)
+    assert loaded[1] == b"\xffmodel"  # the buffer, not the path
+    pr.shutdown()
+
+
+def test_model_cache(pr, stub, tmp_path) -> None:
+    small, large = tmp_path / "small.ttm", tmp_path / "large.ttm"
+    small.write_bytes(b"\x00" * 10)
+    large.write_bytes(b"\x00" * 100)
+    pr.launch(headless=True)
+    models = pr.models
+    models.max_bytes = 100
+
+    first = pr.import_model(str(small), cache=True)
+    copies = models.instantiate(small, 3)
+    assert len(set(copies + [first])) == 4
+    assert (models.misses, models.hits) == (1, 1)
+    assert stub.sim.calls["sim.loadModel"] == 1
+    # the template is hidden, the copies aren't
+    template = models._templates[str(small)].handle
+    assert stub.sim.obj(template)["model_property"] != 0
+    assert stub.sim.obj(first).get("model_property", 0) == 0
+
+    models.instantiate(large)  # evicts the small model template
+    assert small not in models and large in models
+    assert template not in stub.sim.objects
+    assert models.nbytes == 100
+    models.instantiate(small)
+    assert stub.sim.calls["sim.loadModel"] == 3
+    # another object reusing the handle of the template isn't copied
+    template = models._templates[str(small)].handle
+    stub.sim.obj(template)["uid"] = -1
+    models.instantiate(small)
+    assert stub.sim.calls["sim.loadModel"] == 4
+    models.evict(small)
+    assert template in stub.sim.objects
+    pr.shutdown()
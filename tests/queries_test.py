@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.const import PrimitiveShape
+from pyrep_ext.objects.shape import Shape
+from pyrep_ext.pyrep import PyRep
+from pyrep_ext.queries import check_collisions, min_distances
+
+
+@pytest.fixture
+def pr(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    pr = PyRep()
+    pr.launch(headless=True)
+    yield pr
+    pr.shutdown()
+
+
+def make_cubes(positions):
+    positions = np.asarray(positions, dtype=np.float64)
+    return Shape.create_many(
+        [PrimitiveShape.CUBOID] * len(positions),
+        sizes=[[1.0, 1.0, 1.0]],
+        poses=positions,
+    )
+
+
+def test_check_collisions(pr, stub) -> None:
+    a = make_cubes([[0, 0, 0], [5, 0, 0]])
+    b = make_cubes([[0.5, 0, 0], [5, 0.9, 0], [10, 0, 0]])
+    calls = stub.sim.calls.get("pyrepExt.checkCollisions", 0)
+    colliding = check_collisions(a, b)
+    assert stub.sim.calls["pyrepExt.checkCollisions"] == calls + 1
+    np.testing.assert_array_equal(
+        colliding, [[True, False, False], [False, True, False]]
+    )
+    # objects, handles and self pairs
+    colliding = check_collisions(list(a), a.handles)
+    np.testing.assert_array_equal(colliding, np.zeros((2, 2), dtype=bool))
+    assert check_collisions(a, []).shape == (2, 0)
+
+
+def test_check_collisions_early_exit(pr, stub) -> None:
+    a = make_cubes([[0, 0, 0], [0.5, 0, 0], [1, 0, 0]])
+    b = make_cubes([[0, 0, 0.5], [10, 0, 0]])
+    checks = stub.sim.calls.get("sim.checkCollision", 0)
+    assert check_collisions(a, b).sum() == 3
+    assert stub.sim.calls["sim.checkCollision"] - checks == 6
+    checks = stub.sim.calls["sim.checkCollision"]
+    colliding = check_collisions(a, b, early_exit=True)
+    assert stub.sim.calls["sim.checkCollision"] - checks == 1
+    assert colliding.sum() == 1 and colliding[0, 0]
+
+
+def test_min_distances(pr, stub) -> None:
+    a = make_cubes([[0, 0, 0]])
+    b = make_cubes([[3, 0, 0], [3, 4, 0], [0.5, 0, 0]])
+    distances, points_a, points_b = min_distances(a, b)
+    np.testing.assert_allclose(distances, [[2.0, np.hypot(2, 3), 0.0]])
+    np.testing.assert_allclose(points_a[0, 0], [0.5, 0, 0])
+    np.testing.assert_allclose(points_b[0, 0], [2.5, 0, 0])
+    np.testing.assert_allclose(points_a[0, 1], [0.5, 0.5, 0])
+    np.testing.assert_allclose(points_b[0, 1], [2.5, 3.5, 0])
+    np.testing.assert_allclose(points_a[0, 2], points_b[0, 2])
+    # pairs beyond the threshold, and self pairs
+    distances, points_a, _ = min_distances(a, a.handles.tolist() + list(b), 2.5)
+    assert np.isnan(distances[0, 0])
+    np.testing.assert_allclose(distances[0, 1:], [2.0, np.inf, 0.0])
+    assert np.isnan(points_a[0, 2]).all()
+
+
+def test_min_distances_early_exit(pr, stub) -> None:
+    a = make_cubes([[0, 0, 0]])
+    b = make_cubes([[10, 0, 0], [2, 0, 0], [0, 0, 2]])
+    distances, _, _ = min_distances(a, b, threshold=1.5, early_exit=True)
+    np.testing.assert_allclose(distances[0, :2], [np.inf, 1.0])
+    assert np.isnan(distances[0, 2])
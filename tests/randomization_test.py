@@ -0,0 +1,60 @@
+import numpy as np
+
+from pyrep_ext.const import ObjectType, PrimitiveShape, TextureMappingMode
+from pyrep_ext.objects.group import ObjectGroup
+from pyrep_ext.objects.shape import Shape
+from pyrep_ext.randomization import (
+    Color,
+    Friction,
+    LightIntensity,
+    Mass,
+    PoseNoise,
+    Randomizer,
+    Texture,
+)
+
+
+def make_randomizer(clutter, lights, seed):
+    return Randomizer(
+        [
+            PoseNoise(clutter, position=[0.1, 0.1, 0.0], rotation=[0, 0, 0.5]),
+            Color(clutter),
+            Texture(clutter, [7, 8], TextureMappingMode.CUBE, 0.5, 2.0),
+            Mass(clutter, low=0.1, high=0.5),
+            Friction(clutter, low=0.3, high=1.0),
+            LightIntensity(lights, low=0.5, high=1.0),
+        ],
+        seed=seed,
+    )
+
+
+def test_randomizer(stub) -> None:
+    n = 8
+    clutter = Shape.create_many(
+        [PrimitiveShape.CUBOID] * n,
+        sizes=[0.05, 0.05, 0.05],
+        poses=np.c_[np.arange(n), np.zeros((n, 2))],
+    )
+    light = stub.sim.add_object("/light", ObjectType.LIGHT.value)
+    lights = ObjectGroup([light])
+
+    randomizer = make_randomizer(clutter, lights, seed=0)
+    values = randomizer.apply()
+    assert stub.sim.calls["pyrepExt.batch"] == 2  # nominal poses, then apply
+
+    poses = clutter.get_poses()
+    np.testing.assert_allclose(poses, values[0], atol=1e-9)
+    offsets = poses[:, :3] - np.c_[np.arange(n), np.zeros((n, 2))]
+    assert np.all(np.abs(offsets) <= 0.1) and np.all(offsets[:, 2] == 0)
+    np.testing.assert_allclose(np.linalg.norm(poses[:, 3:], axis=1), 1.0)
+
+    first = clutter.handles[0]
+    assert stub.sim.obj(first)["mass"] == values[3][0]
+    assert stub.sim.obj(first)["texture"][0] in (7, 8)
+    diffuse = stub.sim.obj(light)["light"][1]
+    assert 0.5 <= diffuse[0] <= 1.0
+
+    # same seed, same samples
+    again = make_randomizer(clutter, lights, seed=0).sample()
+    for a, b in zip(values[1:], again[1:]):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.pyrep import PyRep
+from pyrep_ext.scripts import ScriptFunction
+
+
+@pytest.fixture
+def pr(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    pr = PyRep()
+    pr.launch(headless=True)
+    yield pr
+    pr.shutdown()
+
+
+@pytest.fixture
+def script(pr, stub):
+    handle = stub.sim.add_object("/hand/script", 0)
+    received = []
+
+    # a script function reading tactile cells
+    @stub.sim.register("readTactile")
+    def read_tactile(cells, gain):
+        received.append((cells, gain))
+        return [gain * c for c in cells]
+
+    stub.sim.register("minMax", lambda values: (min(values), max(values)))
+    return handle, received
+
+
+def test_call(stub, script) -> None:
+    handle, received = script
+    lookups = stub.sim.calls.get("sim.getObject", 0)
+    read_tactile = ScriptFunction(
+        "readTactile",
+        "/hand/script",
+        args=("ndarray", "float"),
+        returns=("ndarray",),
+    )
+    assert read_tactile.script == handle
+    for step in range(3):
+        pressures = read_tactile(np.array([1, 2, 3]), np.float32(0.5))
+        assert isinstance(pressures, np.ndarray)
+        np.testing.assert_array_equal(pressures, [0.5, 1.0, 1.5])
+    # the script is resolved once, and called directly
+    assert stub.sim.calls["sim.getObject"] == lookups + 1
+    assert stub.last_script == handle
+    assert stub.sim.calls["readTactile"] == 3
+    assert received[0] == ([1, 2, 3], 0.5)
+    with pytest.raises(TypeError):
+        read_tactile([1, 2, 3])
+
+
+def test_untyped(stub, script) -> None:
+    handle, _ = script
+    min_max = ScriptFunction("minMax", handle)
+    assert min_max([3, 1, 2]) == (1, 3)
+    assert ScriptFunction("minMax@/hand/script")([4, 5]) == (4, 5)
+    with pytest.raises(ValueError):
+        ScriptFunction("minMax")
+
+
+def test_queue(stub, script) -> None:
+    handle, _ = script
+    read_tactile = ScriptFunction(
+        "readTactile", handle, args=("ndarray", "float"), returns=("ndarray",)
+    )
+    for i in range(4):
+        read_tactile.queue(np.arange(3) + i, 2.0)
+    assert read_tactile.pending == 4
+    calls = stub.sim.calls.get("pyrepExt.callScriptMany", 0)
+    results = read_tactile.flush()
+    assert stub.sim.calls["pyrepExt.callScriptMany"] == calls + 1
+    assert stub.sim.calls["readTactile"] == 4
+    assert read_tactile.pending == 0 and read_tactile.flush() == []
+    for i, result in enumerate(results):
+        assert isinstance(result, np.ndarray)
+        np.testing.assert_array_equal(result, 2.0 * (np.arange(3) + i))
+
+    min_max = ScriptFunction("minMax", handle, returns=("int", "int"))
+    min_max.queue([3, 1, 2])
+    min_max.queue([5])
+    assert min_max.flush() == [(1, 3), (5, 5)]
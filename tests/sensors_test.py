@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.const import ObjectType
+from pyrep_ext.core.errors import WrongObjectTypeError
+from pyrep_ext.objects.force_sensor import ForceSensor
+from pyrep_ext.objects.group import ObjectGroup
+from pyrep_ext.objects.proximity_sensor import ProximitySensor
+from pyrep_ext.pyrep import PyRep
+
+
+@pytest.fixture
+def pr(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    pr = PyRep()
+    pr.launch(headless=True)
+    yield pr
+    pr.shutdown()
+
+
+def test_proximity_sensors(pr, stub) -> None:
+    handles = [
+        stub.sim.add_object(f"/cell{i}", ObjectType.PROXIMITY_SENSOR.value)
+        for i in range(64)
+    ]
+    for i in range(0, 64, 3):
+        stub.sim.obj(handles[i])["detected_point"] = [0.0, 0.0, 0.01 * i]
+    skin = ObjectGroup(handles, ProximitySensor)
+
+    calls = dict(stub.sim.calls)
+    detected, distances, points = ProximitySensor.read_many(skin)
+    assert stub.sim.calls["pyrepExt.readProximitySensors"] == 1
+    assert stub.sim.calls["sim.readProximitySensor"] == 64
+    assert len(stub.sim.calls) == len(calls) + 2
+    assert detected.shape == (64,) and points.shape == (64, 3)
+    np.testing.assert_array_equal(detected, np.arange(64) % 3 == 0)
+    np.testing.assert_allclose(distances[::3], 0.01 * np.arange(0, 64, 3))
+    assert np.isinf(distances[1]) and np.isnan(points[1]).all()
+    np.testing.assert_allclose(points[3], [0.0, 0.0, 0.03])
+
+    detected, distance, point = skin[3].read()
+    assert detected and distance == pytest.approx(0.03)
+    np.testing.assert_allclose(point, [0.0, 0.0, 0.03])
+    assert not skin[1].is_detected()
+    assert ProximitySensor.read_many([skin[3], skin[1]])[0].tolist() == [
+        True,
+        False,
+    ]
+
+
+def test_force_sensors(pr, stub) -> None:
+    handles = [
+        stub.sim.add_object(f"/wrist{i}", ObjectType.FORCE_SENSOR.value)
+        for i in range(2)
+    ]
+    stub.sim.obj(handles[0]).update(force=[1, 2, 3], torque=[4, 5, 6])
+    sensors = [ForceSensor(f"/wrist{i}") for i in range(2)]
+
+    values = ForceSensor.read_many(sensors)
+    assert values.shape == (2, 6)
+    np.testing.assert_array_equal(values[0], [1, 2, 3, 4, 5, 6])
+    assert np.isnan(values[1]).all()
+    force, torque = sensors[0].read()
+    np.testing.assert_array_equal(force, [1, 2, 3])
+    np.testing.assert_array_equal(torque, [4, 5, 6])
+    assert ForceSensor.read_many([]).shape == (0, 6)
+    with pytest.raises(WrongObjectTypeError):
+        ProximitySensor("/wrist0")
@@ -0,0 +1,107 @@
+from typing import Tuple
+
+import numpy as np
+import pytest
+
+from pyrep_ext.core import bridge, stack
+from pyrep_ext.core.lib import cpllib
+
+
+def roundtrip(values, typeHints=None):
+    handle = cpllib.simCreateStack()
+    stack.write(handle, values, typeHints)
+    result = stack.read(handle, typeHints)
+    cpllib.simReleaseStack(handle)
+    return result
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        (None, True, False),
+        (1, -5, 2**40),
+        (0.5, -1.25),
+        ("hello", "ñandú"),
+        ([1.0, 2.0, 3.0], [[1, 2], [3, 4]]),
+        ({"a": 1, "b": [1, 2, {"c": "d"}]},),
+    ],
+)
+def test_stack_roundtrip(stub, values) -> None:
+    assert roundtrip(values) == values
+
+
+def test_stack_type_hints(stub) -> None:
+    assert roundtrip((b"\x00\xff",), ("buffer",)) == (b"\x00\xff",)
+    assert roundtrip((3,), ("float",)) == (3.0,)
+
+
+def test_stack_is_released(stub) -> None:
+    roundtrip(({"a": [1, 2, 3]},))
+    assert stub.stacks == {}
+
+
+def test_bridge_call(stub) -> None:
+    stub.sim.register("sim.test", lambda a, b: (a + b, [a, b]))
+    assert bridge.call("sim.test", (1, 2)) == (3, [1, 2])
+
+
+def test_bridge_call_error(stub) -> None:
+    with pytest.raises(Exception):
+        bridge.call("sim.doesNotExist", ())
+
+
+def test_bridge_require(stub) -> None:
+    stub.sim.register("simFoo.bar", lambda x: x * 2)
+    stub.sim.set_const("simFoo.baz", 7)
+    foo = bridge.require("simFoo")
+    assert foo.bar(21) == 42
+    assert foo.baz == 7
+
+
+def test_stack_arrays(stub) -> None:
+    values = (np.arange(6, dtype=np.float64).reshape(2, 3), np.arange(3))
+    (a, b) = roundtrip(values, ("ndarray", "ndarray"))
+    np.testing.assert_array_equal(a, np.arange(6))
+    np.testing.assert_array_equal(b, [0, 1, 2])
+    assert roundtrip((np.float32(0.5), np.int64(3))) == (0.5, 3)
+    assert roundtrip(([],), ("ndarray",))[0].shape == (0,)
+
+
+def test_bool_arrays(stub) -> None:
+    # Lua truthiness: only nil and false are false
+    def truthy(values):
+        return [v is not None and v is not False for v in values]
+
+    stub.sim.register("sim.test", truthy)
+    flags = np.array([[True, False], [False, True]])
+    assert bridge.call("sim.test", (flags,)) == [True, False, False, True]
+    assert roundtrip((flags[0],)) == ([True, False],)
+
+
+def test_callback(stub) -> None:
+    def func(a: np.ndarray, b: int, c: str) -> Tuple[np.ndarray, bytes]:
+        return a * b, c.encode()
+
+    wrapper = stack.callback(func)
+    handle = cpllib.simCreateStack()
+    stack.write(handle, ([1.0, 2.0], 3, "x"))
+    assert wrapper(handle) == 1
+    a, c = stack.read(handle, ("ndarray", "buffer"))
+    np.testing.assert_array_equal(a, [3.0, 6.0])
+    assert c == b"x"
+    cpllib.simReleaseStack(handle)
+
+
+def test_callback_errors(stub) -> None:
+    def func(a: float) -> float:
+        raise ValueError("bad")
+
+    wrapper = stack.callback(func, log_errors=False)
+    handle = cpllib.simCreateStack()
+    for _ in range(3):
+        stack.write(handle, (1.0,))
+        assert wrapper(handle) == 0
+        cpllib.simPopStackItem(handle, 0)
+    assert wrapper.errors == 3
+    assert isinstance(wrapper.last_error, ValueError)
+    cpllib.simReleaseStack(handle)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from pyrep_ext.const import ObjectType
+from pyrep_ext.objects.joint import Joint
+from pyrep_ext.pyrep import PyRep
+from pyrep_ext.trajectory import TrajectoryExecutor
+
+
+@pytest.fixture
+def pr(stub, monkeypatch, tmp_path):
+    monkeypatch.setenv("COPPELIASIM_ROOT", str(tmp_path))
+    pr = PyRep()
+    pr.launch(headless=True)
+    pr.set_simulation_timestep(0.05)
+    pr.start()
+    yield pr
+    pr.shutdown()
+
+
+def make_joints(stub, n=2):
+    for i in range(n):
+        stub.sim.add_object(f"/joint{i}", ObjectType.JOINT.value)
+    return [Joint(f"/joint{i}") for i in range(n)]
+
+
+def test_waypoint_per_step(pr, stub) -> None:
+    joints = make_joints(stub)
+    executor = TrajectoryExecutor(joints)
+    trajectory = np.c_[np.arange(5.0), -np.arange(5.0)]
+    assert executor.execute(trajectory) == 5
+    calls = dict(stub.sim.calls)
+
+    pr.step()
+    assert executor.poll() == (1, 5)
+    targets = [stub.sim.obj(j.get_handle())["target_position"] for j in joints]
+    assert targets == [0.0, -0.0]
+    executor.wait(pr)
+    assert executor.done and executor.progress == 1.0
+    targets = [stub.sim.obj(j.get_handle())["target_position"] for j in joints]
+    assert targets == [4.0, -4.0]
+    # no call per joint and waypoint from Python
+    assert stub.sim.calls["sim.setJointTargetPosition"] == 10
+    assert (
+        stub.sim.calls["pyrepExt.trajProgress"]
+        - calls.get("pyrepExt.trajProgress", 0)
+        == 4
+    )
+
+
+def test_interpolated(pr, stub) -> None:
+    joints = make_joints(stub, 1)
+    executor = TrajectoryExecutor(joints, set_target=False)
+    steps = executor.execute([[0.0], [1.0], [3.0]], times=[0.0, 0.1, 0.2])
+    assert steps == 5
+    positions = []
+    for _ in range(steps + 2):
+        pr.step()
+        positions.append(joints[0].get_joint_position())
+    np.testing.assert_allclose(positions, [0, 0.5, 1, 2, 3, 3, 3])
+
+    with pytest.raises(ValueError):
+        executor.execute([[0.0], [1.0]], times=[0.1, 0.2])
+
+    executor.execute(np.zeros((10, 1)))
+    pr.step()
+    executor.stop()
+    assert executor.done
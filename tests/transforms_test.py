@@ -0,0 +1,78 @@
+import numpy as np
+
+from pyrep_ext import transforms
+from pyrep_ext.const import PrimitiveShape
+from pyrep_ext.objects.shape import Shape
+
+
+def random_poses(rng, n):
+    quaternions = rng.normal(size=(n, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    return np.c_[rng.uniform(-1, 1, (n, 3)), quaternions]
+
+
+def test_conversions() -> None:
+    rng = np.random.default_rng(0)
+    poses = random_poses(rng, 100)
+    q = poses[:, 3:] * np.sign(poses[:, 6:])  # w >= 0
+    m = transforms.quaternion_to_matrix(q)
+    np.testing.assert_allclose(
+        m @ np.swapaxes(m, 1, 2),
+        np.broadcast_to(np.eye(3), m.shape),
+        atol=1e-12,
+    )
+    np.testing.assert_allclose(
+        transforms.matrix_to_quaternion(m), q, atol=1e-12
+    )
+
+    euler = transforms.quaternion_to_euler(q)
+    np.testing.assert_allclose(transforms.euler_to_matrix(euler), m, atol=1e-12)
+    dots = np.sum(transforms.euler_to_quaternion(euler) * q, axis=1)
+    np.testing.assert_allclose(np.abs(dots), 1.0)  # same rotation
+
+    # alpha, beta, gamma: R = Rx @ Ry @ Rz
+    a, b = 0.3, -0.4
+    rx = [[1, 0, 0], [0, np.cos(a), -np.sin(a)], [0, np.sin(a), np.cos(a)]]
+    ry = [[np.cos(b), 0, np.sin(b)], [0, 1, 0], [-np.sin(b), 0, np.cos(b)]]
+    np.testing.assert_allclose(
+        transforms.euler_to_matrix([a, b, 0.0]), np.dot(rx, ry), atol=1e-12
+    )
+
+    matrices = transforms.pose_to_matrix(poses)
+    np.testing.assert_allclose(
+        transforms.quaternion_to_matrix(
+            transforms.quaternion_multiply(q[:-1], q[1:])
+        ),
+        m[:-1] @ m[1:],
+        atol=1e-12,
+    )
+    np.testing.assert_allclose(
+        transforms.compose(matrices, transforms.invert(matrices)),
+        np.broadcast_to(np.eye(4), matrices.shape),
+        atol=1e-12,
+    )
+    points = rng.normal(size=(100, 3))
+    np.testing.assert_allclose(
+        transforms.transform_points(matrices, points),
+        (matrices @ np.c_[points, np.ones(100)][..., None])[:, :3, 0],
+        atol=1e-12,
+    )
+
+
+def test_relative_matrices(stub) -> None:
+    rng = np.random.default_rng(1)
+    n = 5
+    group = Shape.create_many(
+        [PrimitiveShape.CUBOID] * n, [0.1, 0.1, 0.1], random_poses(rng, n)
+    )
+    batches = stub.sim.calls.get("pyrepExt.batch", 0)
+    relative = group.get_relative_matrices()
+    assert stub.sim.calls["pyrepExt.batch"] == batches + 1
+    assert relative.shape == (n, n, 4, 4)
+
+    for i, j in [(0, 1), (3, 2), (4, 4)]:
+        expected = Shape(int(group.handles[i])).get_matrix(group[j])
+        np.testing.assert_allclose(relative[i, j], expected, atol=1e-9)
+
+    pairs = group.get_relative_matrices([[0, 1], [3, 2]])
+    np.testing.assert_allclose(pairs, relative[[0, 3], [1, 2]])